@@ -1,11 +1,14 @@
 import os
 from dotenv import load_dotenv
-import requests
 import json
 import webbrowser
 from datetime import datetime
 import locale
 
+from http_client import HTTPClient
+from response_cache import ResponseCache
+from news_engine import NewsEngine
+
 # .env dosyasını yükle
 load_dotenv()
 
@@ -15,308 +18,347 @@ WEATHER_API_KEY = os.getenv('WEATHER_API_KEY')
 NEWS_API_KEY = os.getenv('NEWS_API_KEY')
 DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
 
+# Sohbet uç noktası (test için yerel bir SSE sunucusuna yönlendirilebilir)
+DEEPSEEK_API_URL = os.getenv('DEEPSEEK_API_URL', "https://openrouter.ai/api/v1/chat/completions")
+
+# Hava durumu ve tarif servis adresleri (yük testinde yerel sahte sunuculara yönlendirilir)
+WEATHER_API_URL = os.getenv('WEATHER_API_URL', "http://api.openweathermap.org/data/2.5/weather")
+RECIPE_API_URL = os.getenv('RECIPE_API_URL', "https://api.spoonacular.com/recipes/random")
+
+# Günlük özette hava durumu alınan şehir
+DEFAULT_CITY = os.getenv('DEFAULT_CITY', "İstanbul")
+
+def weather_url(city, api_key):
+    """OpenWeatherMap istek adresi"""
+    return f"{WEATHER_API_URL}?q={city}&appid={api_key}&units=metric&lang=tr"
+
+def recipe_url(api_key):
+    """Spoonacular rastgele tarif istek adresi"""
+    return f"{RECIPE_API_URL}?apiKey={api_key}&number=1&tags=turkish&addRecipeInformation=true"
+
+_locale_set = False
+
+def set_turkish_locale():
+    """Türkçe tarih formatı için locale ayarı (süreç başına bir kez, ilk tarih isteğinde)"""
+    global _locale_set
+    if _locale_set:
+        return
+    _locale_set = True
+    try:
+        locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
+    except:
+        try:
+            locale.setlocale(locale.LC_ALL, 'tr_TR')
+        except:
+            pass
+
+def format_date_time(now):
+    """Tarih ve saati Türkçe cümle olarak biçimlendirir"""
+    set_turkish_locale()
+    # Tarih formatı
+    date_str = now.strftime("%d %B %Y")
+    day_name = now.strftime("%A")
+    
+    # Saat formatı
+    time_str = now.strftime("%H:%M")
+    
+    # Ay isimlerini Türkçeleştir
+    months = {
+        "January": "Ocak",
+        "February": "Şubat",
+        "March": "Mart",
+        "April": "Nisan",
+        "May": "Mayıs",
+        "June": "Haziran",
+        "July": "Temmuz",
+        "August": "Ağustos",
+        "September": "Eylül",
+        "October": "Ekim",
+        "November": "Kasım",
+        "December": "Aralık"
+    }
+    
+    # Gün isimlerini Türkçeleştir
+    days = {
+        "Monday": "Pazartesi",
+        "Tuesday": "Salı",
+        "Wednesday": "Çarşamba",
+        "Thursday": "Perşembe",
+        "Friday": "Cuma",
+        "Saturday": "Cumartesi",
+        "Sunday": "Pazar"
+    }
+    
+    # Tarihi Türkçeleştir
+    for eng, tr in months.items():
+        date_str = date_str.replace(eng, tr)
+    
+    # Günü Türkçeleştir
+    day_name = days.get(day_name, day_name)
+    
+    return f"Bugünün tarihi {date_str} {day_name}. Saat {time_str}."
+
+def format_weather(city, data):
+    """OpenWeatherMap yanıtını Türkçe hava durumu metnine çevirir"""
+    temp = data["main"]["temp"]
+    desc = data["weather"][0]["description"]
+    humidity = data["main"]["humidity"]
+    wind = data["wind"]["speed"]
+    feels_like = data["main"]["feels_like"]
+    
+    # Hava durumu açıklamalarını Türkçeleştir
+    weather_descriptions = {
+        "clear sky": "Açık",
+        "few clouds": "Az Bulutlu",
+        "scattered clouds": "Parçalı Bulutlu",
+        "broken clouds": "Çok Bulutlu",
+        "shower rain": "Sağanak Yağışlı",
+        "rain": "Yağmurlu",
+        "thunderstorm": "Gök Gürültülü Fırtına",
+        "snow": "Karlı",
+        "mist": "Sisli",
+        "overcast clouds": "Kapalı",
+        "light rain": "Hafif Yağmurlu",
+        "moderate rain": "Orta Şiddetli Yağmur",
+        "heavy intensity rain": "Şiddetli Yağmur",
+        "very heavy rain": "Çok Şiddetli Yağmur",
+        "extreme rain": "Aşırı Yağmur",
+        "freezing rain": "Dondurucu Yağmur",
+        "light intensity drizzle": "Hafif Çisenti",
+        "drizzle": "Çisenti",
+        "heavy intensity drizzle": "Şiddetli Çisenti",
+        "light intensity shower rain": "Hafif Sağanak",
+        "shower rain": "Sağanak",
+        "heavy intensity shower rain": "Şiddetli Sağanak",
+        "ragged shower rain": "Düzensiz Sağanak",
+        "light snow": "Hafif Kar",
+        "snow": "Kar",
+        "heavy snow": "Yoğun Kar",
+        "sleet": "Karla Karışık Yağmur",
+        "shower sleet": "Karla Karışık Sağanak",
+        "light rain and snow": "Hafif Yağmur ve Kar",
+        "rain and snow": "Yağmur ve Kar",
+        "light shower snow": "Hafif Kar Sağanağı",
+        "shower snow": "Kar Sağanağı",
+        "heavy shower snow": "Yoğun Kar Sağanağı",
+        "smoke": "Dumanlı",
+        "haze": "Puslu",
+        "sand/dust whirls": "Kum/Toz Fırtınası",
+        "fog": "Sisli",
+        "sand": "Kumlu",
+        "dust": "Tozlu",
+        "volcanic ash": "Volkanik Kül",
+        "squalls": "Sert Rüzgarlı",
+        "tornado": "Kasırga",
+        "tropical storm": "Tropik Fırtına",
+        "hurricane": "Kasırga",
+        "cold": "Soğuk",
+        "hot": "Sıcak",
+        "windy": "Rüzgarlı",
+        "hail": "Dolu"
+    }
+    
+    # Açıklamayı Türkçeleştir
+    desc = weather_descriptions.get(desc.lower(), desc)
+    
+    return (
+        f"{city} için hava durumu bilgisi:\n"
+        f"• Sıcaklık: {temp:.1f}°C\n"
+        f"• Hissedilen: {feels_like:.1f}°C\n"
+        f"• Durum: {desc}\n"
+        f"• Nem: %{humidity}\n"
+        f"• Rüzgar: {wind} m/s"
+    )
+
+def format_recipe(recipe):
+    """Spoonacular tarifini Türkçe tarif metnine çevirir"""
+    # Tarif bilgilerini al
+    title = recipe.get("title", "İsimsiz Tarif")
+    ingredients = recipe.get("extendedIngredients", [])
+    instructions = recipe.get("instructions", "Tarif talimatları bulunamadı.")
+    prep_time = recipe.get("readyInMinutes", "Bilinmiyor")
+    servings = recipe.get("servings", "Bilinmiyor")
+    
+    # Malzemeleri formatla
+    ingredients_text = "Malzemeler:\n"
+    for ingredient in ingredients:
+        amount = ingredient.get("amount", "")
+        unit = ingredient.get("unit", "")
+        name = ingredient.get("name", "")
+        if amount and unit and name:
+            ingredients_text += f"• {amount} {unit} {name}\n"
+    
+    # Talimatları formatla
+    instructions_text = "\nHazırlanışı:\n" + instructions
+    
+    return (
+        f"🍽️ Önerilen Tarif: {title}\n\n"
+        f"⏱️ Hazırlama Süresi: {prep_time} dakika\n"
+        f"👥 Porsiyon: {servings} kişilik\n\n"
+        f"{ingredients_text}\n"
+        f"{instructions_text}"
+    )
+
+def deepseek_request(api_key, message, stream=False, history=None):
+    """DeepSeek isteği için başlıkları ve gövdeyi hazırlar
+
+    history, bu mesajdan önceki {"role", "content"} sohbet mesajlarıdır.
+    """
+    headers = {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json",
+        "HTTP-Referer": "http://localhost:8000",
+        "X-Title": "Alfa Asistan"
+    }
+    
+    data = {
+        "model": "deepseek/deepseek-chat:free",
+        "messages": list(history or []) + [
+            {
+                "role": "user",
+                "content": message
+            }
+        ]
+    }
+    if stream:
+        data["stream"] = True
+    
+    return headers, data
+
+# Akışın bittiğini belirten işaret
+SSE_DONE = object()
+
+def parse_sse_line(line):
+    """Tek bir SSE satırından token döndürür; akış bittiyse SSE_DONE, token yoksa None"""
+    # Boş satırlar ve ": ..." yorum satırları (keep-alive) atlanır
+    if not line or not line.startswith("data:"):
+        return None
+    payload = line[len("data:"):].strip()
+    if payload == "[DONE]":
+        return SSE_DONE
+    try:
+        chunk = json.loads(payload)
+    except ValueError:
+        return None
+    
+    choices = chunk.get("choices") or []
+    if choices:
+        return (choices[0].get("delta") or {}).get("content")
+    return None
+
+SAMPLE_RECIPE = (
+    "🍽️ Önerilen Tarif: Mercimek Çorbası\n\n"
+    "⏱️ Hazırlama Süresi: 30 dakika\n"
+    "👥 Porsiyon: 4 kişilik\n\n"
+    "Malzemeler:\n"
+    "• 1 su bardağı kırmızı mercimek\n"
+    "• 1 adet soğan\n"
+    "• 1 adet havuç\n"
+    "• 1 adet patates\n"
+    "• 2 yemek kaşığı un\n"
+    "• 1 yemek kaşığı tereyağı\n"
+    "• 1 tatlı kaşığı tuz\n"
+    "• 1/2 çay kaşığı karabiber\n"
+    "• 1/2 çay kaşığı pul biber\n"
+    "• 6 su bardağı su\n\n"
+    "Hazırlanışı:\n"
+    "1. Mercimekleri yıkayın ve süzün.\n"
+    "2. Soğanı, havucu ve patatesi küp küp doğrayın.\n"
+    "3. Tereyağını tencerede eritin.\n"
+    "4. Soğanları ekleyip yumuşayana kadar kavurun.\n"
+    "5. Havuç ve patatesleri ekleyip 2-3 dakika daha kavurun.\n"
+    "6. Unu ekleyip 1 dakika daha kavurun.\n"
+    "7. Mercimekleri ekleyin ve karıştırın.\n"
+    "8. Suyu ekleyin ve kaynamaya bırakın.\n"
+    "9. Sebzeler yumuşayınca blenderdan geçirin.\n"
+    "10. Tuz ve baharatları ekleyip 5 dakika daha pişirin.\n"
+    "11. Sıcak servis yapın.\n\n"
+    "Afiyet olsun! 😊"
+)
+
 class APIServices:
     def __init__(self):
         self.weather_api_key = WEATHER_API_KEY
         self.news_api_key = NEWS_API_KEY
         self.spoonacular_api_key = "  "
         self.deepseek_api_key = DEEPSEEK_API_KEY
-        
-        # Türkçe tarih formatı için locale ayarı
-        try:
-            locale.setlocale(locale.LC_ALL, 'tr_TR.UTF-8')
-        except:
-            try:
-                locale.setlocale(locale.LC_ALL, 'tr_TR')
-            except:
-                pass
+        self.deepseek_url = DEEPSEEK_API_URL
+        # Tüm servisler tek bir bağlantı havuzunu paylaşır
+        self.http = HTTPClient()
+        # Hava durumu ve haber yanıtları için TTL önbelleği
+        self.cache = ResponseCache()
+        self.news = NewsEngine(self.http, self.news_api_key, self.cache)
+
+    def get_http_stats(self):
+        """Uç nokta başına gecikme ve hata sayaçlarını döndürür"""
+        return self.http.stats()
+
+    def get_cache_stats(self):
+        """Yanıt önbelleğinin isabet/ıska sayaçlarını döndürür"""
+        return self.cache.stats()
 
     def get_date_time(self):
         """Güncel tarih ve saat bilgisini getirir"""
         try:
-            now = datetime.now()
-            
-            # Tarih formatı
-            date_str = now.strftime("%d %B %Y")
-            day_name = now.strftime("%A")
-            
-            # Saat formatı
-            time_str = now.strftime("%H:%M")
-            
-            # Ay isimlerini Türkçeleştir
-            months = {
-                "January": "Ocak",
-                "February": "Şubat",
-                "March": "Mart",
-                "April": "Nisan",
-                "May": "Mayıs",
-                "June": "Haziran",
-                "July": "Temmuz",
-                "August": "Ağustos",
-                "September": "Eylül",
-                "October": "Ekim",
-                "November": "Kasım",
-                "December": "Aralık"
-            }
-            
-            # Gün isimlerini Türkçeleştir
-            days = {
-                "Monday": "Pazartesi",
-                "Tuesday": "Salı",
-                "Wednesday": "Çarşamba",
-                "Thursday": "Perşembe",
-                "Friday": "Cuma",
-                "Saturday": "Cumartesi",
-                "Sunday": "Pazar"
-            }
-            
-            # Tarihi Türkçeleştir
-            for eng, tr in months.items():
-                date_str = date_str.replace(eng, tr)
-            
-            # Günü Türkçeleştir
-            day_name = days.get(day_name, day_name)
-            
-            return f"Bugünün tarihi {date_str} {day_name}. Saat {time_str}."
+            return format_date_time(datetime.now())
             
         except Exception as e:
             print(f"Tarih/saat hatası: {str(e)}")
             return "Tarih ve saat bilgisi alınamadı."
 
     def get_weather(self, city):
-        """Hava durumu bilgisini getirir"""
+        """Hava durumu bilgisini getirir (önbellekli)"""
         try:
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={city}&appid={self.weather_api_key}&units=metric&lang=tr"
-            
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200:
-                temp = data["main"]["temp"]
-                desc = data["weather"][0]["description"]
-                humidity = data["main"]["humidity"]
-                wind = data["wind"]["speed"]
-                feels_like = data["main"]["feels_like"]
-                
-                # Hava durumu açıklamalarını Türkçeleştir
-                weather_descriptions = {
-                    "clear sky": "Açık",
-                    "few clouds": "Az Bulutlu",
-                    "scattered clouds": "Parçalı Bulutlu",
-                    "broken clouds": "Çok Bulutlu",
-                    "shower rain": "Sağanak Yağışlı",
-                    "rain": "Yağmurlu",
-                    "thunderstorm": "Gök Gürültülü Fırtına",
-                    "snow": "Karlı",
-                    "mist": "Sisli",
-                    "overcast clouds": "Kapalı",
-                    "light rain": "Hafif Yağmurlu",
-                    "moderate rain": "Orta Şiddetli Yağmur",
-                    "heavy intensity rain": "Şiddetli Yağmur",
-                    "very heavy rain": "Çok Şiddetli Yağmur",
-                    "extreme rain": "Aşırı Yağmur",
-                    "freezing rain": "Dondurucu Yağmur",
-                    "light intensity drizzle": "Hafif Çisenti",
-                    "drizzle": "Çisenti",
-                    "heavy intensity drizzle": "Şiddetli Çisenti",
-                    "light intensity shower rain": "Hafif Sağanak",
-                    "shower rain": "Sağanak",
-                    "heavy intensity shower rain": "Şiddetli Sağanak",
-                    "ragged shower rain": "Düzensiz Sağanak",
-                    "light snow": "Hafif Kar",
-                    "snow": "Kar",
-                    "heavy snow": "Yoğun Kar",
-                    "sleet": "Karla Karışık Yağmur",
-                    "shower sleet": "Karla Karışık Sağanak",
-                    "light rain and snow": "Hafif Yağmur ve Kar",
-                    "rain and snow": "Yağmur ve Kar",
-                    "light shower snow": "Hafif Kar Sağanağı",
-                    "shower snow": "Kar Sağanağı",
-                    "heavy shower snow": "Yoğun Kar Sağanağı",
-                    "smoke": "Dumanlı",
-                    "haze": "Puslu",
-                    "sand/dust whirls": "Kum/Toz Fırtınası",
-                    "fog": "Sisli",
-                    "sand": "Kumlu",
-                    "dust": "Tozlu",
-                    "volcanic ash": "Volkanik Kül",
-                    "squalls": "Sert Rüzgarlı",
-                    "tornado": "Kasırga",
-                    "tropical storm": "Tropik Fırtına",
-                    "hurricane": "Kasırga",
-                    "cold": "Soğuk",
-                    "hot": "Sıcak",
-                    "windy": "Rüzgarlı",
-                    "hail": "Dolu"
-                }
-                
-                # Açıklamayı Türkçeleştir
-                desc = weather_descriptions.get(desc.lower(), desc)
-                
-                return (
-                    f"{city} için hava durumu bilgisi:\n"
-                    f"• Sıcaklık: {temp:.1f}°C\n"
-                    f"• Hissedilen: {feels_like:.1f}°C\n"
-                    f"• Durum: {desc}\n"
-                    f"• Nem: %{humidity}\n"
-                    f"• Rüzgar: {wind} m/s"
-                )
-            else:
+            result = self.cache.get_or_fetch("weather", city, lambda: self._fetch_weather(city))
+            if result is None:
                 return f"Üzgünüm, {city} için hava durumu bilgisi alınamadı."
+            return result
                 
         except Exception as e:
             print(f"Hava durumu hatası: {str(e)}")
             return "Hava durumu bilgisi alınırken bir hata oluştu."
 
+    def _fetch_weather(self, city):
+        """Hava durumunu API'den alıp biçimlendirir, başarısızlıkta None döndürür"""
+        url = weather_url(city, self.weather_api_key)
+        
+        response = self.http.get("weather", url)
+        data = response.json()
+        
+        if response.status_code == 200:
+            return format_weather(city, data)
+        else:
+            return None
+
     def get_news(self):
         """Güncel haberleri getirir"""
-        try:
-            url = f"https://newsapi.org/v2/top-headlines?country=tr&apiKey={self.news_api_key}"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200 and data["status"] == "ok":
-                articles = data["articles"][:5]  # İlk 5 haberi al
-                news_text = "📰 Güncel Haberler:\n\n"
-                
-                for i, article in enumerate(articles, 1):
-                    title = article["title"]
-                    source = article["source"]["name"]
-                    news_text += f"{i}. {title}\n   Kaynak: {source}\n\n"
-                
-                return news_text
-            else:
-                return "Üzgünüm, haberler alınamadı. Lütfen daha sonra tekrar deneyin."
-                
-        except Exception as e:
-            print(f"Haber hatası: {str(e)}")
-            return "Haberler alınırken bir hata oluştu."
+        return self.news.get_text("genel")
 
     def get_sports_news(self):
         """Spor haberlerini getirir"""
-        try:
-            url = f"https://newsapi.org/v2/everything?q=spor&language=tr&sortBy=publishedAt&apiKey={self.news_api_key}"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200 and data["status"] == "ok":
-                articles = data["articles"][:5]  # İlk 5 haberi al
-                news_text = "⚽ Spor Haberleri:\n\n"
-                
-                for i, article in enumerate(articles, 1):
-                    title = article["title"]
-                    source = article["source"]["name"]
-                    news_text += f"{i}. {title}\n   Kaynak: {source}\n\n"
-                
-                return news_text
-            else:
-                return "Üzgünüm, spor haberleri alınamadı. Lütfen daha sonra tekrar deneyin."
-                
-        except Exception as e:
-            print(f"Spor haberleri hatası: {str(e)}")
-            return "Spor haberleri alınırken bir hata oluştu."
+        return self.news.get_text("spor")
+
+    def get_all_news(self):
+        """Tüm kategorilerin haberlerini paralel getirir"""
+        return self.news.get_all_text()
 
     def process_news_request(self, query):
         """Haber isteğini işler"""
-        query = query.lower().strip()
-        
-        if "spor" in query:
-            return self.get_sports_news()
-        elif "ekonomi" in query:
-            url = f"https://newsapi.org/v2/everything?q=ekonomi&language=tr&sortBy=publishedAt&apiKey={self.news_api_key}"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200 and data["status"] == "ok":
-                articles = data["articles"][:5]
-                news_text = "💰 Ekonomi Haberleri:\n\n"
-                
-                for i, article in enumerate(articles, 1):
-                    title = article["title"]
-                    source = article["source"]["name"]
-                    news_text += f"{i}. {title}\n   Kaynak: {source}\n\n"
-                
-                return news_text
-            else:
-                return "Üzgünüm, ekonomi haberleri alınamadı."
-                
-        elif "teknoloji" in query:
-            url = f"https://newsapi.org/v2/everything?q=teknoloji&language=tr&sortBy=publishedAt&apiKey={self.news_api_key}"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200 and data["status"] == "ok":
-                articles = data["articles"][:5]
-                news_text = "💻 Teknoloji Haberleri:\n\n"
-                
-                for i, article in enumerate(articles, 1):
-                    title = article["title"]
-                    source = article["source"]["name"]
-                    news_text += f"{i}. {title}\n   Kaynak: {source}\n\n"
-                
-                return news_text
-            else:
-                return "Üzgünüm, teknoloji haberleri alınamadı."
-                
-        elif "kültür" in query or "sanat" in query:
-            url = f"https://newsapi.org/v2/everything?q=kültür+sanat&language=tr&sortBy=publishedAt&apiKey={self.news_api_key}"
-            response = requests.get(url)
-            data = response.json()
-            
-            if response.status_code == 200 and data["status"] == "ok":
-                articles = data["articles"][:5]
-                news_text = "🎭 Kültür-Sanat Haberleri:\n\n"
-                
-                for i, article in enumerate(articles, 1):
-                    title = article["title"]
-                    source = article["source"]["name"]
-                    news_text += f"{i}. {title}\n   Kaynak: {source}\n\n"
-                
-                return news_text
-            else:
-                return "Üzgünüm, kültür-sanat haberleri alınamadı."
-        else:
-            return self.get_news()
+        return self.news.handle_request(query)
 
     def get_recipe(self):
         """Rastgele yemek tarifi önerir"""
         try:
             # Spoonacular API'den rastgele tarif al
-            url = f"https://api.spoonacular.com/recipes/random?apiKey={self.spoonacular_api_key}&number=1&tags=turkish&addRecipeInformation=true"
-            response = requests.get(url)
+            url = recipe_url(self.spoonacular_api_key)
+            response = self.http.get("recipe", url)
             
             # API yanıtını kontrol et
             if response.status_code == 200:
                 data = response.json()
                 if "recipes" in data and len(data["recipes"]) > 0:
                     recipe = data["recipes"][0]
-                    
-                    # Tarif bilgilerini al
-                    title = recipe.get("title", "İsimsiz Tarif")
-                    ingredients = recipe.get("extendedIngredients", [])
-                    instructions = recipe.get("instructions", "Tarif talimatları bulunamadı.")
-                    prep_time = recipe.get("readyInMinutes", "Bilinmiyor")
-                    servings = recipe.get("servings", "Bilinmiyor")
-                    
-                    # Malzemeleri formatla
-                    ingredients_text = "Malzemeler:\n"
-                    for ingredient in ingredients:
-                        amount = ingredient.get("amount", "")
-                        unit = ingredient.get("unit", "")
-                        name = ingredient.get("name", "")
-                        if amount and unit and name:
-                            ingredients_text += f"• {amount} {unit} {name}\n"
-                    
-                    # Talimatları formatla
-                    instructions_text = "\nHazırlanışı:\n" + instructions
-                    
-                    return (
-                        f"🍽️ Önerilen Tarif: {title}\n\n"
-                        f"⏱️ Hazırlama Süresi: {prep_time} dakika\n"
-                        f"👥 Porsiyon: {servings} kişilik\n\n"
-                        f"{ingredients_text}\n"
-                        f"{instructions_text}"
-                    )
+                    return format_recipe(recipe)
                 else:
                     print("API yanıtında tarif bulunamadı")
                     return self.get_sample_recipe()
@@ -331,36 +373,7 @@ class APIServices:
             
     def get_sample_recipe(self):
         """Örnek bir Türk yemek tarifi döndürür"""
-        return (
-            "🍽️ Önerilen Tarif: Mercimek Çorbası\n\n"
-            "⏱️ Hazırlama Süresi: 30 dakika\n"
-            "👥 Porsiyon: 4 kişilik\n\n"
-            "Malzemeler:\n"
-            "• 1 su bardağı kırmızı mercimek\n"
-            "• 1 adet soğan\n"
-            "• 1 adet havuç\n"
-            "• 1 adet patates\n"
-            "• 2 yemek kaşığı un\n"
-            "• 1 yemek kaşığı tereyağı\n"
-            "• 1 tatlı kaşığı tuz\n"
-            "• 1/2 çay kaşığı karabiber\n"
-            "• 1/2 çay kaşığı pul biber\n"
-            "• 6 su bardağı su\n\n"
-            "Hazırlanışı:\n"
-            "1. Mercimekleri yıkayın ve süzün.\n"
-            "2. Soğanı, havucu ve patatesi küp küp doğrayın.\n"
-            "3. Tereyağını tencerede eritin.\n"
-            "4. Soğanları ekleyip yumuşayana kadar kavurun.\n"
-            "5. Havuç ve patatesleri ekleyip 2-3 dakika daha kavurun.\n"
-            "6. Unu ekleyip 1 dakika daha kavurun.\n"
-            "7. Mercimekleri ekleyin ve karıştırın.\n"
-            "8. Suyu ekleyin ve kaynamaya bırakın.\n"
-            "9. Sebzeler yumuşayınca blenderdan geçirin.\n"
-            "10. Tuz ve baharatları ekleyip 5 dakika daha pişirin.\n"
-            "11. Sıcak servis yapın.\n\n"
-            "Afiyet olsun! 😊"
-        )
-
+        return SAMPLE_RECIPE
     def open_youtube(self):
         """YouTube'u açar"""
         try:
@@ -369,28 +382,16 @@ class APIServices:
         except Exception as e:
             return f"YouTube açılamadı: {str(e)}"
 
-    def chat_with_deepseek(self, message):
+    def _deepseek_request(self, message, stream=False, history=None):
+        """DeepSeek isteği için başlıkları ve gövdeyi hazırlar"""
+        return deepseek_request(self.deepseek_api_key, message, stream, history)
+
+    def chat_with_deepseek(self, message, history=None):
         """DeepSeek AI ile sohbet eder"""
         try:
-            url = "https://openrouter.ai/api/v1/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.deepseek_api_key}",
-                "Content-Type": "application/json",
-                "HTTP-Referer": "http://localhost:8000",
-                "X-Title": "Alfa Asistan"
-            }
-            
-            data = {
-                "model": "deepseek/deepseek-chat:free",
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": message
-                    }
-                ]
-            }
+            headers, data = self._deepseek_request(message, history=history)
             
-            response = requests.post(url, headers=headers, json=data)
+            response = self.http.post("deepseek", self.deepseek_url, headers=headers, json=data)
             
             if response.status_code == 200:
                 result = response.json()
@@ -405,4 +406,40 @@ class APIServices:
                 
         except Exception as e:
             print(f"DeepSeek sohbet hatası: {str(e)}")
-            return "Sohbet sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin." 
\ No newline at end of file
+            return "Sohbet sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+
+    def chat_with_deepseek_stream(self, message, history=None):
+        """DeepSeek yanıtını SSE akışı ile parça parça (token) üretir
+
+        Hata durumunda kullanıcıya gösterilecek metin üretilir; yanıt hatasız
+        tamamlandıysa üreteç True döndürür (StopIteration.value).
+        """
+        try:
+            headers, data = self._deepseek_request(message, stream=True, history=history)
+            
+            with self.http.post("deepseek", self.deepseek_url, headers=headers, json=data, stream=True) as response:
+                if response.status_code != 200:
+                    print(f"DeepSeek API Hatası - Durum Kodu: {response.status_code}")
+                    print(f"API Yanıtı: {response.text}")
+                    yield "Üzgünüm, şu anda yanıt veremiyorum. Lütfen daha sonra tekrar deneyin."
+                    return False
+                
+                # SSE akışı charset belirtmeyebilir, Türkçe karakterler için UTF-8 kullan
+                response.encoding = "utf-8"
+                received = False
+                for line in response.iter_lines(decode_unicode=True):
+                    token = parse_sse_line(line)
+                    if token is SSE_DONE:
+                        break
+                    if token:
+                        received = True
+                        yield token
+                
+                if not received:
+                    yield "Üzgünüm, bir yanıt alınamadı."
+                return received
+                    
+        except Exception as e:
+            print(f"DeepSeek akış hatası: {str(e)}")
+            yield "Sohbet sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+        return False
@@ -0,0 +1,219 @@
+import threading
+import webbrowser
+from conversation import ConversationStore
+from intent_router import IntentRouter
+from notes_store import NotesStore, NOTES_PAGE_SIZE
+
+# Günlük özetin tüm paralel isteklerinin bitmesi için üst sınır (saniye)
+BRIEFING_TIMEOUT = 30
+
+HELP_TEXT = (
+    "Size şu konularda yardımcı olabilirim:\n"
+    "• Tarih ve saat bilgisi\n"
+    "• Hava durumu bilgisi\n"
+    "• Güncel haberler\n"
+    "• Günlük özet (tarih, hava durumu ve haberler birlikte)\n"
+    "• Yemek tarifleri\n"
+    "• YouTube'da video arama\n"
+    "• Müzik çalma\n"
+    "• Web'de arama yapma\n"
+    "• Not alma, notları görüntüleme ve notlarda arama\n"
+    "• Tema değiştirme\n"
+    "• Sohbet etme\n\n"
+    "Ayrıca sol menüden özellikleri de kullanabilirsiniz."
+)
+
+class AssistantEngine:
+    """Arayüzden bağımsız komut işleyici: niyet yönlendirme, API servisleri ve notlar
+
+    Tk, ses aygıtı ya da ekran gerektirmez; GUI, CLI ve sunucu aynı motoru kullanır.
+    Sohbet yanıtları token üreten bir generator olarak döner, diğerleri metin (ya da None).
+    """
+    def __init__(self, api=None, note_prompt=None, open_url=None, router=None,
+                 async_api=None, async_bridge=None, conversation=None, notes=None):
+        # Sunucuda tüm oturumlar aynı API servislerini, yönlendiriciyi ve döngüyü paylaşır;
+        # verilmezse API servisleri (requests, dotenv) ilk kullanımda yüklenir
+        self._api = api
+        self._api_lock = threading.Lock()
+        self.router = router or IntentRouter()
+        # Boş "not al" komutunda notu kullanıcıdan isteyen geri çağırım (ör. sesli dinleme)
+        self.note_prompt = note_prompt
+        # Tarayıcı açan komutlar için; başsız kullanımda etkisiz bir fonksiyon verilebilir
+        self.open_url = open_url or webbrowser.open
+
+        # Not deposu; verilmezse notlar yalnızca bellekte tutulur
+        self.notes = notes or NotesStore(":memory:")
+        # Sohbet bağlamı (son turlar + özet); verilmezse yalnızca bellekte tutulur
+        self.conversation = conversation or ConversationStore()
+
+        self._async_api = async_api
+        self._async_bridge = async_bridge
+        # Dışarıdan verilen döngü paylaşılıyordur, close() onu kapatmaz
+        self._owns_async = async_bridge is None
+        self._async_lock = threading.Lock()
+
+    @property
+    def api(self):
+        """API servisleri ilk ihtiyaçta oluşturulur"""
+        if self._api is None:
+            with self._api_lock:
+                if self._api is None:
+                    from api_services import APIServices
+                    self._api = APIServices()
+        return self._api
+
+    def _get_async(self):
+        """Asyncio servisleri ve döngü thread'i ilk ihtiyaçta başlatılır"""
+        with self._async_lock:
+            if self._async_bridge is None:
+                from async_api_services import AsyncAPIServices, AsyncBridge
+                # Önbellek, HTTP sayaçları ve haber motoru senkron servislerle paylaşılır
+                self._async_api = AsyncAPIServices(self.api)
+                self._async_bridge = AsyncBridge()
+            return self._async_api, self._async_bridge
+
+    def close(self):
+        """Arka plan döngüsünü ve açık bağlantıları kapatır"""
+        with self._async_lock:
+            if self._async_bridge is None or not self._owns_async:
+                return
+            try:
+                self._async_bridge.run(self._async_api.close(), timeout=2)
+            except Exception:
+                pass
+            self._async_bridge.shutdown()
+            self._async_bridge = None
+
+    def add_note(self, note):
+        """Notu kaydeder ve onay metnini döndürür"""
+        self.notes.add(note)
+        return f"Not alındı: {note}"
+
+    @staticmethod
+    def _render_notes(heading, notes, total, page, next_command):
+        """Bir sayfa notu, sonraki sayfa ipucuyla birlikte metne çevirir"""
+        lines = [f"[{note.created[:16]}]\n{note.text}\n\n" for note in notes]
+        first = (page - 1) * NOTES_PAGE_SIZE + 1
+        text = f"{heading}\n\n" + "".join(lines)
+        if total > first + len(notes) - 1:
+            text += (f"({first}-{first + len(notes) - 1} / {total} not gösteriliyor; "
+                     f"devamı için \"{next_command} sayfa {page + 1}\" deyin)")
+        return text
+
+    def notes_text(self, period=None, page=1):
+        """Notları en yeniden eskiye sayfa sayfa listeleyen metin"""
+        notes = self.notes.list(page, period=period)
+        if not notes:
+            return "Henüz not bulunmuyor." if page == 1 and period is None else "Bu aralıkta not bulunmuyor."
+        return self._render_notes("📝 Notlarınız:", notes, self.notes.count(period), page, "notlarım")
+
+    def search_notes_text(self, query, period=None, page=1):
+        """Notlarda tam metin arama sonucunu listeleyen metin"""
+        if not query:
+            return "Notlarınızda ne aramak istediğinizi söyleyin."
+        notes, total = self.notes.search(query, page, period=period)
+        if not notes:
+            return f"'{query}' içeren not bulunamadı."
+        return self._render_notes(f"🔎 '{query}' için {total} not bulundu:", notes, total, page,
+                                  f"notlarımda {query} ara")
+
+    def process(self, command):
+        """Komutu sınıflandırıp işler"""
+        try:
+            return self.handle(self.router.classify(command), command)
+        except Exception as e:
+            print(f"Komut işleme hatası: {str(e)}")
+            return "Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin."
+
+    def handle(self, intent, command):
+        """Sınıflandırılmış komutun yanıtını döndürür"""
+        name = intent.name
+        slots = intent.slots
+
+        # Anlaşılmayan girdi
+        if name == "unknown":
+            return "Üzgünüm, bu komutu anlayamadım."
+
+        if name == "greeting":
+            return "Merhaba! Size nasıl yardımcı olabilirim?"
+
+        # Günlük özet: tarih, hava durumu ve haberler paralel alınır
+        if name == "briefing":
+            async_api, bridge = self._get_async()
+            return bridge.run(async_api.daily_briefing(), timeout=BRIEFING_TIMEOUT)
+
+        if name == "date_time":
+            return self.api.get_date_time()
+
+        if name == "weather":
+            if not slots["city"]:
+                return "Hangi şehir için hava durumu bilgisi istiyorsunuz?"
+            return self.api.get_weather(slots["city"])
+
+        if name == "news":
+            # Kategori yönlendiricinin yuvasından gelir, metin yeniden ayrıştırılmaz
+            return self.api.news.category_text(slots["category"])
+
+        if name == "recipe":
+            return self.api.get_recipe()
+
+        if name == "youtube":
+            if slots["search"]:
+                query = slots["query"]
+                if not query:
+                    return "YouTube'da ne aramak istediğinizi söyleyin."
+                self.open_url(f"https://www.youtube.com/results?search_query={query}")
+                return f"YouTube'da '{query}' için arama yapılıyor..."
+            self.open_url("https://www.youtube.com")
+            return "YouTube açılıyor..."
+
+        if name == "music":
+            query = slots["query"]
+            if not query:
+                return "Hangi müziği dinlemek istediğinizi söyleyin."
+            self.open_url(f"https://www.youtube.com/results?search_query={query}+music")
+            return f"'{query}' müziği aranıyor..."
+
+        if name == "web_search":
+            query = slots["query"]
+            if not query:
+                return "Ne aramak istediğinizi söyleyin."
+            self.open_url(f"https://www.google.com/search?q={query}")
+            return f"'{query}' için web araması yapılıyor..."
+
+        if name == "note_take":
+            note = slots["note"]
+            if not note and self.note_prompt is not None:
+                note = self.note_prompt()
+            if not note:
+                return "Not alınamadı. Lütfen tekrar deneyin."
+            return self.add_note(note)
+
+        if name == "note_list":
+            return self.notes_text(slots["period"], slots["page"])
+
+        if name == "note_search":
+            return self.search_notes_text(slots["query"], slots["period"], slots["page"])
+
+        if name == "help":
+            return HELP_TEXT
+
+        # Diğer tüm komutlar için DeepSeek AI ile sohbet et (yanıt akış olarak döner)
+        return self._chat(slots.get("message", command))
+
+    def _chat(self, message):
+        """Sohbet yanıtını akıtır; akış hatasız tamamlanırsa soru-yanıt çiftini geçmişe ekler"""
+        history = self.conversation.context(message)
+        stream = self.api.chat_with_deepseek_stream(message, history)
+        parts = []
+        while True:
+            try:
+                token = next(stream)
+            except StopIteration as end:
+                completed = end.value
+                break
+            parts.append(token)
+            yield token
+        # Hata metinleri geçmişe girmez, sonraki isteklerin bağlamını bozmasın
+        if completed:
+            self.conversation.add_turn(message, "".join(parts))
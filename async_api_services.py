@@ -0,0 +1,255 @@
+import asyncio
+import random
+import threading
+import time
+import webbrowser
+from datetime import datetime
+
+import aiohttp
+
+from api_services import (APIServices, WEATHER_API_KEY, NEWS_API_KEY, DEEPSEEK_API_KEY, DEEPSEEK_API_URL,
+                          DEFAULT_CITY, SAMPLE_RECIPE, SSE_DONE, weather_url, recipe_url,
+                          deepseek_request, parse_sse_line, format_date_time, format_weather, format_recipe)
+from news_engine import NEWS_CATEGORIES, ALL_CATEGORIES, news_category
+from http_client import (ENDPOINT_TIMEOUTS, DEFAULT_TIMEOUT, MAX_RETRIES, BACKOFF_BASE, BACKOFF_MAX,
+                         RETRY_STATUSES, POOL_MAXSIZE)
+
+# Günlük özette paralel alınan haber kategorileri
+BRIEFING_CATEGORIES = ("genel", "spor", "ekonomi", "teknoloji")
+
+class AsyncAPIServices:
+    """APIServices'in asyncio sürümü; tüm istekler tek bir aiohttp oturumunu paylaşır
+
+    Yanıt önbelleği, istek sayaçları ve haber motoru verilen APIServices ile
+    ortaktır; hava durumu ve haberler iki yoldan da aynı kayıtlara düşer.
+    """
+    def __init__(self, api=None):
+        self.api = api or APIServices()
+        self.cache = self.api.cache
+        self.http = self.api.http
+        self.news = self.api.news
+        self.weather_api_key = WEATHER_API_KEY
+        self.news_api_key = NEWS_API_KEY
+        self.spoonacular_api_key = "  "
+        self.deepseek_api_key = DEEPSEEK_API_KEY
+        self.deepseek_url = DEEPSEEK_API_URL
+        self.default_city = DEFAULT_CITY
+        self._session = None
+
+    def _get_session(self):
+        """Oturum, kullanıldığı olay döngüsünde ilk istekte oluşturulur"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit_per_host=POOL_MAXSIZE)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    @staticmethod
+    def _timeout(endpoint):
+        connect, read = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _get_json(self, endpoint, url):
+        """GET isteği yapar, (durum kodu, JSON) döndürür; geçici hatalarda tekrar dener
+
+        Gecikme, hata ve tekrar sayıları APIServices'in HTTP sayaçlarına yazılır.
+        """
+        session = self._get_session()
+        for attempt in range(MAX_RETRIES + 1):
+            last_attempt = attempt == MAX_RETRIES
+            start = time.perf_counter()
+            try:
+                async with session.get(url, timeout=self._timeout(endpoint)) as response:
+                    self.http.record(endpoint, time.perf_counter() - start, error=response.status >= 400)
+                    if response.status not in RETRY_STATUSES or last_attempt:
+                        return response.status, await response.json(content_type=None)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                self.http.record(endpoint, time.perf_counter() - start, error=True)
+                if last_attempt:
+                    raise
+            self.http.record_retry(endpoint)
+            await asyncio.sleep(random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))))
+
+    async def get_date_time(self):
+        """Güncel tarih ve saat bilgisini getirir"""
+        try:
+            return format_date_time(datetime.now())
+        except Exception as e:
+            print(f"Tarih/saat hatası: {str(e)}")
+            return "Tarih ve saat bilgisi alınamadı."
+
+    async def get_weather(self, city):
+        """Hava durumu bilgisini getirir (önbellekli)"""
+        try:
+            result = await self.cache.get_or_fetch_async("weather", city,
+                                                         lambda: self._fetch_weather(city))
+            if result is None:
+                return f"Üzgünüm, {city} için hava durumu bilgisi alınamadı."
+            return result
+        except Exception as e:
+            print(f"Hava durumu hatası: {str(e)}")
+            return "Hava durumu bilgisi alınırken bir hata oluştu."
+
+    async def _fetch_weather(self, city):
+        """Hava durumunu API'den alıp biçimlendirir, başarısızlıkta None döndürür"""
+        status, data = await self._get_json("weather", weather_url(city, self.weather_api_key))
+        if status == 200:
+            return format_weather(city, data)
+        return None
+
+    async def get_news(self):
+        """Güncel haberleri getirir"""
+        return await self._get_news("genel")
+
+    async def get_sports_news(self):
+        """Spor haberlerini getirir"""
+        return await self._get_news("spor")
+
+    async def get_all_news(self):
+        """Tüm kategorilerin haberlerini paralel getirir"""
+        return self.news.render_all_text(await self._get_all_articles(NEWS_CATEGORIES))
+
+    async def process_news_request(self, query):
+        """Haber isteğini işler"""
+        category = news_category(query)
+        if category == ALL_CATEGORIES:
+            return await self.get_all_news()
+        return await self._get_news(category)
+
+    async def _fetch_articles(self, category):
+        """Kategorinin haberlerini alır; başarısızlıkta None döndürür"""
+        status, data = await self._get_json("news", self.news.url(category))
+        return self.news.parse(category, status, data)
+
+    async def _get_articles(self, category):
+        """Kategorinin haberlerini ortak önbellekten ya da API'den getirir"""
+        return await self.cache.get_or_fetch_async("news", category,
+                                                   lambda: self._fetch_articles(category))
+
+    async def _get_news(self, category):
+        try:
+            articles = await self._get_articles(category)
+        except Exception as e:
+            articles = e
+        return self.news.render_text(category, articles)
+
+    async def _get_all_articles(self, categories):
+        """Kategorileri paralel alır, tekrarlanan haberleri ayıklar"""
+        categories = list(categories)
+        fetched = await asyncio.gather(*(self._get_articles(category) for category in categories),
+                                       return_exceptions=True)
+        return self.news.collect(categories, fetched)
+
+    async def get_recipe(self):
+        """Rastgele yemek tarifi önerir"""
+        try:
+            status, data = await self._get_json("recipe", recipe_url(self.spoonacular_api_key))
+            if status == 200 and data.get("recipes"):
+                return format_recipe(data["recipes"][0])
+            print(f"API Hatası - Durum Kodu: {status}")
+            return self.get_sample_recipe()
+        except Exception as e:
+            print(f"Tarif hatası: {str(e)}")
+            return self.get_sample_recipe()
+
+    def get_sample_recipe(self):
+        """Örnek bir Türk yemek tarifi döndürür"""
+        return SAMPLE_RECIPE
+
+    async def open_youtube(self):
+        """YouTube'u açar"""
+        try:
+            webbrowser.open("https://www.youtube.com")
+            return "YouTube açılıyor..."
+        except Exception as e:
+            return f"YouTube açılamadı: {str(e)}"
+
+    async def chat_with_deepseek(self, message, history=None):
+        """DeepSeek AI ile sohbet eder"""
+        try:
+            headers, data = deepseek_request(self.deepseek_api_key, message, history=history)
+            session = self._get_session()
+            async with session.post(self.deepseek_url, headers=headers, json=data,
+                                    timeout=self._timeout("deepseek")) as response:
+                if response.status != 200:
+                    print(f"DeepSeek API Hatası - Durum Kodu: {response.status}")
+                    print(f"API Yanıtı: {await response.text()}")
+                    return "Üzgünüm, şu anda yanıt veremiyorum. Lütfen daha sonra tekrar deneyin."
+                result = await response.json(content_type=None)
+                if result.get("choices"):
+                    return result["choices"][0]["message"]["content"]
+                return "Üzgünüm, bir yanıt alınamadı."
+        except Exception as e:
+            print(f"DeepSeek sohbet hatası: {str(e)}")
+            return "Sohbet sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+
+    async def chat_with_deepseek_stream(self, message, history=None):
+        """DeepSeek yanıtını SSE akışı ile parça parça (token) üretir"""
+        try:
+            headers, data = deepseek_request(self.deepseek_api_key, message, stream=True, history=history)
+            session = self._get_session()
+            async with session.post(self.deepseek_url, headers=headers, json=data,
+                                    timeout=self._timeout("deepseek")) as response:
+                if response.status != 200:
+                    print(f"DeepSeek API Hatası - Durum Kodu: {response.status}")
+                    yield "Üzgünüm, şu anda yanıt veremiyorum. Lütfen daha sonra tekrar deneyin."
+                    return
+
+                received = False
+                async for raw_line in response.content:
+                    token = parse_sse_line(raw_line.decode("utf-8").strip())
+                    if token is SSE_DONE:
+                        break
+                    if token:
+                        received = True
+                        yield token
+
+                if not received:
+                    yield "Üzgünüm, bir yanıt alınamadı."
+        except Exception as e:
+            print(f"DeepSeek akış hatası: {str(e)}")
+            yield "Sohbet sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+
+    async def daily_briefing(self, city=None):
+        """Tarih, hava durumu ve haber kategorilerini paralel alıp tek metinde birleştirir
+
+        Toplam süre, isteklerin toplamı değil en yavaş isteğin süresi kadardır.
+        """
+        city = city or self.default_city
+        date_time, weather, news = await asyncio.gather(
+            self.get_date_time(),
+            self.get_weather(city),
+            self._get_all_articles(BRIEFING_CATEGORIES)
+        )
+        parts = [date_time, weather, self.news.render_all_text(news)]
+        return "📋 Günlük Özet\n\n" + "\n\n".join(part.strip() for part in parts)
+
+class AsyncBridge:
+    """Arka plan thread'inde çalışan olay döngüsü
+
+    Tk ana thread'i ve komut worker'ları coroutine'leri buraya gönderir;
+    asyncio döngüsü Tk döngüsünü hiç bloklamaz.
+    """
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="async-bridge", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Coroutine'i döngüye gönderir, concurrent.futures.Future döndürür"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Coroutine'i döngüde çalıştırır ve sonucunu bekler (Tk thread'inden çağrılmamalı)"""
+        return self.submit(coro).result(timeout)
+
+    def shutdown(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=1)
@@ -0,0 +1,531 @@
+import audioop
+import json
+import queue
+import threading
+import time
+import wave
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import speech_recognition as sr
+
+# Mikrofon akışı ayarları
+SAMPLE_RATE = 16000
+CHUNK_SIZE = 480           # 16 kHz'de 30 ms
+PREROLL_SECONDS = 0.5      # listen çağrısından önceki sesi tutan ön tampon
+CALIBRATION_SECONDS = 0.5  # yalnızca açılışta yapılan ortam ölçümü
+
+# Konuşma eşiği = gürültü tabanı * ENERGY_RATIO (en az MIN_ENERGY)
+ENERGY_RATIO = 2.5
+MIN_ENERGY = 150
+NOISE_FLOOR_DAMPING = 0.95
+
+# Ses etkinliği algılama (VAD) ve uyandırma kelimesi ayarları
+VAD_MIN_SPEECH = 0.09      # konuşma başladı demek için gereken süre
+VAD_HANGOVER = 0.3         # konuşma bitti demeden önce beklenen sessizlik
+WAKE_WORD = "alfa"
+WAKE_SEGMENT_LIMIT = 2.0   # uyandırma kelimesi için incelenen en uzun bölüm
+COMMAND_TIMEOUT = 5
+COMMAND_TIME_LIMIT = 5
+COMMAND_PAUSE = 0.8
+
+# Asistanın kendi sesini bastırma (yankı kapısı) ayarları
+ECHO_INITIAL_GAIN = 0.5    # hoparlör -> mikrofon enerji bağlaşımı başlangıç tahmini
+ECHO_MAX_GAIN = 4.0
+ECHO_MARGIN = 2.0          # kullanıcı sesi sayılmak için yankı tahminin kaç katı gerekir
+ECHO_ADAPTATION = 0.1
+
+class NoiseFloor:
+    """Ortam gürültü tabanını tek seferlik kalibrasyon ve sessiz çerçevelerle izler"""
+    def __init__(self, calibration_frames):
+        self.calibration_frames = max(1, calibration_frames)
+        self._calibration = []
+        self.level = None
+    
+    @property
+    def threshold(self):
+        """Güncel gürültü tabanına göre konuşma eşiği"""
+        if self.level is None:
+            return MIN_ENERGY
+        return max(MIN_ENERGY, self.level * ENERGY_RATIO)
+    
+    def update(self, energy):
+        """Yeni çerçeve enerjisiyle gürültü tabanını günceller"""
+        if self.level is None:
+            self._calibration.append(energy)
+            if len(self._calibration) >= self.calibration_frames:
+                self.level = sum(self._calibration) / len(self._calibration)
+                self._calibration = []
+        elif energy <= self.threshold:
+            self.level = self.level * NOISE_FLOOR_DAMPING + energy * (1 - NOISE_FLOOR_DAMPING)
+
+class EchoGate:
+    """Çalınan sesin enerji zarfını referans alarak asistanın kendi sesini bastırır
+
+    Hoparlörden mikrofona sızan enerji, referans enerjiyle orantılı kabul edilir;
+    bu oran kullanıcı konuşmazken sürekli öğrenilir.
+    """
+    def __init__(self, reference):
+        self.reference = reference
+        self.gain = ECHO_INITIAL_GAIN
+    
+    def is_speech(self, energy, threshold):
+        """Çerçeve enerjisi yankı tahmininin belirgin üstündeyse konuşma sayılır"""
+        reference = self.reference()
+        if not reference:
+            return energy > threshold
+        
+        echo = self.gain * reference
+        if energy > threshold + echo * ECHO_MARGIN:
+            return True
+        
+        # Kullanıcı konuşmuyor: bağlaşım katsayısını güncelle
+        ratio = min(ECHO_MAX_GAIN, energy / reference)
+        self.gain = self.gain * (1 - ECHO_ADAPTATION) + ratio * ECHO_ADAPTATION
+        return False
+
+class MicrophoneSession:
+    """Sürekli açık mikrofon akışı: ortam gürültüsünü izler, ön tamponda ses tutar"""
+    def __init__(self, sample_rate=SAMPLE_RATE, chunk_size=CHUNK_SIZE,
+                 preroll_seconds=PREROLL_SECONDS, device_index=None):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.device_index = device_index
+        self.sample_width = 2
+        self.frame_duration = chunk_size / sample_rate
+
+        self.microphone = None
+        self.noise = NoiseFloor(int(CALIBRATION_SECONDS / self.frame_duration))
+        self.echo_gate = None
+        self.running = False
+
+        # Son PREROLL_SECONDS saniyelik çerçeveler
+        self.preroll = deque(maxlen=max(1, int(preroll_seconds / self.frame_duration)))
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Mikrofonu açar ve okuma thread'ini başlatır"""
+        with self._lock:
+            if self.running:
+                return
+            self.microphone = sr.Microphone(device_index=self.device_index,
+                                            sample_rate=self.sample_rate,
+                                            chunk_size=self.chunk_size)
+            self.microphone.__enter__()
+            self.sample_width = self.microphone.SAMPLE_WIDTH
+            self.running = True
+
+        self._thread = threading.Thread(target=self._reader, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Okuma thread'ini durdurur ve mikrofonu kapatır"""
+        with self._lock:
+            if not self.running:
+                return
+            self.running = False
+        if self._thread:
+            self._thread.join(timeout=1)
+        self.microphone.__exit__(None, None, None)
+        self.microphone = None
+
+    @property
+    def energy_threshold(self):
+        """Güncel gürültü tabanına göre konuşma eşiği"""
+        return self.noise.threshold
+
+    def frame_energy(self, frame):
+        """Çerçevenin RMS enerjisi"""
+        return audioop.rms(frame, self.sample_width)
+
+    def is_speech(self, frame):
+        """Çerçeve enerjisi konuşma eşiğinin (ve asistanın yankısının) üstünde mi"""
+        energy = self.frame_energy(frame)
+        if self.echo_gate:
+            return self.echo_gate.is_speech(energy, self.energy_threshold)
+        return energy > self.energy_threshold
+
+    def _reader(self):
+        """Mikrofondan sürekli okur, gürültü tabanını günceller ve aboneleri besler"""
+        while self.running:
+            try:
+                frame = self.microphone.stream.read(self.chunk_size)
+            except Exception as e:
+                print(f"Mikrofon okuma hatası: {str(e)}")
+                time.sleep(0.1)
+                continue
+
+            # İlk çerçevelerle kalibre edilir, sonra sessiz çerçevelerle izlenir
+            self.noise.update(self.frame_energy(frame))
+
+            with self._lock:
+                self.preroll.append(frame)
+                subscribers = list(self._subscribers)
+            for subscriber in subscribers:
+                subscriber.put(frame)
+
+    def subscribe(self, include_preroll=True):
+        """Yeni çerçeveleri (istenirse ön tamponla birlikte) alan bir kuyruk döndürür"""
+        frames = queue.Queue()
+        with self._lock:
+            if include_preroll:
+                for frame in self.preroll:
+                    frames.put(frame)
+            self._subscribers.append(frames)
+        return frames
+
+    def unsubscribe(self, frames):
+        """Kuyruğun çerçeve almasını durdurur"""
+        with self._lock:
+            if frames in self._subscribers:
+                self._subscribers.remove(frames)
+
+    def listen(self, timeout=5, phrase_time_limit=5, pause_threshold=0.8):
+        """Ön tampondan başlayarak bir ifadeyi kaydeder ve AudioData döndürür"""
+        self.start()
+        frames = self.subscribe(include_preroll=True)
+        try:
+            recorded = []
+            start = time.monotonic()
+            speech_duration = 0.0
+            silence = 0.0
+            started = False
+            while True:
+                try:
+                    frame = frames.get(timeout=1)
+                except queue.Empty:
+                    if not self.running:
+                        raise sr.WaitTimeoutError("Mikrofon akışı kapandı")
+                    continue
+                recorded.append(frame)
+
+                if self.is_speech(frame):
+                    started = True
+                    silence = 0.0
+                elif started:
+                    silence += self.frame_duration
+
+                if not started:
+                    # Konuşma başlamadan önce sadece ön tampon kadar ses tutulur
+                    if len(recorded) > self.preroll.maxlen:
+                        del recorded[0]
+                    if time.monotonic() - start > timeout:
+                        raise sr.WaitTimeoutError("Dinleme zaman aşımına uğradı")
+                    continue
+
+                speech_duration += self.frame_duration
+                if silence >= pause_threshold or speech_duration >= phrase_time_limit:
+                    break
+
+            return sr.AudioData(b"".join(recorded), self.sample_rate, self.sample_width)
+        finally:
+            self.unsubscribe(frames)
+
+def iter_wav_frames(path, chunk_size=CHUNK_SIZE):
+    """Kayıtlı bir WAV dosyasını mikrofon çerçeveleri gibi parça parça okur"""
+    with wave.open(path, "rb") as wav:
+        frame_bytes = chunk_size * wav.getsampwidth() * wav.getnchannels()
+        while True:
+            frame = wav.readframes(chunk_size)
+            if len(frame) < frame_bytes:
+                break
+            yield frame
+
+class EnergyVAD:
+    """Çerçeve düzeyinde ucuz ses etkinliği algılayıcı (enerji eşiği + bekleme süresi)"""
+    def __init__(self, noise, sample_width=2, frame_duration=CHUNK_SIZE / SAMPLE_RATE,
+                 update_noise=True, echo_gate=None):
+        self.noise = noise
+        self.sample_width = sample_width
+        self.update_noise = update_noise
+        self.echo_gate = echo_gate
+        self.min_speech_frames = max(1, int(VAD_MIN_SPEECH / frame_duration))
+        self.hangover_frames = max(1, int(VAD_HANGOVER / frame_duration))
+        self.active = False
+        self._speech_run = 0
+        self._silence_run = 0
+    
+    def process(self, frame):
+        """Çerçeveyi işler; 'start', 'end' ya da None döndürür"""
+        energy = audioop.rms(frame, self.sample_width)
+        if self.update_noise:
+            self.noise.update(energy)
+        
+        if self.echo_gate:
+            speech = self.echo_gate.is_speech(energy, self.noise.threshold)
+        else:
+            speech = energy > self.noise.threshold
+        
+        if speech:
+            self._speech_run += 1
+            self._silence_run = 0
+            if not self.active and self._speech_run >= self.min_speech_frames:
+                self.active = True
+                return "start"
+        else:
+            self._speech_run = 0
+            self._silence_run += 1
+            if self.active and self._silence_run >= self.hangover_frames:
+                self.active = False
+                return "end"
+        return None
+    
+    def reset(self):
+        """Durumu sıfırlar"""
+        self.active = False
+        self._speech_run = 0
+        self._silence_run = 0
+
+class PhraseRecorder:
+    """VAD olaylarına göre tek bir sesli ifadeyi (komutu) kaydeder"""
+    def __init__(self, vad, sample_rate=SAMPLE_RATE, sample_width=2,
+                 frame_duration=CHUNK_SIZE / SAMPLE_RATE):
+        self.vad = vad
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.frame_duration = frame_duration
+        # VAD konuşmayı geç fark eder, ifadenin başı bu tampondan alınır
+        self.onset = deque(maxlen=vad.min_speech_frames + 2)
+        self.begin()
+    
+    def begin(self, frames=(), speech_started=False):
+        """Yeni bir kayıt başlatır (varsa önceden yakalanmış çerçevelerle)"""
+        self.frames = list(frames)
+        self.speech_started = speech_started
+        self.onset.clear()
+        self._waited = 0.0
+        self._spoken = 0.0
+        self._silence = 0.0
+    
+    def process(self, frame, event):
+        """Çerçeveyi ekler; kayıt bitince (bitti, AudioData ya da None) döndürür"""
+        if event == "start" and not self.speech_started:
+            self.speech_started = True
+            self.frames.extend(self.onset)
+        self.onset.append(frame)
+        
+        if not self.speech_started:
+            self._waited += self.frame_duration
+            if self._waited >= COMMAND_TIMEOUT:
+                return True, None
+            return False, None
+        
+        self.frames.append(frame)
+        self._spoken += self.frame_duration
+        self._silence = 0.0 if self.vad.active else self._silence + self.frame_duration
+        if self._silence >= COMMAND_PAUSE or self._spoken >= COMMAND_TIME_LIMIT:
+            return True, sr.AudioData(b"".join(self.frames), self.sample_rate, self.sample_width)
+        return False, None
+
+class VoskWakeWordSpotter:
+    """Sadece uyandırma kelimesini tanıyan kısıtlı gramerli Vosk tanıyıcı"""
+    def __init__(self, model, sample_rate=SAMPLE_RATE, wake_word=WAKE_WORD):
+        from vosk import KaldiRecognizer
+        self.wake_word = wake_word
+        self._recognizer = KaldiRecognizer(model, sample_rate, json.dumps([wake_word, "[unk]"]))
+    
+    def accept(self, frame):
+        """Çerçeveyi besler; kelime duyulduysa True döndürür"""
+        if self._recognizer.AcceptWaveform(frame):
+            text = json.loads(self._recognizer.Result()).get("text", "")
+        else:
+            text = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        return self.wake_word in text.split()
+    
+    def end_segment(self):
+        """Konuşma bölümü bittiğinde son sonucu kontrol eder"""
+        text = json.loads(self._recognizer.FinalResult()).get("text", "")
+        return self.wake_word in text.split()
+    
+    def reset(self):
+        self._recognizer.Reset()
+
+class TranscribingWakeWordSpotter:
+    """Vosk yoksa kısa konuşma bölümlerini tam tanıyıcıyla yazıya döküp kelimeyi arar"""
+    def __init__(self, recognizer, sample_rate=SAMPLE_RATE, sample_width=2, wake_word=WAKE_WORD):
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.wake_word = wake_word
+        self.max_bytes = int(WAKE_SEGMENT_LIMIT * sample_rate) * sample_width
+        self._frames = []
+        self._size = 0
+    
+    def accept(self, frame):
+        self._frames.append(frame)
+        self._size += len(frame)
+        return False
+    
+    def end_segment(self):
+        # Uzun bölümler uyandırma kelimesi olamaz, tanıyıcıya gönderilmez
+        if not self._frames or self._size > self.max_bytes:
+            return False
+        audio = sr.AudioData(b"".join(self._frames), self.sample_rate, self.sample_width)
+        try:
+            text = self.recognizer.recognize(audio).lower()
+        except (sr.UnknownValueError, sr.RequestError):
+            return False
+        return self.wake_word in text.split()
+    
+    def reset(self):
+        self._frames = []
+        self._size = 0
+
+class WakeWordDetector:
+    """VAD -> uyandırma kelimesi -> komut kaydı hattı
+
+    Çerçeveler canlı mikrofondan ya da kayıtlı PCM dosyalarından gelebilir;
+    tam tanıyıcı yalnızca uyandırma kelimesinden sonra kaydedilen komut için çalışır.
+    """
+    def __init__(self, vad, spotter, on_command, on_wake=None, sample_rate=SAMPLE_RATE,
+                 sample_width=2, frame_duration=CHUNK_SIZE / SAMPLE_RATE):
+        self.vad = vad
+        self.spotter = spotter
+        self.on_command = on_command
+        self.on_wake = on_wake
+        self.recorder = PhraseRecorder(vad, sample_rate, sample_width, frame_duration)
+        # Kelimenin başı VAD tetiklenmeden önceki çerçevelerdedir
+        self._onset = deque(maxlen=vad.min_speech_frames + 2)
+        self.state = "idle"
+    
+    def process(self, frame):
+        """Tek bir çerçeveyi hattan geçirir"""
+        event = self.vad.process(frame)
+        if self.state == "idle":
+            self._process_idle(frame, event)
+            return
+        
+        finished, audio = self.recorder.process(frame, event)
+        if finished:
+            self.state = "idle"
+            self._onset.clear()
+            self.on_command(audio)
+    
+    def _process_idle(self, frame, event):
+        self._onset.append(frame)
+        if event == "start":
+            for onset_frame in self._onset:
+                if self.spotter.accept(onset_frame):
+                    return self._wake()
+        elif self.vad.active:
+            if self.spotter.accept(frame):
+                return self._wake()
+        elif event == "end":
+            detected = self.spotter.end_segment()
+            self.spotter.reset()
+            if detected:
+                self._wake()
+    
+    def _wake(self):
+        """Uyandırma kelimesi duyuldu, komut kaydına geç"""
+        self.spotter.reset()
+        self.state = "command"
+        # "Alfa, hava durumu" gibi kesintisiz söylenen komutlarda kayıt hemen başlar;
+        # kelimeden sonra sessizlik varsa yeni konuşmanın başlaması beklenir
+        self.recorder.begin(speech_started=self.vad.active)
+        if self.on_wake:
+            self.on_wake()
+    
+    def run(self, frames):
+        """Bir çerçeve dizisini (ör. iter_wav_frames) baştan sona işler"""
+        for frame in frames:
+            self.process(frame)
+        return self
+
+class BargeInDetector:
+    """Asistan konuşurken kullanıcının araya girmesini yakalar ve sesini kaydeder"""
+    def __init__(self, vad, is_playing, on_barge_in, on_command, sample_rate=SAMPLE_RATE,
+                 sample_width=2, frame_duration=CHUNK_SIZE / SAMPLE_RATE):
+        self.vad = vad
+        self.is_playing = is_playing
+        self.on_barge_in = on_barge_in
+        self.on_command = on_command
+        self.recorder = PhraseRecorder(vad, sample_rate, sample_width, frame_duration)
+        self._onset = deque(maxlen=vad.min_speech_frames + 2)
+        self.recording = False
+    
+    def process(self, frame):
+        """Tek bir çerçeveyi işler"""
+        if self.recording:
+            finished, audio = self.recorder.process(frame, self.vad.process(frame))
+            if finished:
+                self.recording = False
+                self.on_command(audio)
+            return
+        
+        if not self.is_playing():
+            self.vad.reset()
+            self._onset.clear()
+            return
+        
+        # Yankı kapısı sayesinde yalnızca kullanıcının sesi VAD'yi tetikler
+        event = self.vad.process(frame)
+        self._onset.append(frame)
+        if event == "start":
+            self.on_barge_in()
+            self.recording = True
+            self.recorder.begin(self._onset, speech_started=True)
+            self._onset.clear()
+    
+    def run(self, frames):
+        """Bir çerçeve dizisini baştan sona işler"""
+        for frame in frames:
+            self.process(frame)
+        return self
+
+class FrameListener:
+    """Mikrofon oturumunun çerçevelerini bir dedektöre besleyen arka plan thread'i
+
+    Kaydedilen komutlar (dedektörün on_command'ı) ayrı bir işçi thread'inde
+    tanınır; böylece tanıma sürerken gürültü tabanı, VAD ve ön tampon beslenmeye devam eder.
+    """
+    def __init__(self, session, detector):
+        self.session = session
+        self.detector = detector
+        self.running = False
+        self._thread = None
+        self._commands = None
+        self._on_command = detector.on_command
+        detector.on_command = self._submit_command
+    
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self._commands = ThreadPoolExecutor(max_workers=1, thread_name_prefix="komut-tanima")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._commands:
+            self._commands.shutdown(wait=False)
+    
+    def _submit_command(self, audio):
+        try:
+            self._commands.submit(self._handle_command, audio)
+        except RuntimeError:
+            # Dinleme durdurulurken gelen son komut atılır
+            pass
+    
+    def _handle_command(self, audio):
+        try:
+            self._on_command(audio)
+        except Exception as e:
+            print(f"Sesli komut işlenemedi: {str(e)}")
+    
+    def _run(self):
+        frames = self.session.subscribe(include_preroll=False)
+        try:
+            while self.running:
+                try:
+                    frame = frames.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                self.detector.process(frame)
+        finally:
+            self.session.unsubscribe(frames)
@@ -0,0 +1,130 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from assistant_engine import AssistantEngine
+from session_log import read_records, recorded_commands
+
+# JSONL satırlarında komutun arandığı alanlar (sırayla)
+COMMAND_FIELDS = ("command", "text", "body")
+
+def parse_line(line):
+    """Düz metin ya da JSON nesnesi satırından komut metnini çıkarır"""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return line
+        for field in COMMAND_FIELDS:
+            if isinstance(record.get(field), str) and record[field].strip():
+                return record[field].strip()
+        return None
+    return line
+
+def read_commands(stream):
+    return [command for command in map(parse_line, stream) if command]
+
+def run_command(engine, command):
+    """Komutu işler; yanıtı ve gecikmeleri (saniye) döndürür"""
+    start = time.perf_counter()
+    intent = engine.router.classify(command)
+    try:
+        response = engine.handle(intent, command)
+        first_token = None
+        # Sohbet yanıtı akış olarak gelir; ilk token süresi ayrıca ölçülür
+        if response is not None and not isinstance(response, str):
+            parts = []
+            for token in response:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(token)
+            response = "".join(parts)
+    except Exception as e:
+        print(f"Komut işleme hatası: {str(e)}", file=sys.stderr)
+        response, first_token = None, None
+    return {
+        "command": command,
+        "intent": intent.name,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "first_token_ms": first_token * 1000 if first_token is not None else None,
+        "response": response
+    }
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def print_summary(results, wall_time):
+    latencies = [result["latency_ms"] for result in results]
+    if not latencies:
+        print("İşlenecek komut yok.", file=sys.stderr)
+        return
+    print(f"\n{len(results)} komut {wall_time:.2f} sn'de işlendi "
+          f"(ort {sum(latencies) / len(latencies):.1f} ms, p50 {percentile(latencies, 0.5):.1f} ms, "
+          f"p95 {percentile(latencies, 0.95):.1f} ms, en fazla {max(latencies):.1f} ms)", file=sys.stderr)
+
+def print_replay_report(recorded, results):
+    """Kayıttaki niyet ve sürelerle şimdiki çalıştırmayı karşılaştırır"""
+    mismatches = 0
+    for entry, result in zip(recorded, results):
+        if entry["intent"] is not None and entry["intent"] != result["intent"]:
+            mismatches += 1
+            print(f"Niyet değişti: '{entry['command']}' {entry['intent']} -> {result['intent']}",
+                  file=sys.stderr)
+    before = [entry["latency_ms"] for entry in recorded if entry["latency_ms"] is not None]
+    after = [result["latency_ms"] for result in results]
+    print(f"Yeniden oynatma: {len(results)} komut, {mismatches} niyet farkı", file=sys.stderr)
+    if before and after:
+        print(f"Kayıtlı p50 {percentile(before, 0.5):.1f} ms / p95 {percentile(before, 0.95):.1f} ms, "
+              f"şimdi p50 {percentile(after, 0.5):.1f} ms / p95 {percentile(after, 0.95):.1f} ms",
+              file=sys.stderr)
+    return mismatches
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alfa asistanını arayüzsüz, toplu komutlarla çalıştırır")
+    parser.add_argument("--file", help="Komut dosyası (düz metin ya da JSONL); verilmezse stdin okunur")
+    parser.add_argument("--workers", type=int, default=4, help="Eşzamanlı işlenen komut sayısı")
+    parser.add_argument("--json", action="store_true", help="Sonuçları JSONL olarak yazdır")
+    parser.add_argument("--open-urls", action="store_true", help="Arama/müzik komutlarında tarayıcıyı aç")
+    parser.add_argument("--replay", metavar="KLASÖR",
+                        help="Oturum günlüğündeki komutları yeniden çalıştırıp kayıtla karşılaştır")
+    args = parser.parse_args(argv)
+
+    recorded = None
+    if args.replay:
+        recorded = recorded_commands(read_records(args.replay))
+        commands = [entry["command"] for entry in recorded]
+    elif args.file:
+        with open(args.file, encoding="utf-8") as f:
+            commands = read_commands(f)
+    else:
+        commands = read_commands(sys.stdin)
+
+    engine = AssistantEngine(open_url=None if args.open_urls else (lambda url: None))
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+            results = list(executor.map(lambda command: run_command(engine, command), commands))
+    finally:
+        engine.close()
+    wall_time = time.perf_counter() - start
+
+    for result in results:
+        if args.json:
+            print(json.dumps(result, ensure_ascii=False))
+        else:
+            first_line = (result["response"] or "").strip().split("\n")[0]
+            print(f"[{result['intent']}] {result['latency_ms']:.1f} ms  {result['command']} -> {first_line}")
+    print_summary(results, wall_time)
+    if recorded is not None and print_replay_report(recorded, results):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
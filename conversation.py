@@ -0,0 +1,176 @@
+import json
+import os
+import re
+import threading
+from collections import deque
+
+# Sohbet geçmişinin kaydedildiği dosya
+CONVERSATION_FILE = "conversation.json"
+# Her istekte gönderilen bağlamın (özet + son mesajlar + yeni mesaj) yaklaşık token üst sınırı
+CONTEXT_TOKEN_BUDGET = 1500
+# Eski konuşmaların özetine ayrılan pay
+SUMMARY_TOKEN_BUDGET = 300
+# Rol, ayraç vb. için mesaj başına eklenen token
+MESSAGE_OVERHEAD = 4
+# Özete alınan her mesajdan tutulan en fazla karakter
+SUMMARY_SNIPPET_CHARS = 160
+
+# Kelimeleri 4 harflik parçalara, noktalama işaretlerini tek tokena böler;
+# Türkçe gibi eklemeli dillerde BPE token sayısına yakın sonuç verir
+_TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+def estimate_tokens(text):
+    """Metnin yaklaşık token sayısı (tokenizer yüklemeden)"""
+    return len(_TOKEN_PATTERN.findall(text)) if text else 0
+
+def _snippet(text):
+    """Mesajın ilk cümlesi, özet satırı için kısaltılmış"""
+    first = _SENTENCE_END.split(" ".join(text.split()), 1)[0]
+    if len(first) > SUMMARY_SNIPPET_CHARS:
+        first = first[:SUMMARY_SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+    return first
+
+class ConversationStore:
+    """Son konuşma turlarını ve eski turların özetini token bütçesi içinde tutar
+
+    Bütçeyi aşan en eski turlar özete (kullanıcı ve asistan mesajlarının ilk
+    cümleleri) aktarılır; özet de bütçesini aşarsa en eski satırları atılır.
+    Böylece istek boyutu oturum ne kadar uzun sürerse sürsün sınırlı kalır.
+    """
+    def __init__(self, path=None, token_budget=CONTEXT_TOKEN_BUDGET,
+                 summary_budget=SUMMARY_TOKEN_BUDGET):
+        # path verilmezse geçmiş yalnızca bellekte tutulur (ör. sunucu oturumları)
+        self.path = path
+        self.token_budget = token_budget
+        self.summary_budget = summary_budget
+
+        # (kullanıcı, asistan, token) turları, en eski başta
+        self._turns = deque()
+        self._turn_tokens = 0
+        # (satır, token) özet satırları
+        self._summary = deque()
+        self._summary_tokens = 0
+        self._lock = threading.Lock()
+        # Kayıtlar sıralanır: geçici dosya paylaşılır, eski anlık görüntü yenisinin üstüne yazılmaz
+        self._save_lock = threading.Lock()
+
+        self.summarized_turns = 0
+
+        if self.path:
+            self._load()
+
+    def _load(self):
+        """Kaydedilmiş geçmişi yükler; dosya yoksa ya da bozuksa boş başlar"""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Sohbet geçmişi yüklenemedi: {str(e)}")
+            return
+
+        for line in data.get("summary") or []:
+            self._append_summary(line)
+        for user, assistant in data.get("turns") or []:
+            self._append_turn(user, assistant)
+        self.summarized_turns = data.get("summarized", 0)
+        self._trim()
+
+    def save(self):
+        """Geçmişi kısa JSON olarak dosyaya yazar (yarım yazılmış dosya bırakmaz)"""
+        if not self.path:
+            return
+        with self._save_lock:
+            with self._lock:
+                data = {
+                    "summary": [line for line, _ in self._summary],
+                    "turns": [[user, assistant] for user, assistant, _ in self._turns],
+                    "summarized": self.summarized_turns
+                }
+            temp_path = self.path + ".tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"Sohbet geçmişi kaydedilemedi: {str(e)}")
+
+    def _append_turn(self, user, assistant):
+        tokens = estimate_tokens(user) + estimate_tokens(assistant) + 2 * MESSAGE_OVERHEAD
+        self._turns.append((user, assistant, tokens))
+        self._turn_tokens += tokens
+
+    def _append_summary(self, line):
+        tokens = estimate_tokens(line)
+        self._summary.append((line, tokens))
+        self._summary_tokens += tokens
+
+    def _trim(self):
+        """Bütçeyi aşan en eski turları özete, özetin fazlasını çöpe taşır"""
+        recent_budget = self.token_budget - self.summary_budget
+        # Son tur, tek başına bütçeyi aşsa bile bir sonraki isteğe kadar tutulur
+        while self._turn_tokens > recent_budget and len(self._turns) > 1:
+            user, assistant, tokens = self._turns.popleft()
+            self._turn_tokens -= tokens
+            self._append_summary(f"Kullanıcı: {_snippet(user)} / Asistan: {_snippet(assistant)}")
+            self.summarized_turns += 1
+        while self._summary_tokens > self.summary_budget and self._summary:
+            _, tokens = self._summary.popleft()
+            self._summary_tokens -= tokens
+
+    def add_turn(self, user, assistant):
+        """Tamamlanan bir soru-yanıt çiftini ekler ve kaydeder"""
+        with self._lock:
+            self._append_turn(user, assistant)
+            self._trim()
+        self.save()
+
+    def context(self, message=""):
+        """Yeni mesajla birlikte bütçeye sığan geçmiş mesaj listesi
+
+        Özet bir sistem mesajı olarak başa eklenir; yeni mesaj uzunsa en eski
+        turlar bu istekten (saklanan geçmişten değil) çıkarılır.
+        """
+        with self._lock:
+            summary = [line for line, _ in self._summary]
+            available = (self.token_budget - self._summary_tokens
+                         - estimate_tokens(message) - MESSAGE_OVERHEAD)
+            turns = []
+            for user, assistant, tokens in reversed(self._turns):
+                if tokens > available:
+                    break
+                available -= tokens
+                turns.append((user, assistant))
+
+        messages = []
+        if summary:
+            messages.append({"role": "system",
+                             "content": "Önceki konuşmanın özeti:\n" + "\n".join(summary)})
+        for user, assistant in reversed(turns):
+            messages.append({"role": "user", "content": user})
+            messages.append({"role": "assistant", "content": assistant})
+        return messages
+
+    def clear(self):
+        """Geçmişi ve özeti siler"""
+        with self._lock:
+            self._turns.clear()
+            self._summary.clear()
+            self._turn_tokens = 0
+            self._summary_tokens = 0
+            self.summarized_turns = 0
+        self.save()
+
+    def stats(self):
+        """Tur, özet ve token sayaçlarını döndürür"""
+        with self._lock:
+            return {
+                "turns": len(self._turns),
+                "summarized_turns": self.summarized_turns,
+                "summary_lines": len(self._summary),
+                "tokens": self._turn_tokens + self._summary_tokens
+            }
@@ -1,12 +1,51 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import threading
-from speech import dinle_turkce, seslendir_turkce, stop_speech, pause_speech, resume_speech, set_speech_speed
+from concurrent.futures import ThreadPoolExecutor
+from speech_synthesis import SentenceBuffer
 import webbrowser
-from datetime import datetime
-from api_services import APIServices
+from assistant_engine import AssistantEngine, HELP_TEXT
+from conversation import ConversationStore, CONVERSATION_FILE
+from notes_store import NotesStore, NOTES_DB
+from transcript import Transcript, TRANSCRIPT_WINDOW
+from ui_queue import UIUpdateQueue
+from theme import ThemeRegistry
+from session_log import SessionLog, read_recent_records, rebuild_transcript
 import time
 
+# Komut işleme havuzu ayarları
+MAX_COMMAND_WORKERS = 4
+MAX_PENDING_COMMANDS = 16
+
+WELCOME_MSG = (
+    "👋 Merhaba! Ben Alfa, Türkçe sesli asistanınız.\n\n"
+    "Size nasıl yardımcı olabilirim?\n"
+    "• Hava durumu bilgisi alabilirim\n"
+    "• Haberleri okuyabilirim\n"
+    "• Yemek tarifi önerebilirim\n"
+    "• Web'de arama yapabilirim\n"
+    "• YouTube'da video arayabilirim\n"
+    "• Müzik açabilirim\n"
+    "• Not alabilirim\n\n"
+    "Mikrofon butonuna tıklayarak veya sol menüden özellikleri kullanarak başlayabilirsiniz."
+)
+
+def _speech():
+    """Ses modülü (pygame, mikrofon, numpy) ilk kullanımda yüklenir, pencerenin açılmasını geciktirmez"""
+    import speech
+    return speech
+
+# Başlangıçta ses önbelleğine alınan sabit yanıtlar
+STATIC_PHRASES = [
+    "Merhaba! Size nasıl yardımcı olabilirim?",
+    "Notunuzu söyleyin...",
+    "Hangi şehir için hava durumu bilgisi istiyorsunuz?",
+    "Hangi müziği dinlemek istediğinizi söyleyin.",
+    "Ne aramak istediğinizi söyleyin.",
+    "Henüz not bulunmuyor.",
+    HELP_TEXT
+]
+
 class RoundedButton(tk.Canvas):
     def __init__(self, parent, text, command=None, width=200, height=40, corner_radius=10, bg="#2d5bb9", fg="white", hover_color="#3a6bc7", **kwargs):
         super().__init__(parent, width=width, height=height, bg=parent["bg"], highlightthickness=0, **kwargs)
@@ -50,6 +89,13 @@ class RoundedButton(tk.Canvas):
         
     def _on_leave(self, event):
         self.itemconfig(self.rect, fill=self.bg)
+    
+    def set_colors(self, canvas_bg, bg, hover_color):
+        """Tema değiştiğinde buton ve zemin renklerini günceller"""
+        self.bg = bg
+        self.hover_color = hover_color
+        self.configure(bg=canvas_bg)
+        self.itemconfig(self.rect, fill=bg)
 
 class AssistantGUI:
     def __init__(self, root):
@@ -57,52 +103,89 @@ class AssistantGUI:
         self.root.title("Alfa - Türkçe Sesli Asistan")
         self.root.geometry("1200x800")
         
-        # API servisleri
-        self.api = APIServices()
+        # Komut işleme arayüzden bağımsız motorda yapılır; API servisleri ilk komutta yüklenir.
+        # Sohbet geçmişi ve notlar kaydedilir, açılışta yeniden yüklenir
+        self.engine = AssistantEngine(note_prompt=self.prompt_note,
+                                      conversation=ConversationStore(CONVERSATION_FILE),
+                                      notes=NotesStore(NOTES_DB))
+        # Komutlar, yanıtlar ve süreler oturum günlüğüne eklenir; sohbet açılışta ondan kurulur
+        self.session_log = SessionLog()
         
-        # Tema ayarları
+        # Tema ayarları; widget'lar kullandıkları renk rollerini kaydeder
         self.is_dark_mode = True
+        self.theme = ThemeRegistry()
         self.setup_theme()
         
         self.is_listening = False
-        self.notes = []
+        self.wake_word_mode = False
+        
+        # Komutlar Tk ana thread'ini bloklamasın diye sınırlı worker havuzu
+        self.command_executor = ThreadPoolExecutor(max_workers=MAX_COMMAND_WORKERS,
+                                                   thread_name_prefix="komut")
+        self.pending_requests = {}
+        self.streaming_requests = set()
+        self.request_counter = 0
+        # Arka plan thread'lerinin arayüz güncellemeleri kare kare toplu uygulanır
+        self.ui_queue = UIUpdateQueue(self.root)
+        # Hız kaydırıcısı ses sistemi hazır olana kadar yalnızca değeri saklar
+        self.speech_speed = 1.0
+        self.speech_ready = threading.Event()
         self.setup_gui()
+        self.ui_queue.start()
         
         # Animasyon için değişkenler
         self.animation_running = False
         self.start_animation()
         
+        # Ses, mikrofon ve HTTP alt sistemleri pencere çizildikten sonra arka planda başlatılır
+        self.warmup_thread = None
+        self.warmup_time = None
+        self.root.after_idle(self.start_warmup)
+        
+    def start_warmup(self):
+        """Isınma thread'ini başlatır (ilk çizimden sonra çağrılır)"""
+        self.warmup_thread = threading.Thread(target=self._warmup, daemon=True, name="isinma")
+        self.warmup_thread.start()
+    
+    def _warmup(self):
+        """Ağır modülleri yükler, ses sistemini ve API servislerini hazırlar"""
+        start = time.perf_counter()
+        try:
+            speech = _speech()
+            speech.get_speech_system()
+            self.speech_ready.set()
+            speech.set_speech_speed(self.speech_speed)
+            # Asistan konuşurken araya girilen komutlar da işlenir
+            speech.set_barge_in_handler(self.on_voice_command)
+            
+            # Sabit ifadelerin seslerini arka planda hazırla
+            speech.prewarm_cache(STATIC_PHRASES + [self.engine.api.get_sample_recipe()])
+        except Exception as e:
+            print(f"Isınma hatası: {str(e)}")
+        self.warmup_time = time.perf_counter() - start
+        
     def setup_theme(self):
-        if self.is_dark_mode:
-            self.bg_color = "#1a1a1a"
-            self.text_color = "#ffffff"
-            self.button_color = "#2d5bb9"
-            self.message_bg = "#2d5bb9"
-            self.user_message_bg = "#2d2d2d"
-            self.accent_color = "#4a90e2"
-            self.hover_color = "#3a6bc7"
-            self.secondary_bg = "#2d2d2d"
-            self.border_color = "#3d3d3d"
-            self.chat_bg = "#1e1e1e"
-        else:
-            self.bg_color = "#ffffff"
-            self.text_color = "#000000"
-            self.button_color = "#007bff"
-            self.message_bg = "#007bff"
-            self.user_message_bg = "#f0f0f0"
-            self.accent_color = "#0056b3"
-            self.hover_color = "#0056b3"
-            self.secondary_bg = "#f8f9fa"
-            self.border_color = "#dee2e6"
-            self.chat_bg = "#f5f5f5"
+        """Seçili temanın renklerini öznitelik olarak da erişilebilir kılar"""
+        for role, color in self.theme.colors.items():
+            setattr(self, role, color)
             
+    def themed(self, widget, bg="bg_color", **roles):
+        """Widget'ı zemin (ve verilen diğer) renk rolleriyle tema kaydına ekler"""
+        return self.theme.register(widget, bg=bg, **roles)
+        
+    def themed_button(self, button, canvas_bg="bg_color"):
+        """Yuvarlak butonu tema kaydına ekler"""
+        return self.theme.register(button, setter=button.set_colors, canvas_bg=canvas_bg,
+                                   bg="button_color", hover_color="hover_color")
+        
     def setup_gui(self):
         # Ana container
-        self.main_container = tk.Frame(self.root, bg=self.bg_color)
+        self.theme.register(self.root, bg="bg_color")
+        self.main_container = self.themed(tk.Frame(self.root, bg=self.bg_color))
         self.main_container.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
         
         # Sol panel
-        self.left_panel = tk.Frame(self.main_container, bg=self.bg_color, width=300)
+        self.left_panel = self.themed(tk.Frame(self.main_container, bg=self.bg_color, width=300))
         self.left_panel.pack(side=tk.LEFT, fill=tk.Y, padx=(0, 20))
         self.left_panel.pack_propagate(False)
         
@@ -113,7 +196,7 @@ class AssistantGUI:
         self.setup_feature_buttons()
         
         # Sağ panel
-        self.right_panel = tk.Frame(self.main_container, bg=self.bg_color)
+        self.right_panel = self.themed(tk.Frame(self.main_container, bg=self.bg_color))
         self.right_panel.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
         # Sohbet alanı
@@ -123,12 +206,12 @@ class AssistantGUI:
         self.setup_bottom_bar()
         
     def setup_header(self):
-        header_frame = tk.Frame(self.left_panel, bg=self.bg_color, pady=30)
+        header_frame = self.themed(tk.Frame(self.left_panel, bg=self.bg_color, pady=30))
         header_frame.pack(fill=tk.X)
         
         # Logo animasyonu için canvas
-        self.logo_canvas = tk.Canvas(header_frame, width=100, height=100, 
-                                   bg=self.bg_color, highlightthickness=0)
+        self.logo_canvas = self.themed(tk.Canvas(header_frame, width=100, height=100, 
+                                               bg=self.bg_color, highlightthickness=0))
         self.logo_canvas.pack(pady=(0, 15))
         
         # Logo çizimi
@@ -136,10 +219,12 @@ class AssistantGUI:
         
         title_label = tk.Label(header_frame, text="Alfa", font=("Helvetica", 36, "bold"),
                              bg=self.bg_color, fg=self.accent_color)
+        self.themed(title_label, fg="accent_color")
         title_label.pack(pady=(0, 5))
         
         subtitle_label = tk.Label(header_frame, text="Türkçe Sesli Asistan",
                                 font=("Helvetica", 14), bg=self.bg_color, fg=self.text_color)
+        self.themed(subtitle_label, fg="text_color")
         subtitle_label.pack()
         
     def draw_logo(self):
@@ -174,13 +259,14 @@ class AssistantGUI:
             
     def create_button(self, parent, text, command, icon=None):
         """Modern görünümlü buton oluşturur"""
-        btn_frame = tk.Frame(parent, bg=self.bg_color)
+        btn_frame = self.themed(tk.Frame(parent, bg=self.bg_color))
         btn_frame.pack(fill=tk.X, pady=5, padx=10)
         
         btn = RoundedButton(btn_frame, f"{icon} {text}" if icon else text,
                           command=command, width=280, height=45,
                           corner_radius=15, bg=self.button_color,
                           fg="#ffffff", hover_color=self.hover_color)
+        self.themed_button(btn)
         btn.pack(fill=tk.X)
         
         return btn
@@ -192,6 +278,7 @@ class AssistantGUI:
             ("📝 Not Al", self.take_note, "note"),
             ("📋 Notlarım", self.show_notes, "notes"),
             ("🎥 YouTube'da Ara", self.search_youtube, "youtube"),
+            ("👂 Alfa Modu", self.toggle_wake_word, "wake"),
             ("🌓 Tema Değiştir", self.toggle_theme, "theme")
         ]
         
@@ -200,17 +287,18 @@ class AssistantGUI:
             
     def setup_chat_area(self):
         # Sohbet alanı container
-        chat_container = tk.Frame(self.right_panel, bg=self.bg_color)
+        chat_container = self.themed(tk.Frame(self.right_panel, bg=self.bg_color))
         chat_container.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
         # Başlık ve temizleme butonu için üst frame
-        header_frame = tk.Frame(chat_container, bg=self.bg_color)
+        header_frame = self.themed(tk.Frame(chat_container, bg=self.bg_color))
         header_frame.pack(fill=tk.X, pady=(0, 10))
         
         # Başlık
         chat_title = tk.Label(header_frame, text="Sohbet",
                             font=("Helvetica", 16, "bold"),
                             bg=self.bg_color, fg=self.accent_color)
+        self.themed(chat_title, fg="accent_color")
         chat_title.pack(side=tk.LEFT)
         
         # Temizleme butonu
@@ -218,6 +306,7 @@ class AssistantGUI:
                                    width=120, height=35, corner_radius=15,
                                    bg=self.button_color, fg="#ffffff",
                                    hover_color=self.hover_color)
+        self.themed_button(clear_button)
         clear_button.pack(side=tk.RIGHT)
         
         # Sohbet alanı
@@ -226,30 +315,44 @@ class AssistantGUI:
                                                  bg=self.chat_bg,
                                                  fg=self.text_color,
                                                  padx=15, pady=15)
+        self.theme.register(self.chat_area, bg="chat_bg", fg="text_color")
         self.chat_area.pack(fill=tk.BOTH, expand=True)
         self.chat_area.config(state=tk.DISABLED)
         
+        # Tüm geçmiş bellekte, widget'ta yalnızca son mesajlar tutulur
+        self.transcript = Transcript(self.chat_area)
+        self.transcript.configure_tags(self.text_color, self.accent_color)
+        self.theme.register(self.transcript, setter=self.transcript.configure_tags,
+                            text_color="text_color", accent_color="accent_color")
+        
+        # Önceki oturumların sohbeti günlükten geri yüklenir
+        self.restore_transcript()
+        
         # Hoş geldin mesajı
-        welcome_msg = (
-            "👋 Merhaba! Ben Alfa, Türkçe sesli asistanınız.\n\n"
-            "Size nasıl yardımcı olabilirim?\n"
-            "• Hava durumu bilgisi alabilirim\n"
-            "• Haberleri okuyabilirim\n"
-            "• Yemek tarifi önerebilirim\n"
-            "• Web'de arama yapabilirim\n"
-            "• YouTube'da video arayabilirim\n"
-            "• Müzik açabilirim\n"
-            "• Not alabilirim\n\n"
-            "Mikrofon butonuna tıklayarak veya sol menüden özellikleri kullanarak başlayabilirsiniz."
-        )
-        self.add_message(welcome_msg, False)
+        self.add_message(WELCOME_MSG, False, log=False)
+        
+    def restore_transcript(self):
+        """Oturum günlüğündeki son sohbeti sohbet alanına yükler
+
+        İlk çizimi geciktirmemek için yalnızca görünen pencereye yetecek son kayıtlar okunur.
+        """
+        start = time.perf_counter()
+        try:
+            records = read_recent_records(self.session_log.directory, TRANSCRIPT_WINDOW)
+            messages = rebuild_transcript(records)
+        except OSError as e:
+            print(f"Oturum günlüğü okunamadı: {str(e)}")
+            return
+        if messages:
+            self.transcript.extend(messages)
+            print(f"{len(messages)} mesaj geri yüklendi ({(time.perf_counter() - start) * 1000:.1f} ms)")
         
     def setup_bottom_bar(self):
-        bottom_bar = tk.Frame(self.right_panel, bg=self.secondary_bg, pady=15)
+        bottom_bar = self.themed(tk.Frame(self.right_panel, bg=self.secondary_bg, pady=15), "secondary_bg")
         bottom_bar.pack(fill=tk.X, padx=10, pady=(10, 0))
         
         # Sol taraf - Mikrofon ve metin girişi
-        left_frame = tk.Frame(bottom_bar, bg=self.secondary_bg)
+        left_frame = self.themed(tk.Frame(bottom_bar, bg=self.secondary_bg), "secondary_bg")
         left_frame.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=15)
         
         # Mikrofon butonu
@@ -257,6 +360,7 @@ class AssistantGUI:
                                       width=50, height=50, corner_radius=25,
                                       bg=self.button_color, fg="#ffffff",
                                       hover_color=self.hover_color)
+        self.themed_button(self.mic_button, "secondary_bg")
         self.mic_button.pack(side=tk.LEFT, padx=(0, 10))
         
         # Mikrofon butonuna basılı tutma olaylarını ekle
@@ -264,18 +368,21 @@ class AssistantGUI:
         self.mic_button.bind("<ButtonRelease-1>", lambda e: self.stop_listening())
         
         # Metin girişi ve gönder butonu container
-        input_container = tk.Frame(left_frame, bg=self.secondary_bg)
+        input_container = self.themed(tk.Frame(left_frame, bg=self.secondary_bg), "secondary_bg")
         input_container.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         # Metin girişi
         input_frame = tk.Frame(input_container, bg=self.secondary_bg,
                              highlightbackground=self.border_color,
                              highlightthickness=1)
+        self.theme.register(input_frame, bg="secondary_bg", highlightbackground="border_color")
         input_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         self.input_field = tk.Entry(input_frame, font=("Helvetica", 13),
                                   bg=self.secondary_bg, fg=self.text_color,
                                   bd=0, insertbackground=self.text_color)
+        self.theme.register(self.input_field, bg="secondary_bg", fg="text_color",
+                            insertbackground="text_color")
         self.input_field.pack(fill=tk.X, padx=10, pady=8)
         self.input_field.bind("<Return>", lambda e: self.send_message())
         
@@ -284,17 +391,18 @@ class AssistantGUI:
                                   width=40, height=40, corner_radius=20,
                                   bg=self.button_color, fg="#ffffff",
                                   hover_color=self.hover_color)
+        self.themed_button(send_button, "secondary_bg")
         send_button.pack(side=tk.LEFT, padx=(10, 0))
         
         # Sağ taraf - Ses kontrolleri
-        right_frame = tk.Frame(bottom_bar, bg=self.secondary_bg)
+        right_frame = self.themed(tk.Frame(bottom_bar, bg=self.secondary_bg), "secondary_bg")
         right_frame.pack(side=tk.RIGHT, padx=15)
         
         # Ses kontrol butonları
         controls = [
-            ("⏹️", stop_speech),
-            ("⏸️", pause_speech),
-            ("▶️", resume_speech)
+            ("⏹️", lambda: _speech().stop_speech()),
+            ("⏸️", lambda: _speech().pause_speech()),
+            ("▶️", lambda: _speech().resume_speech())
         ]
         
         for icon, command in controls:
@@ -302,117 +410,66 @@ class AssistantGUI:
                               width=40, height=40, corner_radius=20,
                               bg=self.button_color, fg="#ffffff",
                               hover_color=self.hover_color)
+            self.themed_button(btn, "secondary_bg")
             btn.pack(side=tk.LEFT, padx=5)
         
         # Hız kontrolü
-        speed_frame = tk.Frame(right_frame, bg=self.secondary_bg)
+        speed_frame = self.themed(tk.Frame(right_frame, bg=self.secondary_bg), "secondary_bg")
         speed_frame.pack(side=tk.LEFT, padx=10)
         
         speed_label = tk.Label(speed_frame, text="Hız:", font=("Helvetica", 12),
                              bg=self.secondary_bg, fg=self.text_color)
+        self.themed(speed_label, "secondary_bg", fg="text_color")
         speed_label.pack(side=tk.LEFT, padx=5)
         
-        self.speed_slider = ttk.Scale(speed_frame, from_=1, to=2,
+        self.speed_slider = ttk.Scale(speed_frame, from_=0.5, to=2,
                                     orient=tk.HORIZONTAL, length=100,
                                     command=self.update_speed)
         self.speed_slider.set(1)
         self.speed_slider.pack(side=tk.LEFT)
         
-        self.speed_value_label = tk.Label(speed_frame, text="1x",
+        self.speed_value_label = tk.Label(speed_frame, text="1.0x",
                                         font=("Helvetica", 12),
                                         bg=self.secondary_bg, fg=self.text_color,
-                                        width=3)
+                                        width=4)
+        self.themed(self.speed_value_label, "secondary_bg", fg="text_color")
         self.speed_value_label.pack(side=tk.LEFT, padx=5)
         
-    def add_message(self, text, is_user=True):
-        self.chat_area.config(state=tk.NORMAL)
-        timestamp = datetime.now().strftime("%H:%M")
-        
-        if is_user:
-            self.chat_area.insert(tk.END, f"\n[{timestamp}] 👤 Siz:\n", "user_header")
-            self.chat_area.insert(tk.END, f"{text}\n", "user_message")
-        else:
-            self.chat_area.insert(tk.END, f"\n[{timestamp}] 🤖 Alfa:\n", "assistant_header")
-            self.chat_area.insert(tk.END, f"{text}\n", "assistant_message")
-            
-        self.chat_area.tag_configure("user_header", font=("Helvetica", 13, "bold"),
-                                   foreground=self.text_color)
-        self.chat_area.tag_configure("user_message", font=("Helvetica", 13),
-                                   foreground=self.text_color)
-        self.chat_area.tag_configure("assistant_header", font=("Helvetica", 13, "bold"),
-                                   foreground=self.accent_color)
-        self.chat_area.tag_configure("assistant_message", font=("Helvetica", 13),
-                                   foreground=self.text_color)
-        
-        self.chat_area.see(tk.END)
-        self.chat_area.config(state=tk.DISABLED)
-        
-    def update_widget_colors(self):
-        """Tema değişikliğinde tüm widget renklerini günceller"""
-        # Ana container renkleri
-        self.root.configure(bg=self.bg_color)
-        self.main_container.configure(bg=self.bg_color)
-        self.left_panel.configure(bg=self.bg_color)
-        self.right_panel.configure(bg=self.bg_color)
-        
-        # Sohbet alanı renkleri
-        self.chat_area.configure(bg=self.chat_bg, fg=self.text_color)
-        
-        # Metin girişi renkleri
-        self.input_field.configure(bg=self.secondary_bg, fg=self.text_color,
-                                 insertbackground=self.text_color)
-        
-        # Hız kontrolü renkleri
-        if hasattr(self, 'speed_value_label'):
-            self.speed_value_label.configure(bg=self.secondary_bg, fg=self.text_color)
-        
-        # Tüm etiketleri güncelle
-        for widget in self.root.winfo_children():
-            if isinstance(widget, tk.Label):
-                widget.configure(bg=self.bg_color, fg=self.text_color)
-            elif isinstance(widget, tk.Frame):
-                widget.configure(bg=self.bg_color)
-                for child in widget.winfo_children():
-                    if isinstance(child, tk.Label):
-                        child.configure(bg=self.bg_color, fg=self.text_color)
-                    elif isinstance(child, tk.Frame):
-                        child.configure(bg=self.bg_color)
-                        for grandchild in child.winfo_children():
-                            if isinstance(grandchild, tk.Label):
-                                grandchild.configure(bg=self.bg_color, fg=self.text_color)
-        
-        # Sohbet alanındaki mesaj etiketlerini güncelle
-        self.chat_area.tag_configure("user_header", font=("Helvetica", 13, "bold"),
-                                   foreground=self.text_color)
-        self.chat_area.tag_configure("user_message", font=("Helvetica", 13),
-                                   foreground=self.text_color)
-        self.chat_area.tag_configure("assistant_header", font=("Helvetica", 13, "bold"),
-                                   foreground=self.accent_color)
-        self.chat_area.tag_configure("assistant_message", font=("Helvetica", 13),
-                                   foreground=self.text_color)
-        
-        # Alt bar renkleri
-        for widget in self.right_panel.winfo_children():
-            if isinstance(widget, tk.Frame):
-                widget.configure(bg=self.secondary_bg)
-                for child in widget.winfo_children():
-                    if isinstance(child, tk.Frame):
-                        child.configure(bg=self.secondary_bg)
-                        for grandchild in child.winfo_children():
-                            if isinstance(grandchild, tk.Label):
-                                grandchild.configure(bg=self.secondary_bg, fg=self.text_color)
-                            elif isinstance(grandchild, tk.Frame):
-                                grandchild.configure(bg=self.secondary_bg)
-                                for great_grandchild in grandchild.winfo_children():
-                                    if isinstance(great_grandchild, tk.Label):
-                                        great_grandchild.configure(bg=self.secondary_bg,
-                                                                fg=self.text_color)
+    def add_message(self, text, is_user=True, log=True):
+        """Mesajı sohbete ekler; komut ve yanıtlar ayrıca kaydedildiği için log=False verilir"""
+        if log:
+            self.session_log.message(text, is_user)
+        self.transcript.append(text, is_user)
+        
+    def add_pending_message(self):
+        """İşlenen komut için geçici bir 'bekleniyor' mesajı ekler, mesaj kimliğini döndürür"""
+        return self.transcript.append("⏳ İşleniyor...", False)
+        
+    def resolve_pending_message(self, message_id, text):
+        """Bekleyen mesajın yerine gelen yanıtı yazar; yanıt yoksa yer tutucuyu kaldırır"""
+        if not self.transcript.set_text(message_id, text) and text:
+            # Sohbet temizlenmiş olabilir, yanıtı sona ekle
+            self.add_message(text, False, log=False)
+        
+    def append_to_pending(self, request_id, token):
+        """Akış halinde gelen yanıt parçasını bekleyen mesajın sonuna ekler"""
+        message_id = self.pending_requests.get(request_id)
+        if message_id is None or not self.transcript.contains(message_id):
+            return
+        
+        if request_id not in self.streaming_requests:
+            # İlk parça geldiğinde yer tutucuyu temizle
+            self.streaming_requests.add(request_id)
+            self.transcript.set_text(message_id, "")
+        self.transcript.append_text(message_id, token)
         
     def toggle_theme(self):
         """Temayı değiştirir ve tüm renkleri günceller"""
         self.is_dark_mode = not self.is_dark_mode
+        # Kayıtlı widget'lar tek geçişte güncellenir
+        elapsed = self.theme.apply("dark" if self.is_dark_mode else "light")
         self.setup_theme()
-        self.update_widget_colors()
+        print(f"Tema değişimi: {len(self.theme)} widget, {elapsed * 1000:.1f} ms")
         
         # Tema değişikliği mesajı
         theme_text = "Koyu tema" if self.is_dark_mode else "Açık tema"
@@ -433,190 +490,158 @@ class AssistantGUI:
         self.mic_button.itemconfig(self.mic_button.text, text="🎤")
         self.add_message("Dinleme durduruldu.", False)
 
+    def toggle_wake_word(self):
+        """'Alfa' uyandırma kelimesiyle eller serbest dinlemeyi açar/kapatır"""
+        if self.wake_word_mode:
+            _speech().stop_wake_word()
+            self.wake_word_mode = False
+            self.add_message("Alfa modu kapatıldı.", False)
+            return
+        
+        if _speech().start_wake_word(self.on_voice_command, self.on_wake_word):
+            self.wake_word_mode = True
+            self.add_message("Alfa modu açık. Komut vermeden önce \"Alfa\" deyin.", False)
+        else:
+            error = _speech().wake_word_error()
+            self.add_message(error or "Alfa modu başlatılamadı. Mikrofonu kontrol edin.", False)
+    
+    def on_wake_word(self):
+        """Uyandırma kelimesi duyulduğunda (arka plan thread'inden) çağrılır"""
+        self.ui_queue.post(self.add_message, "Sizi dinliyorum...", False)
+    
+    def on_voice_command(self, command):
+        """Uyandırma kelimesinden ya da araya girmeden sonra tanınan komutu işler"""
+        self.ui_queue.post(self.add_message, command, True, False)
+        self.ui_queue.post(self.dispatch_command, command, "voice")
+    
     def listen_once(self):
         """Tek seferlik ses dinleme işlemi"""
         try:
-            command = dinle_turkce()
+            command = _speech().dinle_turkce()
             if command:
-                # Asistanın kendi mesajlarını kontrol et
-                if any(phrase in command.lower() for phrase in [
-                    "🤖 alfa:", "alfa:", "merhaba! size nasıl yardımcı olabilirim",
-                    "sizi dinliyorum", "dinleme durduruldu", "için hava durumu bilgisi",
-                    "sıcaklık:", "hissedilen:", "durum:", "nem:", "rüzgar:"
-                ]):
-                    return
-
-                # Kullanıcı mesajını ekle
-                self.root.after(0, lambda: self.add_message(command, True))
-                
-                # Komutu işle ve yanıtı al
-                response = self.process_command(command)
-                
-                # Yanıtı ekle ve seslendir
-                if response:
-                    self.root.after(0, lambda: self.add_message(response, False))
-                    seslendir_turkce(response)
+                # Kullanıcı mesajını ekle ve komutu worker havuzuna gönder
+                self.on_voice_command(command)
                     
         except Exception as e:
             print(f"Ses dinleme hatası: {str(e)}")
-            self.root.after(0, lambda: self.add_message("Ses algılama sırasında bir hata oluştu.", False))
+            self.ui_queue.post(self.add_message, "Ses algılama sırasında bir hata oluştu.", False)
 
     def send_message(self, event=None):
         """Mesaj gönderme işlemini gerçekleştirir"""
         try:
             message = self.input_field.get().strip()
             if message:
-                # Kullanıcı mesajını ekle
-                self.add_message(message, True)
-                
-                # Komutu işle ve yanıtı al
-                response = self.process_command(message)
-                
-                # Eğer yanıt None ise (asistanın kendi mesajı), işlemi sonlandır
-                if response is None:
-                    self.input_field.delete(0, tk.END)
-                    return
-                
-                # Yanıtı ekle
-                self.add_message(response, False)
-                
-                # Metin alanını temizle
+                # Metin alanını hemen temizle, yeni komutlar yazılabilsin
                 self.input_field.delete(0, tk.END)
                 
-                # Yanıtı seslendir
-                seslendir_turkce(response)
+                # Kullanıcı mesajını ekle
+                self.add_message(message, True, log=False)
+                
+                # Komutu arka planda işle
+                self.dispatch_command(message)
                 
         except Exception as e:
             print(f"Mesaj gönderme hatası: {str(e)}")
             self.add_message("Mesaj gönderilirken bir hata oluştu.", False)
             
+    def dispatch_command(self, command, source="text"):
+        """Komutu worker havuzunda çalıştırır, yanıtı ana thread'e taşır"""
+        if len(self.pending_requests) >= MAX_PENDING_COMMANDS:
+            self.add_message("Çok fazla bekleyen komut var, lütfen biraz bekleyin.", False)
+            return None
+        
+        self.request_counter += 1
+        request_id = self.request_counter
+        self.session_log.command(request_id, command, source)
+        self.pending_requests[request_id] = self.add_pending_message()
+        self.command_executor.submit(self._run_command, request_id, command)
+        return request_id
+        
+    def _run_command(self, request_id, command):
+        """Worker thread'inde komutu işler ve seslendirir"""
+        start = time.perf_counter()
+        intent = None
+        try:
+            intent = self.engine.router.classify(command)
+            response = self.engine.handle(intent, command)
+        except Exception as e:
+            print(f"Komut işleme hatası: {str(e)}")
+            response = "Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin."
+        intent_name = intent.name if intent is not None else None
+        
+        # Sohbet yanıtları token token akar
+        if response is not None and not isinstance(response, str):
+            self._stream_response(request_id, response, intent_name, start)
+            return
+        
+        self.session_log.response(request_id, intent_name, response,
+                                  (time.perf_counter() - start) * 1000)
+        # Arayüz güncellemesi her zaman ana thread'de yapılır
+        self.ui_queue.post(self.finish_command, request_id, response)
+        
+        # Yanıtı seslendir (ağ çağrısı olduğu için worker'da kalır)
+        if response:
+            _speech().seslendir_turkce(response)
+            
+    def _stream_response(self, request_id, tokens, intent_name, start):
+        """Akan yanıtı sohbet alanına yazar, biten cümleleri hemen seslendirir"""
+        sentences = SentenceBuffer()
+        parts = []
+        first_token = None
+        try:
+            for token in tokens:
+                if first_token is None:
+                    first_token = (time.perf_counter() - start) * 1000
+                parts.append(token)
+                self.ui_queue.post_append(self.append_to_pending, request_id, token)
+                for sentence in sentences.feed(token):
+                    _speech().seslendir_turkce(sentence)
+        except Exception as e:
+            print(f"Yanıt akışı hatası: {str(e)}")
+        
+        rest = sentences.flush()
+        if rest:
+            _speech().seslendir_turkce(rest)
+        
+        response = "".join(parts)
+        # Süre seslendirmeyi de içerir; ilk token süresi ayrıca kaydedilir
+        self.session_log.response(request_id, intent_name, response,
+                                  (time.perf_counter() - start) * 1000, first_token)
+        self.ui_queue.post(self.finish_command, request_id, response)
+            
+    def finish_command(self, request_id, response):
+        """Komut tamamlandığında bekleyen mesajı yanıtla değiştirir"""
+        message_id = self.pending_requests.pop(request_id, None)
+        streamed = request_id in self.streaming_requests
+        self.streaming_requests.discard(request_id)
+        if message_id is None:
+            if response:
+                self.add_message(response, False, log=False)
+            return
+        
+        if not (streamed and self.transcript.contains(message_id)):
+            # Yanıt boşsa (ör. akış hatası) yer tutucu kaldırılır
+            self.resolve_pending_message(message_id, response)
+            
     def update_speed(self, value):
         """Konuşma hızını günceller"""
         try:
-            speed = int(float(value))
+            # 0.1'lik adımlara yuvarla
+            speed = round(float(value), 1)
             if hasattr(self, 'speed_value_label'):
                 self.speed_value_label.config(text=f"{speed}x")
-            set_speech_speed(speed)
+            self.speech_speed = speed
+            # Kaydırıcı kurulurken de çağrılır; ses sistemi ısınmada bu değerle başlatılır
+            if self.speech_ready.is_set():
+                _speech().set_speech_speed(speed)
         except Exception as e:
             print(f"Hız güncelleme hatası: {str(e)}")
             
-    def process_command(self, command):
-        """Komutları işler ve uygun yanıtı döndürür"""
-        try:
-            if isinstance(command, str):
-                command = command.lower().strip()
-            else:
-                return "Üzgünüm, bu komutu anlayamadım."
-            
-            # Asistanın kendi mesajlarını işleme
-            if any(phrase in command.lower() for phrase in [
-                "🤖 alfa:", "alfa:", "merhaba! size nasıl yardımcı olabilirim",
-                "sizi dinliyorum", "dinleme durduruldu", "için hava durumu bilgisi",
-                "sıcaklık:", "hissedilen:", "durum:", "nem:", "rüzgar:"
-            ]):
-                return None
-            
-            # Selamlama komutları
-            if any(word in command for word in ["merhaba", "selam", "hey", "alo"]):
-                return "Merhaba! Size nasıl yardımcı olabilirim?"
-            
-            # Tarih ve saat
-            if any(word in command for word in ["saat", "tarih", "gün"]):
-                return self.api.get_date_time()
-            
-            # Hava durumu komutları
-            if "hava" in command or "hava durumu" in command:
-                # Tüm gereksiz kelimeleri temizle
-                city = command.replace("hava", "").replace("durumu", "").replace("için", "").strip()
-                # Sayısal değerleri ve özel karakterleri temizle
-                city = ''.join(c for c in city if not c.isdigit() and c not in '%°C')
-                if not city:
-                    return "Hangi şehir için hava durumu bilgisi istiyorsunuz?"
-                return self.api.get_weather(city)
-            
-            # Haber komutları
-            if "haber" in command:
-                return self.api.process_news_request(command)
-            
-            # Yemek tarifi komutları
-            if any(word in command for word in ["tarif", "yemek", "yemek tarifi"]):
-                return self.api.get_recipe()
-            
-            # YouTube komutları
-            if "youtube" in command:
-                if "ara" in command:
-                    query = command.replace("youtube", "").replace("ara", "").strip()
-                    if not query:
-                        return "YouTube'da ne aramak istediğinizi söyleyin."
-                    webbrowser.open(f"https://www.youtube.com/results?search_query={query}")
-                    return f"YouTube'da '{query}' için arama yapılıyor..."
-                else:
-                    return self.api.open_youtube()
-            
-            # Müzik komutları
-            if any(word in command for word in ["müzik", "şarkı", "çal"]):
-                query = command.replace("müzik", "").replace("şarkı", "").replace("çal", "").strip()
-                if not query:
-                    return "Hangi müziği dinlemek istediğinizi söyleyin."
-                webbrowser.open(f"https://www.youtube.com/results?search_query={query}+music")
-                return f"'{query}' müziği aranıyor..."
-            
-            # Web arama komutları - Sadece "ara" kelimesi tek başına veya başta ise
-            if command.startswith("ara ") or command == "ara":
-                query = command.replace("ara", "").strip()
-                if not query:
-                    return "Ne aramak istediğinizi söyleyin."
-                webbrowser.open(f"https://www.google.com/search?q={query}")
-                return f"'{query}' için web araması yapılıyor..."
-            
-            # Not alma komutları
-            if "not" in command:
-                if "al" in command:
-                    note = command.replace("not", "").replace("al", "").strip()
-                    if not note:
-                        self.add_message("Notunuzu söyleyin...", False)
-                        seslendir_turkce("Notunuzu söyleyin...")
-                        note = dinle_turkce()
-                        if not note:
-                            return "Not alınamadı. Lütfen tekrar deneyin."
-                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-                    self.notes.append((timestamp, note))
-                    return f"Not alındı: {note}"
-                elif "notlarım" in command or "notları göster" in command:
-                    if not self.notes:
-                        return "Henüz not bulunmuyor."
-                    notes_text = "📝 Notlarınız:\n\n"
-                    for timestamp, note in self.notes:
-                        notes_text += f"[{timestamp}]\n{note}\n\n"
-                    return notes_text
-            
-            # Yardım komutu
-            if "yardım" in command or "ne yapabilirsin" in command:
-                return (
-                    "Size şu konularda yardımcı olabilirim:\n"
-                    "• Tarih ve saat bilgisi\n"
-                    "• Hava durumu bilgisi\n"
-                    "• Güncel haberler\n"
-                    "• Yemek tarifleri\n"
-                    "• YouTube'da video arama\n"
-                    "• Müzik çalma\n"
-                    "• Web'de arama yapma\n"
-                    "• Not alma ve notları görüntüleme\n"
-                    "• Tema değiştirme\n"
-                    "• Sohbet etme\n\n"
-                    "Ayrıca sol menüden özellikleri de kullanabilirsiniz."
-                )
-            
-            # Eğer komut bir şehir adı ise, hava durumu sorgusu olarak işle
-            if len(command.split()) == 1 and command not in ["ara", "yardım", "not"]:
-                return self.api.get_weather(command)
-            
-            # Diğer tüm komutlar için DeepSeek AI ile sohbet et
-            return self.api.chat_with_deepseek(command)
-            
-        except Exception as e:
-            print(f"Komut işleme hatası: {str(e)}")
-            return "Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin."
+    def prompt_note(self):
+        """Boş "not al" komutunda notu sesli olarak ister"""
+        self.ui_queue.post(self.add_message, "Notunuzu söyleyin...", False)
+        _speech().seslendir_turkce("Notunuzu söyleyin...")
+        return _speech().dinle_turkce()
     
     def search_web(self):
         query = self.show_input_dialog("Web'de Ara", "Ne aramak istiyorsunuz?")
@@ -633,18 +658,10 @@ class AssistantGUI:
     def take_note(self):
         note = self.show_input_dialog("Not Al", "Notunuzu yazın:")
         if note:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-            self.notes.append((timestamp, note))
-            self.add_message(f"Not alındı: {note}", False)
+            self.add_message(self.engine.add_note(note), False)
             
     def show_notes(self):
-        if not self.notes:
-            self.add_message("Henüz not bulunmuyor.", False)
-        else:
-            notes_text = "📝 Notlarınız:\n\n"
-            for timestamp, note in self.notes:
-                notes_text += f"[{timestamp}]\n{note}\n\n"
-            self.add_message(notes_text, False)
+        self.add_message(self.engine.notes_text(), False)
             
     def search_youtube(self):
         query = self.show_input_dialog("YouTube'da Ara", "Ne aramak istiyorsunuz?")
@@ -691,30 +708,22 @@ class AssistantGUI:
 
     def clear_chat(self):
         """Sohbet geçmişini temizler"""
-        self.chat_area.config(state=tk.NORMAL)
-        self.chat_area.delete(1.0, tk.END)
-        self.chat_area.config(state=tk.DISABLED)
+        self.transcript.clear()
+        self.session_log.clear()
+        # Modelin gördüğü sohbet bağlamı da sıfırlanır
+        self.engine.conversation.clear()
         
         # Hoş geldin mesajını tekrar ekle
-        welcome_msg = (
-            "👋 Merhaba! Ben Alfa, Türkçe sesli asistanınız.\n\n"
-            "Size nasıl yardımcı olabilirim?\n"
-            "• Hava durumu bilgisi alabilirim\n"
-            "• Haberleri okuyabilirim\n"
-            "• Yemek tarifi önerebilirim\n"
-            "• Web'de arama yapabilirim\n"
-            "• YouTube'da video arayabilirim\n"
-            "• Müzik açabilirim\n"
-            "• Not alabilirim\n\n"
-            "Mikrofon butonuna tıklayarak veya sol menüden özellikleri kullanarak başlayabilirsiniz."
-        )
-        self.add_message(welcome_msg, False)
+        self.add_message(WELCOME_MSG, False, log=False)
         self.add_message("Sohbet geçmişi temizlendi.", False)
 
 def main():
     root = tk.Tk()
     app = AssistantGUI(root)
     root.mainloop()
+    app.command_executor.shutdown(wait=False, cancel_futures=True)
+    app.engine.close()
+    app.session_log.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,120 @@
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Uç nokta başına (bağlantı, okuma) zaman aşımları, saniye
+ENDPOINT_TIMEOUTS = {
+    "weather": (3.05, 5),
+    "news": (3.05, 8),
+    "recipe": (3.05, 8),
+    "deepseek": (3.05, 60)
+}
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Sadece idempotent GET istekleri tekrar denenir
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.25
+BACKOFF_MAX = 4.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Host başına açık tutulan bağlantı havuzu
+POOL_CONNECTIONS = 8
+POOL_MAXSIZE = 8
+
+class HTTPClient:
+    """APIServices için ortak, bağlantı havuzlu (keep-alive) HTTP katmanı"""
+    def __init__(self, timeouts=None, max_retries=MAX_RETRIES):
+        self.timeouts = dict(ENDPOINT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.max_retries = max_retries
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                              max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def get(self, endpoint, url, **kwargs):
+        """GET isteği; ağ hatası ve geçici durum kodlarında üstel geri çekilmeyle tekrar dener"""
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = self._request("GET", endpoint, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if last_attempt:
+                    raise
+                self._retry_wait(endpoint, attempt)
+                continue
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                retry_after = response.headers.get("Retry-After")
+                response.close()
+                self._retry_wait(endpoint, attempt, retry_after)
+                continue
+            return response
+
+    def post(self, endpoint, url, **kwargs):
+        """POST isteği (idempotent olmadığı için tekrar denenmez)"""
+        return self._request("POST", endpoint, url, **kwargs)
+
+    def _request(self, method, endpoint, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeouts.get(endpoint, DEFAULT_TIMEOUT))
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            self.record(endpoint, time.perf_counter() - start, error=True)
+            raise
+        # Akış isteklerinde süre başlıkların gelişine kadar ölçülür
+        self.record(endpoint, time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+
+    def _retry_wait(self, endpoint, attempt, retry_after=None):
+        """Tam rastgele (full jitter) üstel bekleme"""
+        delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+        if retry_after and retry_after.isdigit():
+            delay = min(BACKOFF_MAX, float(retry_after))
+        self.record_retry(endpoint)
+        time.sleep(delay)
+
+    def _endpoint_stats(self, endpoint):
+        if endpoint not in self._stats:
+            self._stats[endpoint] = {
+                "requests": 0,
+                "errors": 0,
+                "retries": 0,
+                "total_latency": 0.0,
+                "max_latency": 0.0
+            }
+        return self._stats[endpoint]
+
+    def record(self, endpoint, latency, error=False):
+        """İstek sonucunu sayaçlara ekler (AsyncAPIServices'in aiohttp istekleri de buraya yazılır)"""
+        with self._stats_lock:
+            stats = self._endpoint_stats(endpoint)
+            stats["requests"] += 1
+            stats["total_latency"] += latency
+            stats["max_latency"] = max(stats["max_latency"], latency)
+            if error:
+                stats["errors"] += 1
+
+    def record_retry(self, endpoint):
+        with self._stats_lock:
+            self._endpoint_stats(endpoint)["retries"] += 1
+
+    def stats(self):
+        """Uç nokta başına istek, hata, tekrar sayıları ve gecikmeler"""
+        with self._stats_lock:
+            result = {}
+            for endpoint, stats in self._stats.items():
+                result[endpoint] = dict(stats)
+                count = stats["requests"]
+                result[endpoint]["mean_latency"] = stats["total_latency"] / count if count else None
+            return result
@@ -0,0 +1,274 @@
+import re
+import time
+from dataclasses import dataclass, field
+from itertools import product
+
+from news_engine import news_category
+
+# "+" ile biten anahtar kelimeler bu eklerle de eşleşir (ismin -e hali bilerek yok: "nota" ≠ "not")
+NOUN_SUFFIXES = (
+    "ler", "lar", "leri", "ları", "lerim", "larım", "lerimi", "larımı", "lerini", "larını",
+    "lerden", "lardan", "i", "ı", "u", "ü", "si", "sı", "su", "sü", "im", "ım", "um", "üm",
+    "imi", "ımı", "umu", "ümü", "ini", "ını", "unu", "ünü", "in", "ın", "un", "ün",
+    "nin", "nın", "nun", "nün", "yi", "yı", "yu", "yü", "sini", "sını", "sunu", "sünü",
+    "de", "da", "te", "ta", "den", "dan"
+)
+
+# Niyet -> (öncelik, anahtar ifadeler); birden çok niyet eşleşirse yüksek öncelik kazanır
+INTENT_RULES = {
+    "briefing": (100, ["günlük özet+", "gün+ özet+", "brifing+"]),
+    "note_search": (95, ["notlarımda", "notlarda", "notlarımı ara", "notlarda ara", "not ara"]),
+    "note_take": (90, ["not al", "not et", "not tut", "not+ ekle"]),
+    "note_list": (90, ["notlarım", "notlarımı", "notları göster", "notlarımı göster", "notlar"]),
+    "youtube": (80, ["youtube+"]),
+    "weather": (70, ["hava", "hava durum+"]),
+    "news": (70, ["haber+"]),
+    "date_time": (60, ["saat+", "tarih+", "gün+"]),
+    "recipe": (50, ["tarif+", "yemek+", "yemek tarif+"]),
+    "music": (50, ["müzik+", "şarkı+", "çal"]),
+    "web_search": (40, ["^ara"]),
+    "help": (30, ["yardım+", "ne yapabilirsin"]),
+    "greeting": (20, ["merhaba", "selam+", "hey", "alo"])
+}
+
+# Yuva çıkarımında atılan dolgu kelimeleri
+WEATHER_FILLER = {"durumu", "için", "nasıl", "ne", "nedir", "bugün", "yarın", "şu", "an", "şimdi",
+                  "olacak", "mi", "mı", "de", "da", "bana", "söyle", "göster"}
+QUERY_FILLER = {"ara", "bul", "aç", "bana", "için", "lütfen"}
+NOTE_FILLER = QUERY_FILLER | {"içinde", "içeren", "geçen", "kelimesi", "olan", "notları", "notlarımı", "göster"}
+
+# Not listeleme/aramada dönem ifadeleri (notes_store.NOTE_PERIODS)
+NOTE_PERIOD_PHRASES = {
+    ("bugün",): "today", ("bugünkü",): "today",
+    ("dün",): "yesterday", ("dünkü",): "yesterday",
+    ("bu", "hafta"): "this_week", ("bu", "haftaki"): "this_week",
+    ("geçen", "hafta"): "last_week", ("geçen", "haftaki"): "last_week",
+    ("bu", "ay"): "this_month", ("bu", "ayki"): "this_month",
+    ("geçen", "ay"): "last_month", ("geçen", "ayki"): "last_month"
+}
+
+_APOSTROPHE_SUFFIX = re.compile(r"['’`]\w*")
+_NON_WORD = re.compile(r"[^\w]+")
+
+def turkish_lower(text):
+    """Türkçe büyük/küçük harf kurallarıyla küçültür (I -> ı, İ -> i)"""
+    return text.replace("I", "ı").replace("İ", "i").lower()
+
+def tokenize(text):
+    """Metni (kelimeler, eşleme tokenları) olarak böler; ikisi aynı uzunluktadır
+
+    Kesme işaretinden sonraki ek atılır ("istanbul'da" -> "istanbul").
+    """
+    words = turkish_lower(text).split()
+    tokens = [_NON_WORD.sub("", _APOSTROPHE_SUFFIX.sub("", word)) for word in words]
+    return words, tokens
+
+@dataclass
+class Intent:
+    """Sınıflandırılmış komut"""
+    name: str
+    slots: dict = field(default_factory=dict)
+    span: tuple = (0, 0)
+
+class _TrieNode:
+    __slots__ = ("children", "rules")
+
+    def __init__(self):
+        self.children = {}
+        self.rules = []
+
+class IntentRouter:
+    """Tokenlara ayrılmış Türkçe komutları derlenmiş bir anahtar kelime trie'si ile tek geçişte sınıflandırır"""
+    def __init__(self, rules=None):
+        self._root = _TrieNode()
+        self.keywords = set()
+        for name, (priority, phrases) in (rules or INTENT_RULES).items():
+            for phrase in phrases:
+                self._add(name, priority, phrase)
+
+    @staticmethod
+    def _forms(token):
+        if token.endswith("+"):
+            stem = token[:-1]
+            return [stem] + [stem + suffix for suffix in NOUN_SUFFIXES]
+        return [token]
+
+    def _add(self, name, priority, phrase):
+        start_only = phrase.startswith("^")
+        tokens = phrase.lstrip("^").split()
+        for forms in product(*(self._forms(token) for token in tokens)):
+            node = self._root
+            for form in forms:
+                node = node.children.setdefault(form, _TrieNode())
+                self.keywords.add(form)
+            node.rules.append((priority, name, start_only))
+
+    def _matches(self, tokens):
+        """Tüm (öncelik, uzunluk, başlangıç, niyet) eşleşmeleri"""
+        for i in range(len(tokens)):
+            node = self._root
+            j = i
+            while j < len(tokens):
+                node = node.children.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                for priority, name, start_only in node.rules:
+                    if start_only and i != 0:
+                        continue
+                    yield priority, j - i, -i, name
+
+    def classify(self, command):
+        """Komutu Intent olarak döndürür"""
+        if not isinstance(command, str) or not command.strip():
+            return Intent("unknown")
+
+        lowered = turkish_lower(command).strip()
+
+        words, tokens = tokenize(lowered)
+        best = max(self._matches(tokens), default=None)
+        if best is None:
+            # Tek kelimelik bilinmeyen komut şehir adı kabul edilir
+            if len(tokens) == 1 and tokens[0] and tokens[0] not in self.keywords:
+                return Intent("weather", {"city": words[0]}, (0, 1))
+            return Intent("chat", {"message": lowered})
+
+        _, length, negative_start, name = best
+        span = (-negative_start, -negative_start + length)
+        return Intent(name, self._slots(name, lowered, words, tokens, span), span)
+
+    def _slots(self, name, text, words, tokens, span):
+        """Niyete özgü yuvaları (şehir, kategori, sorgu, not) çıkarır"""
+        rest = [(word, token) for i, (word, token) in enumerate(zip(words, tokens))
+                if not span[0] <= i < span[1]]
+
+        if name == "weather":
+            city = " ".join(token for _, token in rest if token and token not in WEATHER_FILLER)
+            city = "".join(c for c in city if not c.isdigit()).strip()
+            return {"city": city}
+        if name == "news":
+            return {"category": news_category(text)}
+        if name == "youtube":
+            search = any(token == "ara" for _, token in rest)
+            query = " ".join(word for word, token in rest if token not in QUERY_FILLER)
+            return {"search": search, "query": query}
+        if name in ("music", "web_search"):
+            query = " ".join(word for word, token in rest
+                             if token not in QUERY_FILLER and token not in self.keywords)
+            return {"query": query}
+        if name == "note_take":
+            return {"note": " ".join(word for word, _ in rest)}
+        if name in ("note_list", "note_search"):
+            return self._note_slots(name, rest)
+        return {}
+
+    @staticmethod
+    def _note_slots(name, rest):
+        """Not listeleme/aramada dönem, sayfa ve (aramada) sorgu yuvaları"""
+        tokens = [token for _, token in rest]
+        period, page, used = None, 1, set()
+        i = 0
+        while i < len(tokens):
+            pair = tuple(tokens[i:i + 2])
+            if len(pair) == 2 and pair in NOTE_PERIOD_PHRASES:
+                period = NOTE_PERIOD_PHRASES[pair]
+                used.update((i, i + 1))
+                i += 2
+                continue
+            if (tokens[i],) in NOTE_PERIOD_PHRASES:
+                period = NOTE_PERIOD_PHRASES[(tokens[i],)]
+                used.add(i)
+            elif tokens[i] == "sayfa" and i + 1 < len(tokens) and tokens[i + 1].isdigit():
+                page = max(1, int(tokens[i + 1]))
+                used.update((i, i + 1))
+                i += 2
+                continue
+            i += 1
+
+        slots = {"period": period, "page": page}
+        if name == "note_search":
+            slots["query"] = " ".join(word for i, (word, token) in enumerate(rest)
+                                      if i not in used and token not in NOTE_FILLER)
+        return slots
+
+# Doğruluk ölçümü için etiketli örnekler: (komut, beklenen niyet, beklenen yuvalar)
+LABELED_EXAMPLES = [
+    ("merhaba", "greeting", {}),
+    ("selamlar alfa nasılsın", "greeting", {}),
+    ("saat kaç", "date_time", {}),
+    ("bugün günlerden ne", "date_time", {}),
+    ("tarih nedir", "date_time", {}),
+    ("güncel haberler", "news", {"category": "genel"}),
+    ("güneş ne zaman batıyor", "chat", {}),
+    ("hava durumu istanbul", "weather", {"city": "istanbul"}),
+    ("İzmir'de hava nasıl", "weather", {"city": "izmir"}),
+    ("bugün ankara için hava durumu", "weather", {"city": "ankara"}),
+    ("hava", "weather", {"city": ""}),
+    ("Eskişehir", "weather", {"city": "eskişehir"}),
+    ("havalimanına nasıl giderim", "chat", {}),
+    ("spor haberleri", "news", {"category": "spor"}),
+    ("ekonomi haberlerini oku", "news", {"category": "ekonomi"}),
+    ("tüm haberler", "news", {"category": "tümü"}),
+    ("müzik haberleri", "news", {"category": "genel"}),
+    ("yemek tarifi öner", "recipe", {}),
+    ("bir tarif söyle", "recipe", {}),
+    ("youtube aç", "youtube", {"search": False}),
+    ("youtube'da kedi videoları ara", "youtube", {"search": True, "query": "kedi videoları"}),
+    ("tarkan şarkısı çal", "music", {"query": "tarkan"}),
+    ("müzik aç", "music", {"query": ""}),
+    ("ara python dersleri", "web_search", {"query": "python dersleri"}),
+    ("bunu nereden ararım", "chat", {}),
+    ("not al süt ve ekmek", "note_take", {"note": "süt ve ekmek"}),
+    ("not al alışveriş listesi", "note_take", {"note": "alışveriş listesi"}),
+    ("notlarımı göster", "note_list", {}),
+    ("notlarım", "note_list", {}),
+    ("bugünkü notlarım", "note_list", {"period": "today"}),
+    ("notlarım sayfa 3", "note_list", {"page": 3}),
+    ("notlarımda market ara", "note_search", {"query": "market", "period": None}),
+    ("geçen hafta notlarımda doktor ara", "note_search", {"query": "doktor", "period": "last_week"}),
+    ("notlarda fatura geçen", "note_search", {"query": "fatura"}),
+    ("şarkıyı çal", "music", {}),
+    ("nota nasıl okunur", "chat", {}),
+    ("yardım", "help", {}),
+    ("ne yapabilirsin", "help", {}),
+    ("günlük özet", "briefing", {}),
+    ("günün özetini ver", "briefing", {}),
+    ("bana brifing ver", "briefing", {}),
+    ("alo", "greeting", {}),
+    ("salonu nasıl dekore ederim", "chat", {}),
+    ("yapay zeka nedir", "chat", {}),
+    ("Alfa: saat kaç", "date_time", {}),
+    ("projenin durum: ne", "chat", {}),
+]
+
+def evaluate(router=None, examples=LABELED_EXAMPLES):
+    """Etiketli örneklerde (doğruluk, hatalı örnekler) döndürür"""
+    router = router or IntentRouter()
+    failures = []
+    for command, expected_name, expected_slots in examples:
+        intent = router.classify(command)
+        slots_ok = all(intent.slots.get(key) == value for key, value in expected_slots.items())
+        if intent.name != expected_name or not slots_ok:
+            failures.append((command, expected_name, expected_slots, intent))
+    return 1 - len(failures) / len(examples), failures
+
+def benchmark_router(iterations=2000, router=None):
+    """Komut başına ortalama sınıflandırma süresi (saniye)"""
+    router = router or IntentRouter()
+    commands = [command for command, _, _ in LABELED_EXAMPLES]
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for command in commands:
+            router.classify(command)
+    return (time.perf_counter() - start) / (iterations * len(commands))
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    router = IntentRouter()
+    build_time = time.perf_counter() - start
+
+    accuracy, failures = evaluate(router)
+    print(f"Doğruluk: %{accuracy * 100:.1f} ({len(LABELED_EXAMPLES) - len(failures)}/{len(LABELED_EXAMPLES)})")
+    for command, expected_name, expected_slots, intent in failures:
+        print(f"  '{command}': beklenen {expected_name} {expected_slots}, bulunan {intent.name} {intent.slots}")
+    print(f"Trie derleme: {build_time * 1000:.1f} ms, komut başına {benchmark_router(router=router) * 1e6:.1f} µs")
@@ -0,0 +1,314 @@
+"""Sunucu modu için yük testi
+
+Hava durumu, haber, tarif ve sohbet servisleri yerel sahte sunuculara
+yönlendirilir; böylece ölçülen süre gerçek API'lerin değil asistanın kendisidir.
+
+    python load_test.py --sessions 50 --commands 10 --latency 0.05
+
+Sohbet akışının (SSE) ayrıştırılması aynı sahte sunucuyla ayrıca denetlenebilir:
+
+    python load_test.py --check-sse
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import threading
+import time
+
+from aiohttp import web, ClientSession
+
+# Oturumların sırayla gönderdiği komutlar (sohbet, önbellekli ve paralel istekler karışık)
+LOAD_COMMANDS = [
+    "merhaba",
+    "saat kaç",
+    "istanbul hava durumu",
+    "ankara için hava durumu",
+    "spor haberleri",
+    "tüm haberler",
+    "yemek tarifi öner",
+    "not al süt ve ekmek",
+    "notlarımı göster",
+    "yapay zeka nedir",
+    "bana bir fıkra anlat",
+    "günlük özet"
+]
+
+# Sahte sohbet yanıtı (kelime kelime akıtılır)
+STUB_CHAT_REPLY = "Bu, yük testi için sahte sunucudan gelen kısa bir yanıttır. İyi günler!"
+# SSE denetiminde akışın kaç baytlık parçalar halinde yazılacağı (satırlar ve UTF-8 karakterleri bölünür)
+SSE_SPLIT_BYTES = 7
+# SSE denetiminde bağlantı koptuğunda o ana kadar gönderilmiş kelime sayısı
+SSE_ERROR_AFTER_WORDS = 3
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def stub_app(latency):
+    """Dış API'lerin yerine geçen sahte sunucu; her yanıt latency saniye gecikir"""
+    async def delay():
+        if latency:
+            await asyncio.sleep(latency * random.uniform(0.5, 1.5))
+
+    async def weather(request):
+        await delay()
+        return web.json_response({
+            "main": {"temp": 21.5, "humidity": 60, "feels_like": 21.0},
+            "weather": [{"description": "clear sky"}],
+            "wind": {"speed": 3.2}
+        })
+
+    async def news(request):
+        await delay()
+        query = request.query.get("q", "genel")
+        return web.json_response({"status": "ok", "articles": [
+            {"title": f"{query} haberi {i}", "source": {"name": "Sahte Ajans"},
+             "url": f"https://example.com/{query}/{i}"}
+            for i in range(8)
+        ]})
+
+    async def recipe(request):
+        await delay()
+        return web.json_response({"recipes": [{
+            "title": "Mercimek Çorbası", "readyInMinutes": 30, "servings": 4,
+            "extendedIngredients": [{"amount": 1, "unit": "su bardağı", "name": "kırmızı mercimek"}],
+            "instructions": "Malzemeleri haşlayıp blenderdan geçirin."
+        }]})
+
+    async def chat(request):
+        body = await request.json()
+        await delay()
+        if not body.get("stream"):
+            return web.json_response({"choices": [{"message": {"content": STUB_CHAT_REPLY}}]})
+        # mode=split: satırlar parça sınırlarında bölünür, mode=error: akış ortasında bağlantı kopar
+        mode = request.query.get("mode")
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        events = [": keep-alive\n\n"] if mode == "split" else []
+        for word in STUB_CHAT_REPLY.split(" "):
+            chunk = {"choices": [{"delta": {"content": word + " "}}]}
+            events.append(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n")
+        if mode == "error":
+            for event in events[:SSE_ERROR_AFTER_WORDS]:
+                await response.write(event.encode("utf-8"))
+            await asyncio.sleep(0.05)
+            request.transport.close()
+            return response
+        events.append("data: [DONE]\n\n")
+        if mode == "split":
+            payload = "".join(events).encode("utf-8")
+            events = [payload[i:i + SSE_SPLIT_BYTES] for i in range(0, len(payload), SSE_SPLIT_BYTES)]
+        try:
+            for event in events:
+                await response.write(event if isinstance(event, bytes) else event.encode("utf-8"))
+                await asyncio.sleep(0.005)
+            await response.write_eof()
+        except ConnectionResetError:
+            # İstemci [DONE] satırını okuyunca bağlantıyı kapatabilir
+            pass
+        return response
+
+    app = web.Application()
+    app.add_routes([
+        web.get("/weather", weather),
+        web.get("/news/{path}", news),
+        web.get("/recipes", recipe),
+        web.post("/chat", chat)
+    ])
+    return app
+
+async def _start(app, port):
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", port).start()
+    return runner
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+async def http_client(client, base_url, commands, results, audio):
+    """Komutları /api/command üzerinden (NDJSON akışı ile) gönderen istemci"""
+    session_id = None
+    for command in commands:
+        start = time.perf_counter()
+        first_token = None
+        ok = False
+        async with client.post(f"{base_url}/api/command",
+                               json={"session": session_id, "command": command,
+                                     "stream": True, "audio": audio}) as response:
+            async for line in response.content:
+                event = json.loads(line)
+                if event["type"] == "token" and first_token is None:
+                    first_token = time.perf_counter() - start
+                elif event["type"] == "done":
+                    session_id = event["session"]
+                    ok = True
+        results.append(("http", ok, time.perf_counter() - start, first_token))
+
+async def ws_client(client, base_url, commands, results, audio):
+    """Komutları tek bir WebSocket bağlantısı üzerinden gönderen istemci"""
+    async with client.ws_connect(f"{base_url}/ws") as ws:
+        await ws.receive_json()
+        for command in commands:
+            start = time.perf_counter()
+            first_token = None
+            await ws.send_json({"command": command, "audio": audio})
+            while True:
+                event = await ws.receive_json()
+                if event["type"] == "token" and first_token is None:
+                    first_token = time.perf_counter() - start
+                if event["type"] in ("done", "error"):
+                    break
+            results.append(("ws", event["type"] == "done", time.perf_counter() - start, first_token))
+
+async def run_load(sessions, commands_per_session, latency, ws_fraction=0.5, audio=False):
+    """Sahte API'ler ve sunucu ile yük testi çalıştırır; (sonuçlar, süre, sunucu istatistikleri) döndürür"""
+    stub_port = _free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    # Servis adresleri modüller yüklenmeden önce ayarlanmalı
+    os.environ["WEATHER_API_URL"] = f"{stub_url}/weather"
+    os.environ["NEWS_API_URL"] = f"{stub_url}/news"
+    os.environ["RECIPE_API_URL"] = f"{stub_url}/recipes"
+    os.environ["DEEPSEEK_API_URL"] = f"{stub_url}/chat"
+    from server import AssistantServer
+
+    stub_runner = await _start(stub_app(latency), stub_port)
+    server = AssistantServer()
+    server_port = _free_port()
+    server_runner = await _start(server.app, server_port)
+    base_url = f"http://127.0.0.1:{server_port}"
+
+    results = []
+    try:
+        async with ClientSession() as client:
+            clients = []
+            for i in range(sessions):
+                offset = i % len(LOAD_COMMANDS)
+                commands = [LOAD_COMMANDS[(offset + j) % len(LOAD_COMMANDS)]
+                            for j in range(commands_per_session)]
+                run = ws_client if i < sessions * ws_fraction else http_client
+                clients.append(run(client, base_url, commands, results, audio))
+            start = time.perf_counter()
+            outcomes = await asyncio.gather(*clients, return_exceptions=True)
+            wall_time = time.perf_counter() - start
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    print(f"İstemci hatası: {outcome!r}")
+            async with client.get(f"{base_url}/api/stats") as response:
+                stats = await response.json()
+    finally:
+        await server_runner.cleanup()
+        await stub_runner.cleanup()
+    return results, wall_time, stats
+
+def print_report(results, wall_time, stats):
+    latencies = [latency * 1000 for _, ok, latency, _ in results if ok]
+    first_tokens = [first * 1000 for _, ok, _, first in results if ok and first is not None]
+    errors = sum(1 for _, ok, _, _ in results if not ok)
+    print(f"{len(results)} komut {wall_time:.2f} sn'de işlendi "
+          f"({len(results) / wall_time:.1f} komut/sn, {errors} hata, {stats['sessions']} oturum)")
+    if latencies:
+        print(f"Gecikme: p50 {percentile(latencies, 0.5):.1f} ms, p95 {percentile(latencies, 0.95):.1f} ms, "
+              f"en fazla {max(latencies):.1f} ms")
+    if first_tokens:
+        print(f"İlk token: p50 {percentile(first_tokens, 0.5):.1f} ms, p95 {percentile(first_tokens, 0.95):.1f} ms")
+    for endpoint, endpoint_stats in sorted(stats["http"].items()):
+        print(f"  {endpoint}: {endpoint_stats['requests']} istek, ort {endpoint_stats['mean_latency'] * 1000:.1f} ms")
+    for endpoint, cache_stats in sorted(stats["cache"].items()):
+        if isinstance(cache_stats, dict):
+            print(f"  önbellek {endpoint}: isabet oranı %{cache_stats['hit_rate'] * 100:.0f}")
+
+def check_sse():
+    """parse_sse_line'ı ve iki sohbet akışı yolunu sahte sunucuya karşı denetler
+
+    Normal akış, satırları ve UTF-8 karakterlerini bölen parçalı akış ve
+    ortasında bağlantısı kopan akış denenir; bir beklenti tutmazsa AssertionError verir.
+    """
+    from api_services import APIServices, parse_sse_line, SSE_DONE
+    from async_api_services import AsyncAPIServices
+
+    assert parse_sse_line("") is None
+    assert parse_sse_line(": keep-alive") is None
+    assert parse_sse_line("event: message") is None
+    assert parse_sse_line("data: {bozuk") is None
+    assert parse_sse_line('data: {"choices": []}') is None
+    assert parse_sse_line("data: [DONE]") is SSE_DONE
+    assert parse_sse_line("data:[DONE]") is SSE_DONE
+    assert parse_sse_line('data: {"choices": [{"delta": {"content": "ğü"}}]}') == "ğü"
+    print("parse_sse_line: tamam")
+
+    words = [word + " " for word in STUB_CHAT_REPLY.split(" ")]
+    expected = "".join(words)
+    partial = "".join(words[:SSE_ERROR_AFTER_WORDS])
+    error_text = "Sohbet sırasında bir hata oluştu. Lütfen daha sonra tekrar deneyin."
+
+    loop = asyncio.new_event_loop()
+    port = _free_port()
+    runner = loop.run_until_complete(_start(stub_app(0), port))
+    api = APIServices()
+    async_api = AsyncAPIServices(api)
+
+    def run_sync(mode):
+        api.deepseek_url = f"http://127.0.0.1:{port}/chat?mode={mode}"
+        stream = api.chat_with_deepseek_stream("merhaba")
+        tokens = []
+        while True:
+            try:
+                tokens.append(next(stream))
+            except StopIteration as end:
+                return tokens, end.value
+
+    async def run_async(mode):
+        async_api.deepseek_url = f"http://127.0.0.1:{port}/chat?mode={mode}"
+        return [token async for token in async_api.chat_with_deepseek_stream("merhaba")]
+
+    # Eşzamanlı (requests) yol sahte sunucunun döngüsünü bloklamasın diye ayrı thread'de çalışır
+    server = threading.Thread(target=loop.run_forever, daemon=True)
+    server.start()
+    try:
+        for mode in ("normal", "split"):
+            tokens, completed = run_sync(mode)
+            assert "".join(tokens) == expected and completed is True, (mode, tokens, completed)
+            tokens = asyncio.run_coroutine_threadsafe(run_async(mode), loop).result()
+            assert "".join(tokens) == expected, (mode, tokens)
+            print(f"{mode} akış: tamam ({len(tokens)} token)")
+
+        tokens, completed = run_sync("error")
+        assert "".join(tokens[:-1]) == partial and tokens[-1] == error_text, tokens
+        assert completed is False, completed
+        tokens = asyncio.run_coroutine_threadsafe(run_async("error"), loop).result()
+        assert "".join(tokens[:-1]) == partial and tokens[-1] == error_text, tokens
+        print("kopan akış: tamam (kısmi yanıt + hata metni, geçmişe yazılmaz)")
+    finally:
+        asyncio.run_coroutine_threadsafe(async_api.close(), loop).result()
+        asyncio.run_coroutine_threadsafe(runner.cleanup(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        server.join()
+        loop.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sunucu modunu sahte API'lerle yük altında ölçer")
+    parser.add_argument("--sessions", type=int, default=20, help="Eşzamanlı istemci oturumu")
+    parser.add_argument("--commands", type=int, default=len(LOAD_COMMANDS), help="Oturum başına komut")
+    parser.add_argument("--latency", type=float, default=0.05, help="Sahte API gecikmesi (saniye)")
+    parser.add_argument("--ws-fraction", type=float, default=0.5, help="WebSocket kullanan oturum oranı")
+    parser.add_argument("--audio", action="store_true", help="Ses parçalarını da iste (TTS ağ erişimi gerektirir)")
+    parser.add_argument("--check-sse", action="store_true", help="Yalnızca sohbet akışı (SSE) denetimini çalıştır")
+    args = parser.parse_args(argv)
+    if args.check_sse:
+        check_sse()
+        return
+
+    results, wall_time, stats = asyncio.run(
+        run_load(args.sessions, args.commands, args.latency, args.ws_fraction, args.audio))
+    print_report(results, wall_time, stats)
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,61 @@
-from gui import main
+import sys
+import time
+
+# Pencere açılmadan önce yüklenmemesi gereken ağır modüller (ısınma thread'inde yüklenir)
+DEFERRED_MODULES = ("pygame", "speech_recognition", "gtts", "requests", "aiohttp", "numpy", "dotenv")
+# Başlangıç süresi bütçeleri (saniye); --profile-startup aşıldığında hata koduyla çıkar
+IMPORT_BUDGET = 0.15
+FIRST_PAINT_BUDGET = 0.5
+WARMUP_TIMEOUT = 30
+
+def profile_startup():
+    """Modül yükleme, ilk çizim ve ısınma sürelerini ölçer; gerileme varsa 1 döndürür"""
+    start = time.perf_counter()
+    import gui
+    import_time = time.perf_counter() - start
+    print(f"Modül yükleme: {import_time * 1000:.1f} ms (bütçe {IMPORT_BUDGET * 1000:.0f} ms)")
+
+    failures = []
+    if import_time > IMPORT_BUDGET:
+        failures.append("modül yükleme bütçesi aşıldı")
+
+    try:
+        root = gui.tk.Tk()
+    except gui.tk.TclError as e:
+        print(f"Ekran yok, ilk çizim ölçülemedi: {e}")
+        root = None
+
+    if root is not None:
+        app = gui.AssistantGUI(root)
+        root.update_idletasks()
+        paint_time = time.perf_counter() - start
+        print(f"İlk çizim: {paint_time * 1000:.1f} ms (bütçe {FIRST_PAINT_BUDGET * 1000:.0f} ms)")
+        if paint_time > FIRST_PAINT_BUDGET:
+            failures.append("ilk çizim bütçesi aşıldı")
+
+    loaded = [name for name in DEFERRED_MODULES if name in sys.modules]
+    if loaded:
+        failures.append(f"ilk çizimden önce yüklenen modüller: {', '.join(loaded)}")
+
+    if root is not None:
+        # Isınma thread'i ilk boşta döngüde başlar
+        deadline = time.perf_counter() + WARMUP_TIMEOUT
+        while app.warmup_thread is None and time.perf_counter() < deadline:
+            root.update()
+        if app.warmup_thread is not None:
+            app.warmup_thread.join(max(0.0, deadline - time.perf_counter()))
+        if app.warmup_time is not None:
+            print(f"Arka plan ısınması: {app.warmup_time * 1000:.1f} ms")
+        app.command_executor.shutdown(wait=False, cancel_futures=True)
+        app.engine.close()
+        root.destroy()
+
+    for failure in failures:
+        print(f"GERİLEME: {failure}")
+    return 1 if failures else 0
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--profile-startup" in sys.argv[1:]:
+        sys.exit(profile_startup())
+    from gui import main
+    main()
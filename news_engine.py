@@ -0,0 +1,203 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from response_cache import normalize_key
+
+NEWS_API_URL = os.getenv("NEWS_API_URL", "https://newsapi.org/v2")
+ARTICLES_PER_CATEGORY = 5
+# "Tüm haberler" isteğinde kullanılan özel kategori anahtarı
+ALL_CATEGORIES = "tümü"
+
+# Haber kategorileri: (istek yolu, başlık, başarısız yanıt metni, hata metni)
+NEWS_CATEGORIES = {
+    "genel": ("top-headlines?country=tr", "📰 Güncel Haberler",
+              "Üzgünüm, haberler alınamadı. Lütfen daha sonra tekrar deneyin.",
+              "Haberler alınırken bir hata oluştu."),
+    "spor": ("everything?q=spor&language=tr&sortBy=publishedAt", "⚽ Spor Haberleri",
+             "Üzgünüm, spor haberleri alınamadı. Lütfen daha sonra tekrar deneyin.",
+             "Spor haberleri alınırken bir hata oluştu."),
+    "ekonomi": ("everything?q=ekonomi&language=tr&sortBy=publishedAt", "💰 Ekonomi Haberleri",
+                "Üzgünüm, ekonomi haberleri alınamadı.",
+                "Ekonomi haberleri alınırken bir hata oluştu."),
+    "teknoloji": ("everything?q=teknoloji&language=tr&sortBy=publishedAt", "💻 Teknoloji Haberleri",
+                  "Üzgünüm, teknoloji haberleri alınamadı.",
+                  "Teknoloji haberleri alınırken bir hata oluştu."),
+    "kültür": ("everything?q=kültür+sanat&language=tr&sortBy=publishedAt", "🎭 Kültür-Sanat Haberleri",
+               "Üzgünüm, kültür-sanat haberleri alınamadı.",
+               "Kültür-sanat haberleri alınırken bir hata oluştu.")
+}
+
+@dataclass(frozen=True)
+class Article:
+    """Tek bir haber kaydı"""
+    title: str
+    source: str
+    url: str
+    category: str
+
+def news_category(query):
+    """Haber isteğindeki kategoriyi NEWS_CATEGORIES anahtarına (ya da ALL_CATEGORIES) çevirir"""
+    query = query.lower().strip()
+
+    if any(word in query for word in ["tüm", "bütün", "hepsi"]):
+        return ALL_CATEGORIES
+    elif "spor" in query:
+        return "spor"
+    elif "ekonomi" in query:
+        return "ekonomi"
+    elif "teknoloji" in query:
+        return "teknoloji"
+    elif "kültür" in query or "sanat" in query:
+        return "kültür"
+    else:
+        return "genel"
+
+def news_url(category, api_key):
+    """NewsAPI istek adresi"""
+    path = NEWS_CATEGORIES[category][0]
+    return f"{NEWS_API_URL}/{path}&apiKey={api_key}"
+
+def parse_articles(category, data):
+    """NewsAPI yanıtını Article listesine çevirir, yanıt başarısızsa None döndürür"""
+    if data.get("status") != "ok":
+        return None
+    articles = []
+    for item in data.get("articles") or []:
+        title = (item.get("title") or "").strip()
+        if not title:
+            continue
+        source = (item.get("source") or {}).get("name") or ""
+        articles.append(Article(title, source, item.get("url") or "", category))
+    return articles
+
+def _article_keys(article):
+    keys = ["title:" + normalize_key(article.title)]
+    if article.url:
+        keys.append("url:" + article.url.split("?")[0].rstrip("/"))
+    return keys
+
+def dedupe_articles(results, limit=ARTICLES_PER_CATEGORY):
+    """Kategoriler arasında aynı URL ya da başlığa sahip haberleri ilk görüldüğü yerde bırakır
+
+    results kategori sırasını korumalıdır; her kategoriden en fazla limit haber kalır.
+    """
+    seen = set()
+    unique = {}
+    for category, articles in results.items():
+        kept = []
+        for article in articles:
+            keys = _article_keys(article)
+            if any(key in seen for key in keys):
+                continue
+            seen.update(keys)
+            kept.append(article)
+            if len(kept) == limit:
+                break
+        unique[category] = kept
+    return unique
+
+def render_articles(heading, articles, limit=ARTICLES_PER_CATEGORY):
+    """Başlık altında numaralı haber listesi"""
+    lines = [f"{i}. {article.title}\n   Kaynak: {article.source}\n\n"
+             for i, article in enumerate(articles[:limit], 1)]
+    return f"{heading}:\n\n" + "".join(lines)
+
+def render_all(results):
+    """Birden çok kategorinin haberlerini kategori başlıklarıyla birleştirir"""
+    return "".join(render_articles(NEWS_CATEGORIES[category][1], articles)
+                   for category, articles in results.items() if articles)
+
+class NewsEngine:
+    """Haber kategorilerini tek bir yoldan alan, önbellekleyen ve biçimlendiren motor"""
+    def __init__(self, http, api_key, cache=None):
+        self.http = http
+        self.api_key = api_key
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=len(NEWS_CATEGORIES),
+                                            thread_name_prefix="haber")
+
+    def url(self, category):
+        return news_url(category, self.api_key)
+
+    @staticmethod
+    def parse(category, status, data):
+        """API yanıtını Article listesine çevirir; başarısızlıkta None döndürür"""
+        if status != 200:
+            return None
+        return parse_articles(category, data)
+
+    def fetch(self, category):
+        """Kategorinin haberlerini API'den alır; başarısızlıkta None döndürür"""
+        response = self.http.get("news", self.url(category))
+        return self.parse(category, response.status_code, response.json())
+
+    def get_articles(self, category):
+        """Kategorinin haberlerini önbellekten ya da API'den getirir"""
+        if self.cache is None:
+            return self.fetch(category)
+        return self.cache.get_or_fetch("news", category, lambda: self.fetch(category))
+
+    @staticmethod
+    def render_text(category, articles):
+        """Tek kategorinin haber metni; articles None ya da hata ise ilgili uyarı döner"""
+        _, heading, failure_text, error_text = NEWS_CATEGORIES[category]
+        if isinstance(articles, Exception):
+            print(f"Haber hatası ({category}): {str(articles)}")
+            return error_text
+        if articles is None:
+            return failure_text
+        return render_articles(heading, articles)
+
+    @staticmethod
+    def collect(categories, fetched):
+        """Kategori sırasıyla gelen sonuçlardan (liste, None ya da hata) tekrarsız sonuç kurar
+
+        Alınamayan kategoriler sonuçta yer almaz.
+        """
+        results = {}
+        for category, articles in zip(categories, fetched):
+            if isinstance(articles, Exception):
+                print(f"Haber hatası ({category}): {str(articles)}")
+            elif articles is not None:
+                results[category] = articles
+        return dedupe_articles(results)
+
+    @staticmethod
+    def render_all_text(results):
+        """Birden çok kategorinin haber metni; hiçbiri alınamadıysa genel uyarı"""
+        return render_all(results) or NEWS_CATEGORIES["genel"][2]
+
+    def get_text(self, category):
+        """Tek kategorinin haber metni"""
+        try:
+            articles = self.get_articles(category)
+        except Exception as e:
+            articles = e
+        return self.render_text(category, articles)
+
+    def get_all(self, categories=None):
+        """Kategorileri paralel alır, tekrarlanan haberleri ayıklar"""
+        categories = list(categories or NEWS_CATEGORIES)
+        futures = [self._executor.submit(self.get_articles, category) for category in categories]
+        fetched = []
+        for future in futures:
+            try:
+                fetched.append(future.result())
+            except Exception as e:
+                fetched.append(e)
+        return self.collect(categories, fetched)
+
+    def get_all_text(self, categories=None):
+        """Tüm kategorilerin tekrarsız haber metni"""
+        return self.render_all_text(self.get_all(categories))
+
+    def category_text(self, category):
+        """NEWS_CATEGORIES anahtarının (ya da ALL_CATEGORIES) haber metni"""
+        if category == ALL_CATEGORIES:
+            return self.get_all_text()
+        return self.get_text(category)
+
+    def handle_request(self, query):
+        """Haber isteğini kategorisine göre yanıtlar"""
+        return self.category_text(news_category(query))
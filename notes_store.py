@@ -0,0 +1,210 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from response_cache import normalize_key
+
+# Notların saklandığı SQLite dosyası
+NOTES_DB = "notes.db"
+# Listeleme ve aramada sayfa başına not
+NOTES_PAGE_SIZE = 20
+
+# Tarih sütunu biçimi (metin olarak sıralanabilir)
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Aramada Türkçe karakterler yazılmasa da eşleşsin diye harfler sadeleştirilir
+_ASCII_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+# Notlarda kullanılabilen dönemler (niyet yönlendiricisindeki ifadelerin karşılığı)
+NOTE_PERIODS = ("today", "yesterday", "this_week", "last_week", "this_month", "last_month")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS notes (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    text TEXT NOT NULL,
+    search_text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS notes_created ON notes(created);
+"""
+
+# search_text sütununu indeksleyen harici içerikli FTS5 tablosu ve onu eşitleyen tetikleyiciler
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+    search_text, content='notes', content_rowid='id', tokenize='unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS notes_ai AFTER INSERT ON notes BEGIN
+    INSERT INTO notes_fts(rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS notes_ad AFTER DELETE ON notes BEGIN
+    INSERT INTO notes_fts(notes_fts, rowid, search_text) VALUES ('delete', old.id, old.search_text);
+END;
+"""
+
+@dataclass(frozen=True)
+class Note:
+    """Kaydedilmiş tek bir not"""
+    id: int
+    created: str
+    text: str
+
+def normalize_note(text):
+    """Notu aranabilir biçime getirir: Türkçe küçük harf, sadeleştirilmiş harfler, tek boşluk"""
+    return normalize_key(text).translate(_ASCII_FOLD)
+
+def search_terms(query):
+    """Arama ifadesini FTS5 önek sorgusuna çevirir ("marketten" -> "market"* ile de eşleşir)"""
+    words = ["".join(c for c in word if c.isalnum()) for word in normalize_note(query).split()]
+    return " ".join(f'"{word}"*' for word in words if word)
+
+def period_range(period, now=None):
+    """Dönem adını [başlangıç, bitiş) tarih metinlerine çevirir"""
+    now = now or datetime.now()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week = today - timedelta(days=today.weekday())
+    month = today.replace(day=1)
+
+    if period == "today":
+        start, end = today, today + timedelta(days=1)
+    elif period == "yesterday":
+        start, end = today - timedelta(days=1), today
+    elif period == "this_week":
+        start, end = week, week + timedelta(days=7)
+    elif period == "last_week":
+        start, end = week - timedelta(days=7), week
+    elif period == "this_month":
+        start, end = month, (month + timedelta(days=32)).replace(day=1)
+    elif period == "last_month":
+        start, end = (month - timedelta(days=1)).replace(day=1), month
+    else:
+        raise ValueError(f"Bilinmeyen dönem: {period}")
+    return start.strftime(DATE_FORMAT), end.strftime(DATE_FORMAT)
+
+class NotesStore:
+    """Notları SQLite'ta saklayan, FTS5 ile tam metin aranabilen kalıcı not deposu
+
+    Bağlantı thread'ler arasında paylaşılır, erişim kilitle sıralanır. FTS5
+    derlenmemiş SQLite sürümlerinde arama LIKE ile yapılır.
+    """
+    def __init__(self, path=NOTES_DB):
+        # ":memory:" verilirse notlar yalnızca süreç boyunca tutulur (ör. sunucu oturumları)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+            try:
+                self._conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                print(f"FTS5 kullanılamıyor, basit aramaya geçildi: {str(e)}")
+                self.fts = False
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def add(self, text, created=None):
+        """Notu kaydeder ve Note olarak döndürür"""
+        created = (created or datetime.now()).strftime(DATE_FORMAT)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO notes (created, text, search_text) VALUES (?, ?, ?)",
+                (created, text, normalize_note(text)))
+        return Note(cursor.lastrowid, created, text)
+
+    def add_many(self, notes):
+        """(metin, datetime) çiftlerini tek işlemde kaydeder"""
+        rows = [(created.strftime(DATE_FORMAT), text, normalize_note(text)) for text, created in notes]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO notes (created, text, search_text) VALUES (?, ?, ?)", rows)
+
+    def delete(self, note_id):
+        """Notu siler; silindiyse True döndürür"""
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM notes WHERE id = ?", (note_id,))
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _date_filter(column, period):
+        if period is None:
+            return "", ()
+        return f" AND {column} >= ? AND {column} < ?", period_range(period)
+
+    def _query(self, sql, args):
+        with self._lock:
+            return self._conn.execute(sql, args).fetchall()
+
+    def count(self, period=None):
+        """(Dönemdeki) not sayısı"""
+        where, args = self._date_filter("created", period)
+        return self._query(f"SELECT COUNT(*) FROM notes WHERE 1{where}", args)[0][0]
+
+    def list(self, page=1, page_size=NOTES_PAGE_SIZE, period=None):
+        """Notları en yeniden eskiye, sayfa sayfa döndürür"""
+        where, args = self._date_filter("created", period)
+        rows = self._query(
+            f"SELECT id, created, text FROM notes WHERE 1{where} "
+            f"ORDER BY created DESC, id DESC LIMIT ? OFFSET ?",
+            args + (page_size, (page - 1) * page_size))
+        return [Note(*row) for row in rows]
+
+    def search(self, query, page=1, page_size=NOTES_PAGE_SIZE, period=None):
+        """Sorguyla eşleşen notları (sayfa, toplam eşleşme) olarak döndürür
+
+        FTS5 varsa sonuçlar alaka sırasına (bm25), yoksa tarihe göre dizilir.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], 0
+        offset = (page - 1) * page_size
+        if self.fts:
+            where, args = self._date_filter("n.created", period)
+            match = ("FROM notes_fts f JOIN notes n ON n.id = f.rowid "
+                     f"WHERE notes_fts MATCH ?{where}")
+            total = self._query(f"SELECT COUNT(*) {match}", (terms,) + args)[0][0]
+            rows = self._query(
+                f"SELECT n.id, n.created, n.text {match} ORDER BY bm25(notes_fts), n.created DESC "
+                f"LIMIT ? OFFSET ?", (terms,) + args + (page_size, offset))
+        else:
+            where, args = self._date_filter("created", period)
+            words = [word.strip('"*') for word in terms.split()]
+            like = " AND ".join("search_text LIKE ?" for _ in words)
+            like_args = tuple(f"%{word}%" for word in words)
+            total = self._query(f"SELECT COUNT(*) FROM notes WHERE {like}{where}", like_args + args)[0][0]
+            rows = self._query(
+                f"SELECT id, created, text FROM notes WHERE {like}{where} "
+                f"ORDER BY created DESC LIMIT ? OFFSET ?", like_args + args + (page_size, offset))
+        return [Note(*row) for row in rows], total
+
+def benchmark_notes(count=50000, path=":memory:"):
+    """count not ile (ekleme, listeleme, arama) süreleri (saniye)"""
+    store = NotesStore(path)
+    words = ["market", "süt", "ekmek", "toplantı", "doktor", "randevu", "fatura", "öde",
+             "İstanbul", "kitap", "oku", "spor", "yürüyüş", "annemi", "ara", "proje"]
+    now = datetime.now()
+    notes = [(" ".join(words[(i * 7 + j * 3) % len(words)] for j in range(6)) + f" #{i}",
+              now - timedelta(minutes=i)) for i in range(count)]
+    start = time.perf_counter()
+    store.add_many(notes)
+    insert_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for page in range(1, 11):
+        store.list(page)
+    list_time = (time.perf_counter() - start) / 10
+
+    start = time.perf_counter()
+    for query in ("market", "doktor randevu", "istanbul", "yuruyus"):
+        store.search(query)
+    search_time = (time.perf_counter() - start) / 4
+    store.close()
+    return insert_time, list_time, search_time
+
+if __name__ == "__main__":
+    insert_time, list_time, search_time = benchmark_notes()
+    print(f"50000 not: ekleme {insert_time:.2f} sn, sayfa listeleme {list_time * 1000:.2f} ms, "
+          f"arama {search_time * 1000:.2f} ms")
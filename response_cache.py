@@ -0,0 +1,173 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Uç nokta başına tazelik süreleri (saniye)
+ENDPOINT_TTLS = {
+    "weather": 10 * 60,
+    "news": 5 * 60
+}
+DEFAULT_TTL = 5 * 60
+# Süresi dolan kayıt bu kadar süre daha eski haliyle sunulabilir (arka planda yenilenirken)
+STALE_SECONDS = 60 * 60
+MAX_ENTRIES = 256
+REFRESH_WORKERS = 2
+
+def normalize_key(value):
+    """Şehir/kategori adını Türkçe kurallarıyla küçük harfe çevirip boşlukları sadeleştirir"""
+    value = str(value).replace("I", "ı").replace("İ", "i").lower()
+    return " ".join(value.split())
+
+class ResponseCache:
+    """Uç nokta başına TTL'li, boyut sınırlı, stale-while-revalidate yanıt önbelleği"""
+    def __init__(self, ttls=None, stale_seconds=STALE_SECONDS, max_entries=MAX_ENTRIES):
+        self.ttls = dict(ENDPOINT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.stale_seconds = stale_seconds
+        self.max_entries = max_entries
+
+        # (uç nokta, anahtar) -> (değer, kayıt zamanı), en eski kullanılan başta
+        self._entries = OrderedDict()
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=REFRESH_WORKERS)
+        # Olay döngüsü görevlere yalnızca zayıf referans tutar; bitene kadar burada saklanır
+        self._refresh_tasks = set()
+
+        self._stats = {}
+
+    def get_or_fetch(self, endpoint, key, fetch):
+        """Önbellekteki yanıtı döndürür, yoksa fetch() ile alır
+
+        fetch() başarısızlıkta None döndürmelidir; None önbelleğe yazılmaz.
+        Süresi geçmiş ama bayat sınırı içindeki kayıt hemen döndürülür ve
+        arka planda yenilenir.
+        """
+        cache_key, found, value, refresh = self._lookup(endpoint, key)
+        if refresh:
+            self._refresher.submit(self._refresh, cache_key, fetch)
+        if found:
+            return value
+
+        value = fetch()
+        if value is not None:
+            self._store(cache_key, value)
+        return value
+
+    async def get_or_fetch_async(self, endpoint, key, fetch):
+        """get_or_fetch'in asyncio sürümü; fetch() coroutine döndürür
+
+        Bayat kayıt aynı olay döngüsünde bir görevle yenilenir.
+        """
+        cache_key, found, value, refresh = self._lookup(endpoint, key)
+        if refresh:
+            task = asyncio.ensure_future(self._refresh_async(cache_key, fetch))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        if found:
+            return value
+
+        value = await fetch()
+        if value is not None:
+            self._store(cache_key, value)
+        return value
+
+    def _lookup(self, endpoint, key):
+        """(önbellek anahtarı, bulundu mu, değer, yenilenmeli mi) döndürür, sayaçları günceller"""
+        cache_key = (endpoint, normalize_key(key))
+        ttl = self.ttls.get(endpoint, DEFAULT_TTL)
+        now = time.monotonic()
+
+        with self._lock:
+            stats = self._endpoint_stats(endpoint)
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age <= ttl:
+                    self._entries.move_to_end(cache_key)
+                    stats["hits"] += 1
+                    return cache_key, True, value, False
+                if age <= ttl + self.stale_seconds:
+                    self._entries.move_to_end(cache_key)
+                    stats["stale_hits"] += 1
+                    refresh = cache_key not in self._refreshing
+                    self._refreshing.add(cache_key)
+                    return cache_key, True, value, refresh
+                self._discard(cache_key)
+            stats["misses"] += 1
+            return cache_key, False, None, False
+
+    def _refresh(self, cache_key, fetch):
+        """Bayat kaydı arka planda yeniler; hata olursa eski değer kalır"""
+        try:
+            self._refreshed(cache_key, fetch())
+        except Exception as e:
+            self._refresh_failed(cache_key, e)
+
+    async def _refresh_async(self, cache_key, fetch):
+        try:
+            self._refreshed(cache_key, await fetch())
+        except asyncio.CancelledError:
+            # Döngü kapanırken iptal edilirse kayıt sonraki istekte yeniden yenilenebilsin
+            with self._lock:
+                self._refreshing.discard(cache_key)
+            raise
+        except Exception as e:
+            self._refresh_failed(cache_key, e)
+
+    def _refreshed(self, cache_key, value):
+        if value is not None:
+            self._store(cache_key, value)
+        with self._lock:
+            if value is None:
+                self._endpoint_stats(cache_key[0])["refresh_errors"] += 1
+            self._refreshing.discard(cache_key)
+
+    def _refresh_failed(self, cache_key, error):
+        print(f"Önbellek yenileme hatası: {str(error)}")
+        with self._lock:
+            self._endpoint_stats(cache_key[0])["refresh_errors"] += 1
+            self._refreshing.discard(cache_key)
+
+    def _store(self, cache_key, value):
+        with self._lock:
+            self._entries[cache_key] = (value, time.monotonic())
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _discard(self, cache_key):
+        self._entries.pop(cache_key, None)
+
+    def _endpoint_stats(self, endpoint):
+        if endpoint not in self._stats:
+            self._stats[endpoint] = {
+                "hits": 0,
+                "stale_hits": 0,
+                "misses": 0,
+                "refresh_errors": 0
+            }
+        return self._stats[endpoint]
+
+    def invalidate(self, endpoint=None):
+        """Bir uç noktanın (ya da tümünün) kayıtlarını siler"""
+        with self._lock:
+            for cache_key in list(self._entries):
+                if endpoint is None or cache_key[0] == endpoint:
+                    self._discard(cache_key)
+
+    def stats(self):
+        """Uç nokta başına isabet/ıska sayıları ve isabet oranı"""
+        with self._lock:
+            result = {}
+            for endpoint, stats in self._stats.items():
+                result[endpoint] = dict(stats)
+                lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+                hits = stats["hits"] + stats["stale_hits"]
+                result[endpoint]["hit_rate"] = hits / lookups if lookups else None
+            result["entries"] = len(self._entries)
+            return result
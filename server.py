@@ -0,0 +1,300 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import web, WSMsgType
+
+from api_services import APIServices
+from assistant_engine import AssistantEngine
+from async_api_services import AsyncAPIServices, AsyncBridge
+from intent_router import IntentRouter
+from speech_synthesis import SpeechSynthesizer, SentenceBuffer, split_text_chunks
+
+SERVER_HOST = os.getenv("ASSISTANT_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("ASSISTANT_PORT", "8080"))
+# Komutların (bloklayan API çağrıları) çalıştığı worker sayısı
+SERVER_WORKERS = 16
+# Bu süre boyunca istek gelmeyen oturumlar silinir (saniye)
+SESSION_IDLE_SECONDS = 30 * 60
+
+# Akış sonu işareti
+_END = object()
+
+class Session:
+    """Bir istemcinin notları ve sohbet geçmişi"""
+    def __init__(self, session_id, engine):
+        self.id = session_id
+        self.engine = engine
+        self.last_seen = time.monotonic()
+        # Aynı oturumun komutları sırayla işlenir (geçmiş tutarlı kalsın)
+        self.lock = asyncio.Lock()
+
+class AssistantServer:
+    """Asistan motorunu HTTP/JSON ve WebSocket üzerinden sunar
+
+    API bağlantı havuzu, yanıt ve ses önbellekleri, niyet yönlendiricisi ve
+    asyncio döngüsü tüm oturumlar arasında paylaşılır.
+    """
+    def __init__(self, api=None, workers=SERVER_WORKERS):
+        self.api = api or APIServices()
+        self.router = IntentRouter()
+        self.async_api = AsyncAPIServices(self.api)
+        self.async_bridge = AsyncBridge()
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sunucu")
+        self.sessions = {}
+        self._synthesizer = None
+
+        self.app = web.Application()
+        self.app.add_routes([
+            web.post("/api/command", self.handle_command),
+            web.get("/api/stats", self.handle_stats),
+            web.delete("/api/session/{session_id}", self.handle_end_session),
+            web.get("/ws", self.handle_websocket)
+        ])
+        self.app.on_cleanup.append(self._on_cleanup)
+
+    @property
+    def synthesizer(self):
+        """Ses sentezi ilk sesli istekte başlatılır"""
+        if self._synthesizer is None:
+            self._synthesizer = SpeechSynthesizer()
+        return self._synthesizer
+
+    def get_session(self, session_id=None):
+        """Oturumu döndürür, yoksa oluşturur; boşta kalan oturumları temizler"""
+        now = time.monotonic()
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            for stale_id in [sid for sid, s in self.sessions.items()
+                             if now - s.last_seen > SESSION_IDLE_SECONDS]:
+                del self.sessions[stale_id]
+            session_id = session_id or uuid.uuid4().hex
+            engine = AssistantEngine(api=self.api, router=self.router, open_url=lambda url: None,
+                                     async_api=self.async_api, async_bridge=self.async_bridge)
+            session = self.sessions[session_id] = Session(session_id, engine)
+        session.last_seen = now
+        return session
+
+    async def _iterate(self, response):
+        """Motor yanıtını (metin ya da token generator'ı) asenkron token akışına çevirir"""
+        if response is None:
+            return
+        if isinstance(response, str):
+            yield response
+            return
+
+        loop = asyncio.get_running_loop()
+        tokens = asyncio.Queue()
+
+        def pump():
+            try:
+                for token in response:
+                    loop.call_soon_threadsafe(tokens.put_nowait, token)
+            finally:
+                loop.call_soon_threadsafe(tokens.put_nowait, _END)
+
+        self.executor.submit(pump)
+        while True:
+            token = await tokens.get()
+            if token is _END:
+                break
+            yield token
+
+    async def _produce_audio(self, futures, events):
+        """Sentezlenen parçaları sırayla (sentez paralel sürer) olay kuyruğuna koyar"""
+        loop = asyncio.get_running_loop()
+        index = 0
+        while True:
+            future = await futures.get()
+            if future is None:
+                break
+            try:
+                path = await asyncio.wrap_future(future)
+                data = await loop.run_in_executor(self.executor, _read_file, path)
+            except Exception as e:
+                await events.put({"type": "audio_error", "index": index, "message": str(e)})
+            else:
+                await events.put({"type": "audio", "index": index, "format": os.path.splitext(path)[1][1:],
+                                  "data": base64.b64encode(data).decode("ascii")})
+            index += 1
+
+    def _queue_speech(self, text, futures):
+        for chunk in split_text_chunks(text):
+            futures.put_nowait(self.synthesizer.chunk_future(chunk))
+
+    async def _produce(self, session, command, audio, events):
+        """Komutu işler; niyet, token, ses ve bitiş olaylarını kuyruğa yazar"""
+        start = time.perf_counter()
+        try:
+            intent = self.router.classify(command)
+            await events.put({"type": "intent", "intent": intent.name, "slots": intent.slots})
+
+            audio_futures = asyncio.Queue() if audio else None
+            audio_task = asyncio.create_task(self._produce_audio(audio_futures, events)) if audio else None
+            sentences = SentenceBuffer()
+            parts = []
+            first_token = None
+
+            async with session.lock:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(self.executor, session.engine.handle, intent, command)
+                async for token in self._iterate(response):
+                    if first_token is None:
+                        first_token = time.perf_counter() - start
+                    parts.append(token)
+                    await events.put({"type": "token", "text": token})
+                    # Biten cümleler akış sürerken sentezlenmeye başlar
+                    if audio:
+                        for sentence in sentences.feed(token):
+                            self._queue_speech(sentence, audio_futures)
+
+            if audio:
+                rest = sentences.flush()
+                if rest:
+                    self._queue_speech(rest, audio_futures)
+                audio_futures.put_nowait(None)
+                await audio_task
+
+            await events.put({
+                "type": "done",
+                "session": session.id,
+                "intent": intent.name,
+                "response": "".join(parts) if response is not None else None,
+                "latency_ms": (time.perf_counter() - start) * 1000,
+                "first_token_ms": first_token * 1000 if first_token is not None else None
+            })
+        except Exception as e:
+            print(f"Sunucu komut hatası: {str(e)}")
+            await events.put({"type": "error", "message": "Üzgünüm, bir hata oluştu. Lütfen tekrar deneyin."})
+        finally:
+            await events.put(None)
+
+    async def events(self, session, command, audio=False):
+        """Bir komutun olaylarını üretildikçe döndürür"""
+        queue = asyncio.Queue()
+        task = asyncio.create_task(self._produce(session, command, audio, queue))
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            if not task.done():
+                task.cancel()
+
+    async def handle_command(self, request):
+        """POST /api/command {"command", "session"?, "audio"?, "stream"?}
+
+        stream=true ise olaylar satır satır JSON (NDJSON) olarak akar,
+        değilse yalnızca "done" olayı döner.
+        """
+        try:
+            body = await request.json()
+        except ValueError:
+            return web.json_response({"error": "Geçersiz JSON"}, status=400)
+        if not isinstance(body, dict):
+            return web.json_response({"error": "İstek gövdesi bir JSON nesnesi olmalı"}, status=400)
+        command = body.get("command")
+        if not isinstance(command, str) or not command.strip():
+            return web.json_response({"error": "'command' alanı gerekli"}, status=400)
+
+        session = self.get_session(body.get("session"))
+        audio = bool(body.get("audio"))
+
+        if not body.get("stream"):
+            result = {"type": "error", "message": "Yanıt alınamadı."}
+            audio_chunks = []
+            async for event in self.events(session, command, audio):
+                if event["type"] == "audio":
+                    audio_chunks.append(event)
+                elif event["type"] in ("done", "error"):
+                    result = event
+            if audio:
+                result["audio"] = audio_chunks
+            return web.json_response(result, status=200 if result["type"] == "done" else 500)
+
+        response = web.StreamResponse(headers={"Content-Type": "application/x-ndjson; charset=utf-8"})
+        await response.prepare(request)
+        async for event in self.events(session, command, audio):
+            await response.write((_dumps(event) + "\n").encode("utf-8"))
+        await response.write_eof()
+        return response
+
+    async def handle_websocket(self, request):
+        """GET /ws?session=...; istemci {"command", "audio"?} gönderir, olaylar JSON olarak akar"""
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        session = self.get_session(request.query.get("session"))
+        await ws.send_json({"type": "session", "session": session.id})
+
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                if message.type == WSMsgType.ERROR:
+                    break
+                continue
+            try:
+                body = message.json()
+            except ValueError:
+                await ws.send_json({"type": "error", "message": "Geçersiz JSON"})
+                continue
+            if not isinstance(body, dict):
+                await ws.send_json({"type": "error", "message": "Mesaj bir JSON nesnesi olmalı"})
+                continue
+            command = body.get("command")
+            if not isinstance(command, str) or not command.strip():
+                await ws.send_json({"type": "error", "message": "'command' alanı gerekli"})
+                continue
+            async for event in self.events(session, command, bool(body.get("audio"))):
+                if ws.closed:
+                    break
+                await ws.send_json(event, dumps=_dumps)
+        return ws
+
+    async def handle_end_session(self, request):
+        session = self.sessions.pop(request.match_info["session_id"], None)
+        return web.json_response({"ended": session is not None})
+
+    async def handle_stats(self, request):
+        """Oturum sayısı ve paylaşılan havuz/önbellek istatistikleri"""
+        stats = {
+            "sessions": len(self.sessions),
+            "http": self.api.get_http_stats(),
+            "cache": self.api.get_cache_stats()
+        }
+        if self._synthesizer is not None:
+            stats["tts"] = self._synthesizer.stats()
+        return web.json_response(stats)
+
+    async def _on_cleanup(self, app):
+        try:
+            await asyncio.wrap_future(self.async_bridge.submit(self.async_api.close()))
+        except Exception:
+            pass
+        self.async_bridge.shutdown()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False)
+
+def _read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Alfa asistanını HTTP/WebSocket sunucusu olarak çalıştırır")
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS)
+    args = parser.parse_args(argv)
+
+    server = AssistantServer(workers=args.workers)
+    web.run_app(server.app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+# Oturum kayıtlarının tutulduğu klasör ve etkin dosya
+SESSION_LOG_DIR = "session_logs"
+SESSION_LOG_NAME = "session.jsonl"
+# Etkin dosya bu boyutu aşınca döndürülür; en fazla bu kadar eski dosya saklanır
+MAX_LOG_BYTES = 5 * 1024 * 1024
+MAX_LOG_BACKUPS = 4
+# Diske zorla yazma (fsync) en geç bu aralıkla ya da bu kadar kayıtta bir yapılır
+FSYNC_INTERVAL = 1.0
+FSYNC_BATCH = 64
+
+# Sondan okurken bir seferde okunan bayt
+TAIL_READ_BYTES = 64 * 1024
+
+# Kayıt türleri: kullanıcı komutu, komut yanıtı, diğer sohbet mesajları, temizleme
+RECORD_COMMAND = "cmd"
+RECORD_RESPONSE = "res"
+RECORD_MESSAGE = "msg"
+RECORD_CLEAR = "clear"
+
+class SessionLog:
+    """Komut, niyet, yanıt ve süreleri satır satır JSON olarak ekleyen oturum günlüğü
+
+    Her kayıt tek bir write çağrısıyla tam satır olarak yazılır; fsync arka plan
+    thread'inde toplu yapılır. Çökme anında yarım kalan son satır okumada atlanır.
+    """
+    def __init__(self, directory=SESSION_LOG_DIR, max_bytes=MAX_LOG_BYTES,
+                 backups=MAX_LOG_BACKUPS, fsync_interval=FSYNC_INTERVAL):
+        self.directory = directory
+        self.path = os.path.join(directory, SESSION_LOG_NAME)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.fsync_interval = fsync_interval
+        # Kayıtlardaki komut numaraları bu oturum kimliğiyle birlikte tekildir
+        self.session_id = uuid.uuid4().hex[:8]
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._file, self._size = self._open()
+        self._unsynced = 0
+        self.records = 0
+        self.syncs = 0
+
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True, name="oturum-gunlugu")
+        self._flusher.start()
+
+    def append(self, kind, **fields):
+        """Kaydı günlüğe ekler"""
+        record = {"t": round(time.time(), 3), "k": kind, "s": self.session_id}
+        record.update(fields)
+        line = (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file.closed:
+                return
+            if self._size + len(line) > self.max_bytes and self._size:
+                self._rotate()
+            self._file.write(line)
+            self._size += len(line)
+            self._unsynced += 1
+            self.records += 1
+            if self._unsynced >= FSYNC_BATCH:
+                self._sync()
+
+    def command(self, request_id, text, source="text"):
+        self.append(RECORD_COMMAND, id=request_id, text=text, src=source)
+
+    def response(self, request_id, intent, text, latency_ms, first_token_ms=None):
+        self.append(RECORD_RESPONSE, id=request_id, intent=intent, text=text,
+                    ms=round(latency_ms, 1),
+                    ftms=round(first_token_ms, 1) if first_token_ms is not None else None)
+
+    def message(self, text, is_user=False):
+        self.append(RECORD_MESSAGE, user=is_user, text=text)
+
+    def clear(self):
+        self.append(RECORD_CLEAR)
+
+    def _open(self):
+        """Etkin dosyayı ekleme için açar, (dosya, boyut) döndürür
+
+        Önceki oturum satır ortasında çöktüyse yarım satır kesilir; yoksa ilk
+        kayıt ona eklenir ve ikisi birden okunamaz olur.
+        """
+        f = open(self.path, "ab")
+        size = f.tell()
+        end = size
+        with open(self.path, "rb") as reader:
+            while end > 0:
+                start = max(0, end - TAIL_READ_BYTES)
+                reader.seek(start)
+                block = reader.read(end - start)
+                newline = block.rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+        if end != size:
+            print(f"Oturum günlüğünde yarım kalmış son satır atıldı ({size - end} bayt)")
+            f.truncate(end)
+        return f, end
+
+    def _sync(self):
+        """Tamponu yazıp diske zorlar (kilit tutulurken çağrılır)"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self.syncs += 1
+
+    def _rotate(self):
+        """session.jsonl -> .1 -> .2 ...; en eski dosya silinir (kilit tutulurken çağrılır)"""
+        self._sync()
+        self._file.close()
+        for index in range(self.backups, 0, -1):
+            source = self.path if index == 1 else f"{self.path}.{index - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{index}")
+        self._file, self._size = self._open()
+
+    def _flush_loop(self):
+        while not self._closed.wait(self.fsync_interval):
+            with self._lock:
+                if self._unsynced and not self._file.closed:
+                    self._sync()
+
+    def close(self):
+        """Bekleyen kayıtları diske yazıp dosyayı kapatır"""
+        self._closed.set()
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    def stats(self):
+        with self._lock:
+            return {"records": self.records, "syncs": self.syncs, "bytes": self._size}
+
+def log_files(directory=SESSION_LOG_DIR):
+    """Günlük dosyaları eskiden yeniye"""
+    path = os.path.join(directory, SESSION_LOG_NAME)
+    backups = []
+    index = 1
+    while os.path.exists(f"{path}.{index}"):
+        backups.append(f"{path}.{index}")
+        index += 1
+    files = backups[::-1]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+def read_records(source=SESSION_LOG_DIR):
+    """Klasördeki (ya da verilen dosyadaki) kayıtları sırayla döndürür; bozuk satırlar atlanır"""
+    files = log_files(source) if os.path.isdir(source) else [source]
+    for path in files:
+        with open(path, "rb") as f:
+            data = f.read()
+        for line in data.split(b"\n"):
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                # Çökme sırasında yarım kalmış satır
+                continue
+
+def _tail_lines(path, limit):
+    """Dosyanın sonundaki en fazla limit satırı, dosyanın tamamını okumadan döndürür"""
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        lines = []
+        rest = b""
+        while position > 0 and len(lines) < limit:
+            size = min(TAIL_READ_BYTES, position)
+            position -= size
+            f.seek(position)
+            parts = (f.read(size) + rest).split(b"\n")
+            # İlk parça önceki bloğun devamı olabilir, bir sonraki turda tamamlanır
+            rest = parts[0]
+            lines[:0] = [line for line in parts[1:] if line]
+        if position == 0 and rest:
+            lines.insert(0, rest)
+    return lines[-limit:]
+
+def read_recent_records(directory=SESSION_LOG_DIR, limit=200):
+    """En yeni dosyalardan sondaki en fazla limit kaydı sırayla döndürür (açılışta geri yükleme için)"""
+    lines = []
+    for path in reversed(log_files(directory)):
+        lines[:0] = _tail_lines(path, limit - len(lines))
+        if len(lines) >= limit:
+            break
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            continue
+    return records
+
+def _clock(record):
+    return time.strftime("%H:%M", time.localtime(record["t"]))
+
+def rebuild_transcript(records):
+    """Kayıtlardan son temizlemeden sonraki sohbeti (saat, kullanıcı mı, metin) listesi olarak kurar
+
+    Yanıtlar tamamlanma sırasına değil, ait oldukları komutun hemen arkasına yerleşir.
+    """
+    messages = []
+    pending = {}
+    for record in records:
+        kind = record.get("k")
+        if kind == RECORD_CLEAR:
+            messages, pending = [], {}
+        elif kind == RECORD_COMMAND:
+            messages.append((_clock(record), True, record["text"]))
+            # Yanıt için yer ayrılır
+            pending[(record["s"], record["id"])] = len(messages)
+            messages.append(None)
+        elif kind == RECORD_RESPONSE:
+            slot = pending.pop((record["s"], record["id"]), None)
+            if record.get("text"):
+                entry = (_clock(record), False, record["text"])
+                if slot is None:
+                    messages.append(entry)
+                else:
+                    messages[slot] = entry
+        elif kind == RECORD_MESSAGE:
+            messages.append((_clock(record), bool(record.get("user")), record["text"]))
+    return [message for message in messages if message is not None]
+
+def recorded_commands(records):
+    """Kayıtlardaki komutları yanıt bilgileriyle birlikte döndürür (yeniden oynatma için)
+
+    Her öğe: {"command", "intent", "latency_ms", "response"}; yanıtı kaydedilmemiş
+    komutlarda son üçü None'dır.
+    """
+    commands = []
+    by_id = {}
+    for record in records:
+        kind = record.get("k")
+        if kind == RECORD_COMMAND:
+            entry = {"command": record["text"], "intent": None, "latency_ms": None, "response": None}
+            by_id[(record["s"], record["id"])] = entry
+            commands.append(entry)
+        elif kind == RECORD_RESPONSE:
+            entry = by_id.pop((record["s"], record["id"]), None)
+            if entry is not None:
+                entry.update(intent=record.get("intent"), latency_ms=record.get("ms"),
+                             response=record.get("text"))
+    return commands
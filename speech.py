@@ -1,81 +1,447 @@
 import speech_recognition as sr
-from gtts import gTTS
 import os
 import time
 import threading
 import queue
 import pygame
-import tempfile
+import re
+import json
+import audioop
+from collections import deque
+import numpy as np
+from time_stretch import WSOLAStretcher
+from speech_synthesis import SpeechSynthesizer, split_text_chunks
+from audio_input import (MicrophoneSession, EchoGate, EnergyVAD, VoskWakeWordSpotter,
+                         TranscribingWakeWordSpotter, WakeWordDetector, BargeInDetector,
+                         FrameListener, WAKE_WORD)
 
-class SpeechSystem:
+# Konuşma tanıma ayarları ("google" veya "vosk")
+RECOGNIZER_BACKEND = os.getenv('SPEECH_RECOGNIZER', 'google')
+VOSK_MODEL_PATH = os.getenv('VOSK_MODEL_PATH', 'models/vosk-model-small-tr-0.3')
+# Vosk modeli yokken uyandırma kelimesi için her konuşma bölümünü tam (bulut) tanıyıcıya
+# göndermeye izin verir; ortam sesi dışarı gideceği için yalnızca açıkça istenirse açılır
+WAKE_WORD_CLOUD_FALLBACK = os.getenv('WAKE_WORD_CLOUD_FALLBACK', '0') == '1'
+LISTEN_TIMEOUT = 5
+PHRASE_TIME_LIMIT = 5
+
+# Hız değişikliği çalan parçaya da yansısın diye ses bu uzunlukta
+# bloklar halinde esnetilip kuyruklanır
+PLAYBACK_BLOCK_SECONDS = 0.3
+# Parça geçişleri ölçülürken kanal durumunun yoklanma aralığı (saniye)
+GAP_POLL_INTERVAL = 0.0005
+# Kuyruk doluyken kanalın sıradaki parçaya geçip geçmediğine en geç bu aralıkla bakılır
+SCHEDULE_POLL = 0.01
+
+# Yankı referansı: çalınan sesin enerji zarfı çerçeve süresi ve
+# hoparlör -> mikrofon gecikmesi için bakılan pencere
+REFERENCE_FRAME = 0.03
+ECHO_DELAY = 0.15
+
+# Tanınan komutun başındaki uyandırma kelimesi
+_WAKE_WORD_PREFIX = re.compile(rf'^\s*{WAKE_WORD}\b[\s,.!]*', re.IGNORECASE)
+
+class GoogleRecognizer:
+    """Google Web Speech API ile çevrimiçi tanıma"""
+    name = "google"
+    
     def __init__(self):
-        # Pygame mixer'ı başlat
-        pygame.mixer.init()
+        self.recognizer = sr.Recognizer()
+    
+    def recognize(self, audio, on_partial=None):
+        """AudioData'yı metne çevirir"""
+        return self.recognizer.recognize_google(audio, language='tr-TR')
+
+class VoskStream:
+    """Vosk'a ses çerçevelerini parça parça besleyen tanıma oturumu"""
+    def __init__(self, model, sample_rate):
+        from vosk import KaldiRecognizer
+        self._recognizer = KaldiRecognizer(model, sample_rate)
+        self._segments = []
+        self.partial = ""
+    
+    def accept(self, frame):
+        """Çerçeveyi işler; bir ifade tamamlandıysa True döndürür"""
+        if self._recognizer.AcceptWaveform(frame):
+            text = json.loads(self._recognizer.Result()).get("text", "")
+            if text:
+                self._segments.append(text)
+            self.partial = ""
+            return True
+        self.partial = json.loads(self._recognizer.PartialResult()).get("partial", "")
+        return False
+    
+    def result(self):
+        """Şimdiye kadar tanınan metnin tamamını döndürür"""
+        text = json.loads(self._recognizer.FinalResult()).get("text", "")
+        if text:
+            self._segments.append(text)
+        return " ".join(self._segments).strip()
+
+class VoskRecognizer:
+    """Yerel Vosk Türkçe modeli ile çevrimdışı tanıma"""
+    name = "vosk"
+    SAMPLE_RATE = 16000
+    FRAME_BYTES = 4000  # 16 kHz, 16 bit mono için 125 ms
+    
+    # Model bir kez yüklenir ve bellekte tutulur
+    _models = {}
+    _model_lock = threading.Lock()
+    
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        self.model = self.load_model(model_path)
+    
+    @classmethod
+    def load_model(cls, model_path):
+        """Vosk modelini yükler (aynı yol için tekrar yüklemez)"""
+        with cls._model_lock:
+            if model_path not in cls._models:
+                from vosk import Model, SetLogLevel
+                SetLogLevel(-1)
+                if not os.path.isdir(model_path):
+                    raise FileNotFoundError(f"Vosk modeli bulunamadı: {model_path}")
+                cls._models[model_path] = Model(model_path)
+            return cls._models[model_path]
+    
+    def stream(self):
+        """Yeni bir artımlı tanıma oturumu açar"""
+        return VoskStream(self.model, self.SAMPLE_RATE)
+    
+    def recognize(self, audio, on_partial=None):
+        """AudioData'yı çerçeve çerçeve besleyerek metne çevirir"""
+        raw = audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2)
+        stream = self.stream()
+        for i in range(0, len(raw), self.FRAME_BYTES):
+            stream.accept(raw[i:i + self.FRAME_BYTES])
+            if on_partial and stream.partial:
+                on_partial(stream.partial)
         
-        # Ses dosyaları için klasör oluştur
-        self.SOUND_DIR = "temp_sounds"
-        if not os.path.exists(self.SOUND_DIR):
-            os.makedirs(self.SOUND_DIR)
+        text = stream.result()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+def create_recognizer(backend=RECOGNIZER_BACKEND):
+    """Yapılandırmaya göre tanıma motorunu oluşturur, olmazsa Google'a döner"""
+    if backend == "vosk":
+        try:
+            return VoskRecognizer()
+        except Exception as e:
+            print(f"Vosk yüklenemedi, Google tanıma kullanılacak: {str(e)}")
+    return GoogleRecognizer()
+
+def benchmark_recognizers(wav_files, backends=("google", "vosk")):
+    """Tanıma motorlarını kayıtlı WAV dosyaları üzerinde karşılaştırır"""
+    results = {}
+    for backend in backends:
+        start = time.perf_counter()
+        recognizer = create_recognizer(backend)
+        load_time = time.perf_counter() - start
+        if recognizer.name != backend:
+            continue
+        
+        timings = []
+        transcripts = {}
+        for path in wav_files:
+            with sr.AudioFile(path) as source:
+                audio = sr.Recognizer().record(source)
+            start = time.perf_counter()
+            try:
+                transcripts[path] = recognizer.recognize(audio)
+            except (sr.UnknownValueError, sr.RequestError):
+                transcripts[path] = None
+            timings.append(time.perf_counter() - start)
+        
+        results[backend] = {
+            "load_time": load_time,
+            "mean_latency": sum(timings) / len(timings) if timings else None,
+            "max_latency": max(timings) if timings else None,
+            "transcripts": transcripts
+        }
+    return results
+
+class SpeechSystem:
+    def __init__(self):
+        # Pygame mixer'ı başlat, konuşma için bir kanal ayır
+        pygame.mixer.init(size=-16)
+        pygame.mixer.set_reserved(1)
+        self.channel = pygame.mixer.Channel(0)
         
         # Ses çalma kuyruğu
         self.sound_queue = queue.Queue()
-        self.is_playing = False
+        # Bir sözün parçaları kuyruğa bölünmeden, art arda girer
+        self.enqueue_lock = threading.Lock()
         self.is_paused = False
         self.current_speed = 1.0  # Normal hız
         
+        # Önbellekli sentez (motorlar, disk önbelleği ve üretici havuzu)
+        self.synthesizer = SpeechSynthesizer()
+        
+        # Tanıma motoru ilk kullanımda oluşturulur ve açık tutulur
+        self.recognizer = None
+        self.recognizer_lock = threading.Lock()
+        
+        # Mikrofon her komutta yeniden açılmaz, tek oturum açık kalır
+        self.mic_session = None
+        self.mic_lock = threading.Lock()
+        self.wake_listener = None
+        # Uyandırma modu son başlatılamadığında nedeni (arayüzde gösterilir)
+        self.wake_word_error = None
+        
+        # Araya girme (barge-in): çalarken kullanıcı konuşursa ses kesilir
+        self.barge_in_handler = None
+        self.barge_in_listener = None
+        
+        # Kanalda çalan ve kuyruğa alınmış parçaların zaman çizelgesi.
+        # Zamanlar duraklatmada duran "çalma saati"ne göredir.
+        self.playback_cond = threading.Condition()
+        self.timeline = deque()
+        self.clock_offset = time.perf_counter()
+        self.paused_at = None
+        
+        # stop_speech her çağrıldığında artar, eski parçalar çalınmaz
+        self.generation = 0
+        
+        # Seslendirme metrikleri (saniye cinsinden, son konuşma için)
+        self.metrics_lock = threading.Lock()
+        self.metrics = {
+            "time_to_first_audio": None,
+            "total_synthesis_time": None,
+            "chunk_count": 0,
+            # measure_playback_gaps'in kanal geçişlerinden ölçtüğü sessizlik
+            "inter_clip_gap": None,
+            "max_inter_clip_gap": None,
+            # Sıradaki parça gelmeden kanalın boşaldığı (çalma sırasında görülen) durumlar
+            "underruns": 0,
+            "max_underrun_gap": 0.0,
+            "stretch_cost_per_second": None
+        }
+        
         # Ses çalma thread'ini başlat
         self.playback_thread = threading.Thread(target=self._playback_worker, daemon=True)
         self.playback_thread.start()
     
+    @property
+    def is_playing(self):
+        """Kanalda çalan (ya da duraklatılmış) bir parça var mı"""
+        return self.channel.get_busy()
+    
+    def _play_clock(self):
+        """Duraklatıldığında duran çalma saati (saniye)"""
+        now = self.paused_at if self.paused_at is not None else time.perf_counter()
+        return now - self.clock_offset
+    
     def _playback_worker(self):
         """Ses çalma kuyruğunu işleyen worker thread"""
         while True:
+            item = self.sound_queue.get()
             try:
-                sound_file = self.sound_queue.get()
-                if sound_file:
-                    self.is_playing = True
-                    self.is_paused = False
-                    # Pygame ile sesi çal
-                    pygame.mixer.music.load(sound_file)
-                    pygame.mixer.music.play()
-                    # Ses bitene kadar bekle
-                    while pygame.mixer.music.get_busy() and not self.is_paused:
-                        pygame.time.Clock().tick(10)
-                    self.is_playing = False
-                    # Dosyayı temizle
-                    try:
-                        os.remove(sound_file)
-                    except:
-                        pass
-                self.sound_queue.task_done()
+                if item:
+                    future, utterance = item
+                    # Parçalar sırayla çalınır: sıradaki parçanın sentezi beklenir
+                    sound_file = future.result()
+                    if utterance["generation"] != self.generation:
+                        continue
+                    
+                    # Kod çözme kanal müsait olmadan önce yapılır
+                    self._play_stretched(pygame.mixer.Sound(sound_file), utterance)
             except Exception as e:
                 print(f"Ses çalma hatası: {str(e)}")
-                self.is_playing = False
-                self.is_paused = False
+            finally:
+                self.sound_queue.task_done()
+    
+    def _play_stretched(self, sound, utterance):
+        """Parçayı bloklar halinde güncel hıza göre esnetip kuyruklar"""
+        frequency, _, channels = pygame.mixer.get_init()
+        samples = np.frombuffer(sound.get_raw(), dtype=np.int16).reshape(-1, channels)
+        stretcher = WSOLAStretcher(frequency, channels)
+        block = int(PLAYBACK_BLOCK_SECONDS * frequency)
+        stretch_time = 0.0
+        
+        for i in range(0, len(samples), block):
+            if utterance["generation"] != self.generation:
+                return
+            # Hız her blokta yeniden okunur
+            speed = self.current_speed
+            start = time.perf_counter()
+            output = stretcher.process(samples[i:i + block], speed)
+            if i + block >= len(samples):
+                output = np.concatenate([output, stretcher.flush(speed)])
+            stretch_time += time.perf_counter() - start
+            
+            if len(output):
+                block_sound = pygame.mixer.Sound(buffer=np.ascontiguousarray(output).tobytes())
+                # Mikrofon açıksa yankı bastırma için referans zarfı hazırla
+                envelope = self._playback_envelope(block_sound) if self.mic_session else None
+                self._schedule(block_sound, envelope, utterance)
+        
+        if len(samples):
+            with self.metrics_lock:
+                self.metrics["stretch_cost_per_second"] = stretch_time / (len(samples) / frequency)
+    
+    def _retire_finished(self):
+        """Çalma saati geçmiş parçaları zaman çizelgesinden çıkarır"""
+        now = self._play_clock()
+        while self.timeline and self.timeline[0]["end"] <= now:
+            self.timeline.popleft()
+        
+        # Mixer kuyruktaki parçaya saatimizden önce geçtiyse çizelge kanala hizalanır
+        if (len(self.timeline) >= 2 and self.paused_at is None
+                and self.channel.get_busy() and self.channel.get_queue() is None):
+            self.timeline.popleft()
+            shift = now - self.timeline[0]["start"]
+            for clip in self.timeline:
+                clip["start"] += shift
+                clip["end"] += shift
+    
+    def _schedule(self, sound, envelope, utterance):
+        """Parçayı kanala boşluksuz olarak (çalan parçanın arkasına) kuyruklar"""
+        with self.playback_cond:
+            # Kanal kuyruğunda en fazla bir parça bekleyebilir; doluysa
+            # çalan parçanın bitişine kadar uyunur (duraklatmada süresiz)
+            while True:
+                self._retire_finished()
+                if len(self.timeline) < 2 and self.channel.get_queue() is None:
+                    break
+                if self.paused_at is not None:
+                    timeout = None
+                elif len(self.timeline) >= 2:
+                    # Saat mixer'dan sapabilir; geçiş kaçırılmasın diye kısa aralıkla bakılır
+                    timeout = min(SCHEDULE_POLL, max(0.001, self.timeline[0]["end"] - self._play_clock()))
+                else:
+                    # Saatimize göre bitti ama mixer henüz geçmedi
+                    timeout = 0.005
+                self.playback_cond.wait(timeout)
+            
+            # Beklerken stop_speech çağrılmış olabilir
+            if utterance["generation"] != self.generation:
+                return
+            
+            now = self._play_clock()
+            queued = bool(self.timeline) and self.channel.get_busy()
+            if queued:
+                self.channel.queue(sound)
+                start = max(now, self.timeline[-1]["end"])
+            else:
+                self.timeline.clear()
+                self.channel.play(sound)
+                if self.paused_at is not None:
+                    self.channel.pause()
+                start = now
+            end = start + sound.get_length()
+            self.timeline.append({"start": start, "end": end, "envelope": envelope})
+            
+            # Kanal aynı konuşmanın önceki parçası bitince boşalmışsa parça geç kalmıştır
+            if not queued and utterance.get("last_end") is not None:
+                gap = max(0.0, start - utterance["last_end"])
+                with self.metrics_lock:
+                    self.metrics["underruns"] += 1
+                    self.metrics["max_underrun_gap"] = max(self.metrics["max_underrun_gap"], gap)
+            utterance["last_end"] = end
+            start_time = time.perf_counter() + (start - now)
+        
+        self._record_first_audio(utterance, start_time)
+    
+    def _playback_envelope(self, sound):
+        """Çalınacak sesin kısa çerçeveli enerji zarfını çıkarır (yankı referansı)"""
+        try:
+            frequency, size, channels = pygame.mixer.get_init()
+            width = abs(size) // 8
+            raw = sound.get_raw()
+            step = int(frequency * REFERENCE_FRAME) * width * channels
+            return [audioop.rms(raw[i:i + step], width) for i in range(0, len(raw) - step + 1, step)]
+        except Exception as e:
+            print(f"Yankı referansı hatası: {str(e)}")
+            return None
+    
+    def reference_energy(self):
+        """Mikrofona şu an sızıyor olabilecek çalma sesinin enerjisi"""
+        if self.paused_at is not None:
+            return 0
+        now = self._play_clock()
+        for clip in list(self.timeline):
+            if clip["start"] <= now < clip["end"]:
+                if not clip["envelope"]:
+                    return 0
+                elapsed = now - clip["start"]
+                first = int(max(0.0, elapsed - ECHO_DELAY) / REFERENCE_FRAME)
+                last = int(elapsed / REFERENCE_FRAME) + 1
+                window = clip["envelope"][first:last]
+                return max(window) if window else 0
+        return 0
+    
+    def _record_first_audio(self, utterance, start_time):
+        """Konuşmanın ilk parçası çalmaya başladığında gecikmeyi kaydeder"""
+        if utterance["first_audio"] is None:
+            utterance["first_audio"] = start_time
+            with self.metrics_lock:
+                self.metrics["time_to_first_audio"] = start_time - utterance["start"]
+    
+    def _on_chunk_synthesized(self, utterance):
+        """Son parçanın sentezi bittiğinde toplam sentez süresini kaydeder"""
+        with self.metrics_lock:
+            utterance["remaining"] -= 1
+            if utterance["remaining"] == 0:
+                self.metrics["total_synthesis_time"] = time.perf_counter() - utterance["start"]
+    
+    def _flush_queue(self):
+        """Kuyrukta bekleyen parçaları iptal eder"""
+        flushed = False
+        while True:
+            try:
+                item = self.sound_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item:
+                future, _ = item
+                future.cancel()
+                flushed = True
+            self.sound_queue.task_done()
+        return flushed
+    
+    def get_metrics(self):
+        """Seslendirme metriklerinin bir kopyasını döndürür"""
+        with self.metrics_lock:
+            metrics = dict(self.metrics)
+        metrics.update(self.synthesizer.stats())
+        return metrics
     
     def stop_speech(self):
-        """Sesi durdur"""
-        if self.is_playing:
-            pygame.mixer.music.stop()
-            self.is_playing = False
+        """Sesi durdur ve bekleyen parçaları temizle"""
+        with self.playback_cond:
+            self.generation += 1
+            flushed = self._flush_queue()
+            was_playing = self.is_playing
+            self.channel.stop()
+            self.timeline.clear()
+            if self.paused_at is not None:
+                self.clock_offset += time.perf_counter() - self.paused_at
+                self.paused_at = None
             self.is_paused = False
-            return True
-        return False
+            self.playback_cond.notify_all()
+        return was_playing or flushed
     
     def pause_speech(self):
         """Sesi duraklat"""
-        if self.is_playing and not self.is_paused:
-            pygame.mixer.music.pause()
-            self.is_paused = True
-            return True
+        with self.playback_cond:
+            if self.is_playing and not self.is_paused:
+                self.channel.pause()
+                self.is_paused = True
+                self.paused_at = time.perf_counter()
+                self.playback_cond.notify_all()
+                return True
         return False
     
     def resume_speech(self):
         """Duraklatılmış sesi devam ettir"""
-        if self.is_playing and self.is_paused:
-            pygame.mixer.music.unpause()
-            self.is_paused = False
-            return True
+        with self.playback_cond:
+            if self.is_playing and self.is_paused:
+                self.channel.unpause()
+                self.is_paused = False
+                # Çalma saati duraklatılan süre kadar geri kaydırılır
+                self.clock_offset += time.perf_counter() - self.paused_at
+                self.paused_at = None
+                self.playback_cond.notify_all()
+                return True
         return False
     
     def set_speech_speed(self, speed):
@@ -89,79 +455,361 @@ class SpeechSystem:
             pass
         return False
     
-    def dinle_turkce(self):
+    def get_recognizer(self):
+        """Yapılandırılmış tanıma motorunu döndürür (bir kez oluşturulur)"""
+        with self.recognizer_lock:
+            if self.recognizer is None:
+                self.recognizer = create_recognizer()
+            return self.recognizer
+    
+    def get_mic_session(self):
+        """Sürekli açık mikrofon oturumunu döndürür (ilk kullanımda açılır)"""
+        with self.mic_lock:
+            if self.mic_session is None:
+                self.mic_session = MicrophoneSession(sample_rate=VoskRecognizer.SAMPLE_RATE)
+                # Asistanın kendi sesi metin filtresiyle değil, çalma referansıyla bastırılır
+                self.mic_session.echo_gate = EchoGate(self.reference_energy)
+            self.mic_session.start()
+            session = self.mic_session
+        self._start_barge_in(session)
+        return session
+    
+    def _command_handler(self, recognizer, on_command):
+        """Kaydedilen ses için tanıma yapıp metni on_command'a ileten fonksiyon üretir"""
+        def handle(audio):
+            if audio is None:
+                return
+            try:
+                metin = recognizer.recognize(audio)
+            except (sr.UnknownValueError, sr.RequestError):
+                return
+            metin = _WAKE_WORD_PREFIX.sub("", metin).strip()
+            if metin:
+                print(f"Algılanan metin: {metin}")
+                on_command(metin)
+        return handle
+    
+    def set_barge_in_handler(self, on_command):
+        """Araya girilerek söylenen komutların iletileceği fonksiyonu ayarlar"""
+        self.barge_in_handler = on_command
+        if self.mic_session:
+            self._start_barge_in(self.mic_session)
+    
+    def _start_barge_in(self, session):
+        """Çalma sırasında kullanıcı konuşmasını izleyen thread'i başlatır"""
+        if self.barge_in_listener or not self.barge_in_handler:
+            return
+        vad = EnergyVAD(session.noise, session.sample_width, session.frame_duration,
+                        update_noise=False, echo_gate=session.echo_gate)
+        detector = BargeInDetector(vad, lambda: self.is_playing and not self.is_paused,
+                                   self._on_barge_in,
+                                   self._command_handler(self.get_recognizer(), self.barge_in_handler),
+                                   session.sample_rate, session.sample_width, session.frame_duration)
+        self.barge_in_listener = FrameListener(session, detector)
+        self.barge_in_listener.start()
+    
+    def _on_barge_in(self):
+        """Kullanıcı araya girdi: çalan ve sıradaki parçalar iptal edilir"""
+        print("Araya girildi, seslendirme durduruldu.")
+        self.stop_speech()
+    
+    def dinle_turkce(self, on_partial=None):
         """Türkçe konuşmayı mikrofondan algılar"""
-        r = sr.Recognizer()
-        with sr.Microphone() as source:
+        try:
+            recognizer = self.get_recognizer()
+            session = self.get_mic_session()
+            if isinstance(recognizer, VoskRecognizer):
+                return self._dinle_vosk(recognizer, session, on_partial)
+            
             print("Lütfen konuşun...")
-            r.adjust_for_ambient_noise(source, duration=0.5)
+            # Kayıt ön tampondan başlar, kalibrasyon beklemesi yoktur
+            audio = session.listen(timeout=LISTEN_TIMEOUT, phrase_time_limit=PHRASE_TIME_LIMIT)
             try:
-                audio = r.listen(source, timeout=5, phrase_time_limit=5)
+                metin = recognizer.recognize(audio, on_partial)
+                print(f"Algılanan metin: {metin}")
+                return metin
+            except sr.UnknownValueError:
+                print("Sizi anlayamadım.")
+                return None
+            except sr.RequestError as e:
+                print(f"Servise ulaşılamadı: {e}")
+                return None
+        except sr.WaitTimeoutError:
+            print("Dinleme zaman aşımına uğradı.")
+            return None
+        except Exception as e:
+            print(f"Beklenmeyen hata: {str(e)}")
+            return None
+    
+    def _dinle_vosk(self, recognizer, session, on_partial=None):
+        """Mikrofon çerçevelerini Vosk'a anında besleyerek dinler"""
+        print("Lütfen konuşun...")
+        frames = session.subscribe(include_preroll=True)
+        try:
+            stream = recognizer.stream()
+            start = time.monotonic()
+            speech_start = None
+            while True:
                 try:
-                    metin = r.recognize_google(audio, language='tr-TR')
-                    print(f"Algılanan metin: {metin}")
-                    return metin
-                except sr.UnknownValueError:
-                    print("Sizi anlayamadım.")
+                    frame = frames.get(timeout=1)
+                except queue.Empty:
+                    frame = None
+                # Vosk ifade sonunu kendisi algılar
+                if frame and stream.accept(frame):
+                    break
+                
+                now = time.monotonic()
+                if stream.partial:
+                    if speech_start is None:
+                        speech_start = now
+                    if on_partial:
+                        on_partial(stream.partial)
+                
+                if speech_start is None and now - start > LISTEN_TIMEOUT:
+                    print("Dinleme zaman aşımına uğradı.")
                     return None
-                except sr.RequestError as e:
-                    print(f"Servise ulaşılamadı: {e}")
-                    return None
-            except sr.WaitTimeoutError:
-                print("Dinleme zaman aşımına uğradı.")
-                return None
-            except Exception as e:
-                print(f"Beklenmeyen hata: {str(e)}")
+                if speech_start is not None and now - speech_start > PHRASE_TIME_LIMIT:
+                    break
+            
+            metin = stream.result()
+            if not metin:
+                print("Sizi anlayamadım.")
                 return None
+            print(f"Algılanan metin: {metin}")
+            return metin
+        finally:
+            session.unsubscribe(frames)
+    
+    def _create_wake_word_spotter(self, recognizer):
+        """Yerel Vosk gramer tanıyıcısını döndürür; model yoksa RuntimeError verir
+
+        Yalnızca WAKE_WORD_CLOUD_FALLBACK açıksa kısa bölümler tam tanıyıcıya gönderilir.
+        """
+        try:
+            model = recognizer.model if isinstance(recognizer, VoskRecognizer) else \
+                VoskRecognizer.load_model(VOSK_MODEL_PATH)
+            return VoskWakeWordSpotter(model, VoskRecognizer.SAMPLE_RATE)
+        except Exception as e:
+            if not WAKE_WORD_CLOUD_FALLBACK:
+                raise RuntimeError(f"Alfa modu için yerel Vosk Türkçe modeli gerekli ({VOSK_MODEL_PATH}). "
+                                   "Modeli indirin ya da WAKE_WORD_CLOUD_FALLBACK=1 ile "
+                                   "bulut tanıyıcıyı açıkça seçin.") from e
+            print(f"Vosk uyandırma modeli yok, kısa bölümler tanıyıcıya gönderilecek: {str(e)}")
+            return TranscribingWakeWordSpotter(recognizer, VoskRecognizer.SAMPLE_RATE)
+    
+    def start_wake_word(self, on_command, on_wake=None):
+        """'Alfa' uyandırma kelimesini sürekli dinlemeye başlar"""
+        if self.wake_listener:
+            return True
+        self.wake_word_error = None
+        try:
+            session = self.get_mic_session()
+            recognizer = self.get_recognizer()
+            spotter = self._create_wake_word_spotter(recognizer)
+        except Exception as e:
+            print(f"Uyandırma modu başlatılamadı: {str(e)}")
+            self.wake_word_error = str(e)
+            return False
+        
+        vad = EnergyVAD(session.noise, session.sample_width, session.frame_duration,
+                        update_noise=False, echo_gate=session.echo_gate)
+        detector = WakeWordDetector(vad, spotter, self._command_handler(recognizer, on_command), on_wake,
+                                    session.sample_rate, session.sample_width,
+                                    session.frame_duration)
+        self.wake_listener = FrameListener(session, detector)
+        self.wake_listener.start()
+        return True
+    
+    def stop_wake_word(self):
+        """Uyandırma kelimesi dinlemesini durdurur"""
+        if self.wake_listener:
+            self.wake_listener.stop()
+            self.wake_listener = None
+            return True
+        return False
     
     def seslendir_turkce(self, metin):
-        """Metni Türkçe olarak seslendirir"""
+        """Metni Türkçe olarak parça parça seslendirir"""
         try:
-            # Geçici dosya oluştur
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3', dir=self.SOUND_DIR) as fp:
-                temp_filename = fp.name
+            chunks = split_text_chunks(metin)
+            if not chunks:
+                return False
             
-            # Metni sese çevir
-            tts = gTTS(text=metin, lang='tr', slow=False)
-            tts.save(temp_filename)
+            utterance = {
+                "start": time.perf_counter(),
+                "first_audio": None,
+                "remaining": len(chunks),
+                "generation": self.generation
+            }
+            with self.metrics_lock:
+                self.metrics["chunk_count"] = len(chunks)
             
-            # Sesi kuyruğa ekle
-            self.sound_queue.put(temp_filename)
+            # Parçalar havuzda paralel sentezlenir, kuyruğa sırayla girer; eşzamanlı
+            # başka bir sözün parçaları araya karışmaz
+            with self.enqueue_lock:
+                for chunk in chunks:
+                    future = self.synthesizer.chunk_future(chunk)
+                    future.add_done_callback(lambda f, u=utterance: self._on_chunk_synthesized(u))
+                    self.sound_queue.put((future, utterance))
             
         except Exception as e:
             print(f"Seslendirme hatası: {str(e)}")
             return False
         return True
+    
+    def prewarm_cache(self, phrases):
+        """Sabit ifadeleri arka planda önceden sentezleyip önbelleğe alır"""
+        self.synthesizer.prewarm(phrases)
+
+def measure_playback_gaps(system=None, clips=6, clip_seconds=0.7, poll_interval=GAP_POLL_INTERVAL):
+    """Ardışık parçalar arasındaki gerçek sessizliği kanal geçişlerinden ölçer
 
-# Global speech system instance
-speech_system = SpeechSystem()
+    Ton parçaları normal çalma yolundan (esnetme + kanal kuyruğu) geçer; bu
+    sırada kanalın get_busy()/get_sound() durumu yoklanır. Çalan sesin
+    değiştiği her an bir geçiştir, kanalın arada boş kaldığı süre o geçişin
+    boşluğudur. Ses aygıtı olmadan SDL_AUDIODRIVER=dummy ile çalıştırılabilir.
+    """
+    system = system or get_speech_system()
+    frequency, _, channels = pygame.mixer.get_init()
+    t = np.arange(int(clip_seconds * frequency)) / frequency
+    tone = (8000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    raw = np.ascontiguousarray(np.repeat(tone[:, None], channels, axis=1)).tobytes()
+    utterance = {"start": time.perf_counter(), "first_audio": None,
+                 "remaining": clips, "generation": system.generation}
 
-def dinle_turkce():
+    done = threading.Event()
+    def feed():
+        try:
+            for _ in range(clips):
+                system._play_stretched(pygame.mixer.Sound(buffer=raw), utterance)
+        finally:
+            done.set()
+    threading.Thread(target=feed, daemon=True, name="bosluk-olcumu").start()
+
+    gaps = []
+    current = None
+    idle_since = None
+    while True:
+        now = time.perf_counter()
+        sound = system.channel.get_sound() if system.channel.get_busy() else None
+        if sound is not None:
+            if current is not None and sound is not current:
+                gaps.append(now - idle_since if idle_since is not None else 0.0)
+            current = sound
+            idle_since = None
+        elif current is not None and idle_since is None:
+            idle_since = now
+        if done.is_set() and sound is None and system.channel.get_queue() is None and current is not None:
+            break
+        time.sleep(poll_interval)
+
+    result = {
+        "transitions": len(gaps),
+        "silent_transitions": sum(1 for gap in gaps if gap > 0),
+        "mean_gap": sum(gaps) / len(gaps) if gaps else None,
+        "max_gap": max(gaps) if gaps else None,
+        "resolution": poll_interval
+    }
+    with system.metrics_lock:
+        system.metrics["inter_clip_gap"] = result["mean_gap"]
+        system.metrics["max_inter_clip_gap"] = result["max_gap"]
+    return result
+
+# Global ses sistemi; mixer, çalma thread'i ve sentez havuzu ilk kullanımda
+# (GUI'de pencere açıldıktan sonra ısınma thread'inde) başlatılır
+speech_system = None
+_speech_system_lock = threading.Lock()
+# Ses sistemi başlamadan önce istenen hız; oluşturulunca uygulanır
+_pending_speed = None
+
+def get_speech_system():
+    """Global ses sistemini döndürür, yoksa oluşturur"""
+    global speech_system
+    if speech_system is None:
+        with _speech_system_lock:
+            if speech_system is None:
+                system = SpeechSystem()
+                if _pending_speed is not None:
+                    system.set_speech_speed(_pending_speed)
+                speech_system = system
+    return speech_system
+
+def dinle_turkce(on_partial=None):
     """Global dinleme fonksiyonu"""
-    return speech_system.dinle_turkce()
+    return get_speech_system().dinle_turkce(on_partial)
 
 def seslendir_turkce(metin):
     """Global seslendirme fonksiyonu"""
-    return speech_system.seslendir_turkce(metin)
+    return get_speech_system().seslendir_turkce(metin)
 
 def stop_speech():
     """Global ses durdurma fonksiyonu"""
-    return speech_system.stop_speech()
+    # Ses sistemi henüz başlamadıysa durdurulacak bir şey yoktur
+    return speech_system.stop_speech() if speech_system is not None else False
 
 def pause_speech():
     """Global ses duraklatma fonksiyonu"""
-    return speech_system.pause_speech()
+    return speech_system.pause_speech() if speech_system is not None else False
 
 def resume_speech():
     """Global ses devam ettirme fonksiyonu"""
-    return speech_system.resume_speech()
+    return speech_system.resume_speech() if speech_system is not None else False
 
 def set_speech_speed(speed):
     """Global ses hızı ayarlama fonksiyonu"""
+    global _pending_speed
+    with _speech_system_lock:
+        if speech_system is None:
+            # Yalnızca hız için mixer ve sentez havuzu başlatılmaz
+            _pending_speed = speed
+            return True
     return speech_system.set_speech_speed(speed)
 
+def start_wake_word(on_command, on_wake=None):
+    """Global uyandırma kelimesi dinleme fonksiyonu"""
+    return get_speech_system().start_wake_word(on_command, on_wake)
+
+def wake_word_error():
+    """Uyandırma modunun son başlatılamama nedeni"""
+    return speech_system.wake_word_error if speech_system is not None else None
+
+def stop_wake_word():
+    """Global uyandırma kelimesi durdurma fonksiyonu"""
+    return speech_system.stop_wake_word() if speech_system is not None else False
+
+def set_barge_in_handler(on_command):
+    """Global araya girme komut fonksiyonu"""
+    return get_speech_system().set_barge_in_handler(on_command)
+
+def prewarm_cache(phrases):
+    """Global önbellek ısıtma fonksiyonu"""
+    return get_speech_system().prewarm_cache(phrases)
+
+def get_speech_metrics():
+    """Global seslendirme metrikleri fonksiyonu"""
+    return get_speech_system().get_metrics()
+
 # Test amaçlı ana fonksiyon
 if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "--measure-gaps":
+        # SDL_AUDIODRIVER=dummy python speech.py --measure-gaps
+        result = measure_playback_gaps()
+        mean_gap = result["mean_gap"] or 0.0
+        max_gap = result["max_gap"] or 0.0
+        print(f"{result['transitions']} geçiş, {result['silent_transitions']} sessiz; "
+              f"ortalama boşluk {mean_gap * 1000:.2f} ms, en fazla {max_gap * 1000:.2f} ms "
+              f"(çözünürlük {result['resolution'] * 1000:.1f} ms)")
+        sys.exit(0)
+    if len(sys.argv) > 2 and sys.argv[1] == "--benchmark":
+        # python speech.py --benchmark kayit1.wav kayit2.wav ...
+        for backend, result in benchmark_recognizers(sys.argv[2:]).items():
+            print(f"{backend}: yükleme {result['load_time']:.2f} sn, "
+                  f"ortalama {result['mean_latency']:.2f} sn, en kötü {result['max_latency']:.2f} sn")
+            for path, text in result["transcripts"].items():
+                print(f"  {path}: {text}")
+        sys.exit(0)
+    
     komut = dinle_turkce()
     if komut:
         yanit = f"Şunu söylediniz: {komut}"
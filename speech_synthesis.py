@@ -0,0 +1,299 @@
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+
+from tts_cache import TTSCache
+
+# Seslendirme parçalama ve sentez havuzu ayarları
+MAX_CHUNK_CHARS = 200
+SYNTHESIS_WORKERS = 2
+
+# Seslendirme motoru ("gtts", "pyttsx3" veya gTTS olmazsa yerele düşen "auto")
+TTS_BACKEND = os.getenv('TTS_BACKEND', 'auto')
+
+# Sentezlenen dosyaların geçici olarak yazıldığı klasör
+SOUND_DIR = "temp_sounds"
+
+# Cümle sonu: noktalama + boşluk ya da satır sonu
+_SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?…])\s+|\n+')
+# Uzun cümleler için ara noktalama sınırları
+_CLAUSE_BOUNDARY = re.compile(r'(?<=[,;:])\s+')
+# Ses kimliklerindeki bölümler (ör. "trk/tr", "TTS_MS_TR-TR_TOLGA_11.0")
+_VOICE_ID_SEPARATORS = re.compile(r'[\\/._\-]+')
+
+def _split_long(text, max_chars):
+    """Sınırı aşan bir cümleyi önce noktalamadan, gerekirse kelimelerden böler"""
+    if len(text) <= max_chars:
+        return [text]
+    
+    pieces = []
+    for clause in _CLAUSE_BOUNDARY.split(text):
+        if len(clause) <= max_chars:
+            pieces.append(clause)
+            continue
+        current = ""
+        for word in clause.split():
+            if current and len(current) + len(word) + 1 > max_chars:
+                pieces.append(current)
+                current = word
+            else:
+                current = f"{current} {word}" if current else word
+        if current:
+            pieces.append(current)
+    return pieces
+
+def split_text_chunks(metin, max_chars=MAX_CHUNK_CHARS):
+    """Metni cümle ve noktalama sınırlarından seslendirme parçalarına böler"""
+    pieces = []
+    for sentence in _SENTENCE_BOUNDARY.split(metin):
+        sentence = sentence.strip()
+        if sentence:
+            pieces.extend(_split_long(sentence, max_chars))
+    if not pieces:
+        return []
+    
+    # İlk parça tek başına kalır ki ses en kısa sürede başlasın,
+    # sonrakiler sentez çağrısı sayısını azaltmak için birleştirilir
+    chunks = [pieces[0]]
+    current = ""
+    for piece in pieces[1:]:
+        if current and len(current) + len(piece) + 1 > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+class SentenceBuffer:
+    """Akış halinde gelen metni tamamlanan cümlelere böler"""
+    def __init__(self):
+        self._buffer = ""
+    
+    def feed(self, text):
+        """Yeni metin parçasını ekler, tamamlanan cümleleri döndürür"""
+        self._buffer += text
+        parts = _SENTENCE_BOUNDARY.split(self._buffer)
+        self._buffer = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+    
+    def flush(self):
+        """Tamponda kalan (yarım) cümleyi döndürür"""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+class TTSBackend:
+    """Seslendirme motorları için ortak arayüz ve ölçümler"""
+    name = None
+    extension = None
+    
+    def __init__(self):
+        self.startup_time = 0.0
+        self.utterances = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.total_cpu_time = 0.0
+        self.stats_lock = threading.Lock()
+    
+    def _synthesize(self, metin, path):
+        raise NotImplementedError
+    
+    def synthesize(self, metin, path):
+        """Metni verilen dosyaya sentezler, gecikme ve CPU süresini ölçer"""
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            self._synthesize(metin, path)
+        except Exception:
+            with self.stats_lock:
+                self.failures += 1
+            raise
+        with self.stats_lock:
+            self.utterances += 1
+            self.total_latency += time.perf_counter() - start
+            self.total_cpu_time += time.process_time() - cpu_start
+    
+    def stats(self):
+        """Başlatma süresi, ortalama gecikme ve CPU kullanımını döndürür"""
+        with self.stats_lock:
+            count = self.utterances
+            return {
+                "startup_time": self.startup_time,
+                "utterances": count,
+                "failures": self.failures,
+                "mean_latency": self.total_latency / count if count else None,
+                # Süreç geneli CPU zamanı, diğer thread'lerin payını da içerir
+                "mean_cpu_time": self.total_cpu_time / count if count else None
+            }
+
+class GTTSBackend(TTSBackend):
+    """Google TTS (ağ gerektirir, MP3 üretir)"""
+    name = "gtts"
+    extension = ".mp3"
+    
+    def __init__(self):
+        super().__init__()
+        # gTTS (ve requests) başlangıçta değil, motor ilk oluşturulduğunda yüklenir
+        from gtts import gTTS
+        self._gtts = gTTS
+    
+    def _synthesize(self, metin, path):
+        tts = self._gtts(text=metin, lang='tr', slow=False)
+        tts.save(path)
+
+def _language_code(language):
+    """pyttsx3 dil değerini ("tr_TR", "tr-TR" ya da eSpeak'in öncelik baytlı b"\\x05tr") sadeleştirir"""
+    if isinstance(language, bytes):
+        language = language.decode("utf-8", "ignore")
+    return "".join(c for c in str(language) if c.isprintable()).strip().lower().replace("-", "_")
+
+def is_turkish_voice(voice):
+    """Ses Türkçe mi; "trk/az" gibi Türk dili ailesindeki diğer sesler eşleşmez"""
+    for language in voice.languages or []:
+        code = _language_code(language)
+        if code == "tr" or code.startswith("tr_"):
+            return True
+    return "tr" in _VOICE_ID_SEPARATORS.split(voice.id.lower())
+
+class Pyttsx3Backend(TTSBackend):
+    """pyttsx3/eSpeak ile süreç içi çevrimdışı seslendirme (WAV üretir)"""
+    name = "pyttsx3"
+    extension = ".wav"
+    
+    def __init__(self):
+        super().__init__()
+        # pyttsx3 motoru oluşturulduğu thread'de kullanılmalı, bu yüzden
+        # başlatma ve sentez aynı tek worker'da yapılır
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyttsx3")
+        start = time.perf_counter()
+        self.engine = self.executor.submit(self._init_engine).result()
+        self.startup_time = time.perf_counter() - start
+    
+    def _init_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        # Varsa Türkçe sesi seç
+        for voice in engine.getProperty('voices'):
+            if is_turkish_voice(voice):
+                engine.setProperty('voice', voice.id)
+                break
+        return engine
+    
+    def _synthesize(self, metin, path):
+        def run():
+            self.engine.save_to_file(metin, path)
+            self.engine.runAndWait()
+        self.executor.submit(run).result()
+
+TTS_BACKEND_CLASSES = {
+    "gtts": GTTSBackend,
+    "pyttsx3": Pyttsx3Backend
+}
+
+def create_tts_backend(name):
+    """Adı verilen seslendirme motorunu oluşturur ve başlatma süresini ölçer"""
+    start = time.perf_counter()
+    backend = TTS_BACKEND_CLASSES[name]()
+    if not backend.startup_time:
+        backend.startup_time = time.perf_counter() - start
+    return backend
+
+class SpeechSynthesizer:
+    """Metin parçalarını önbellekli ve paralel olarak ses dosyasına çevirir
+
+    Ses aygıtı gerektirmez; SpeechSystem çalmak için, sunucu ise parçaları
+    istemcilere göndermek için kullanır.
+    """
+    def __init__(self, sound_dir=SOUND_DIR, backend=TTS_BACKEND):
+        self.SOUND_DIR = sound_dir
+        if not os.path.exists(self.SOUND_DIR):
+            os.makedirs(self.SOUND_DIR)
+        
+        # Sentezlenmiş sesler için kalıcı önbellek
+        self.cache = TTSCache()
+        
+        # Seslendirme motorları tercih sırasıyla, ilk kullanımda oluşturulur
+        self.tts_backend_names = ["gtts", "pyttsx3"] if backend == "auto" else [backend]
+        self.tts_backends = {}
+        self.tts_backend_lock = threading.Lock()
+        
+        # Parçaları çalmanın önünde sentezleyen küçük üretici havuzu
+        self.synthesis_executor = ThreadPoolExecutor(max_workers=SYNTHESIS_WORKERS,
+                                                     thread_name_prefix="tts")
+    
+    def get_tts_backend(self, name):
+        """Seslendirme motorunu döndürür (bir kez başlatılır ve tekrar kullanılır)"""
+        with self.tts_backend_lock:
+            if name not in self.tts_backends:
+                self.tts_backends[name] = create_tts_backend(name)
+            return self.tts_backends[name]
+    
+    def _cache_key(self, metin, backend_name):
+        """Parçanın verilen motor için önbellek anahtarı"""
+        # Ses normal hızda saklanır, hız çalma sırasında uygulanır
+        return TTSCache.make_key(metin, 'tr', 1.0, backend_name)
+    
+    def synthesize_chunk(self, metin):
+        """Tek bir metin parçasını sentezler ve önbelleğe yazar"""
+        last_error = None
+        # Tercih edilen motor başarısız olursa sıradakine düşülür
+        for name in self.tts_backend_names:
+            temp_filename = None
+            try:
+                backend = self.get_tts_backend(name)
+                
+                # Geçici dosya oluştur
+                with tempfile.NamedTemporaryFile(delete=False, suffix=backend.extension,
+                                                 dir=self.SOUND_DIR) as fp:
+                    temp_filename = fp.name
+                
+                # Metni sese çevir
+                backend.synthesize(metin, temp_filename)
+                return self.cache.put(self._cache_key(metin, name), temp_filename)
+            except Exception as e:
+                print(f"{name} seslendirme hatası: {str(e)}")
+                last_error = e
+                if temp_filename:
+                    try:
+                        os.remove(temp_filename)
+                    except:
+                        pass
+        raise last_error
+    
+    def chunk_future(self, metin):
+        """Parça önbellekteyse hazır, değilse sentezlenmekte olan bir Future döndürür"""
+        keys = [self._cache_key(metin, name) for name in self.tts_backend_names]
+        cached = self.cache.get(*keys)
+        if cached:
+            # Önbellek isabeti: sentez gecikmesi yok
+            future = Future()
+            future.set_result(cached)
+            return future
+        return self.synthesis_executor.submit(self.synthesize_chunk, metin)
+    
+    def prewarm(self, phrases):
+        """Sabit ifadeleri arka planda önceden sentezleyip önbelleğe alır"""
+        def warm():
+            for phrase in phrases:
+                for chunk in split_text_chunks(phrase):
+                    try:
+                        self.chunk_future(chunk).result()
+                    except Exception as e:
+                        print(f"Önbellek ısıtma hatası: {str(e)}")
+                        return
+        
+        threading.Thread(target=warm, daemon=True).start()
+    
+    def stats(self):
+        """Önbellek ve motor istatistikleri"""
+        with self.tts_backend_lock:
+            backends = list(self.tts_backends.values())
+        return {
+            "cache": self.cache.stats(),
+            "backends": {backend.name: backend.stats() for backend in backends}
+        }
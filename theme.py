@@ -0,0 +1,102 @@
+import time
+import tkinter as tk
+
+# Tema renkleri: rol -> renk
+THEMES = {
+    "dark": {
+        "bg_color": "#1a1a1a",
+        "text_color": "#ffffff",
+        "button_color": "#2d5bb9",
+        "message_bg": "#2d5bb9",
+        "user_message_bg": "#2d2d2d",
+        "accent_color": "#4a90e2",
+        "hover_color": "#3a6bc7",
+        "secondary_bg": "#2d2d2d",
+        "border_color": "#3d3d3d",
+        "chat_bg": "#1e1e1e"
+    },
+    "light": {
+        "bg_color": "#ffffff",
+        "text_color": "#000000",
+        "button_color": "#007bff",
+        "message_bg": "#007bff",
+        "user_message_bg": "#f0f0f0",
+        "accent_color": "#0056b3",
+        "hover_color": "#0056b3",
+        "secondary_bg": "#f8f9fa",
+        "border_color": "#dee2e6",
+        "chat_bg": "#f5f5f5"
+    }
+}
+
+class ThemeRegistry:
+    """Widget'ların kullandığı tema rollerini kaydeder, temayı tek geçişte uygular
+
+    Her kayıt (uygulayıcı, {seçenek: rol}) çiftidir; uygulayıcı varsayılan olarak
+    widget.configure'dur, tuval butonları ve metin etiketleri gibi öğeler kendi
+    fonksiyonlarını verebilir.
+    """
+    def __init__(self, theme="dark"):
+        self.name = theme
+        self.colors = THEMES[theme]
+        self._entries = []
+        self.last_apply_time = None
+
+    def __getitem__(self, role):
+        return self.colors[role]
+
+    def register(self, widget, setter=None, **roles):
+        """Widget'ı seçenek=rol eşlemesiyle kaydeder ve widget'ı döndürür
+
+        Örnek: register(label, bg="bg_color", fg="text_color")
+        """
+        self._entries.append((widget, setter or widget.configure, roles))
+        return widget
+
+    def apply(self, theme):
+        """Temayı tüm kayıtlı widget'lara uygular, geçen süreyi (saniye) döndürür"""
+        self.name = theme
+        self.colors = THEMES[theme]
+        start = time.perf_counter()
+        alive = []
+        for entry in self._entries:
+            _, setter, roles = entry
+            try:
+                setter(**{option: self.colors[role] for option, role in roles.items()})
+            except tk.TclError:
+                # Yok edilmiş widget'lar kayıttan düşer
+                continue
+            alive.append(entry)
+        self._entries = alive
+        self.last_apply_time = time.perf_counter() - start
+        return self.last_apply_time
+
+    def __len__(self):
+        return len(self._entries)
+
+def benchmark_theme_switch(widget_count=300, switches=10):
+    """widget_count widget'lık bir arayüzde tema değişiminin ortalama süresi (saniye)"""
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        registry = ThemeRegistry()
+        container = registry.register(tk.Frame(root), bg="bg_color")
+        for i in range(widget_count):
+            if i % 3 == 0:
+                registry.register(tk.Frame(container), bg="secondary_bg")
+            elif i % 3 == 1:
+                registry.register(tk.Label(container, text=str(i)), bg="bg_color", fg="text_color")
+            else:
+                registry.register(tk.Entry(container), bg="secondary_bg", fg="text_color",
+                                  insertbackground="text_color")
+        total = 0.0
+        for i in range(switches):
+            total += registry.apply("light" if i % 2 == 0 else "dark")
+            root.update_idletasks()
+        return total / switches
+    finally:
+        root.destroy()
+
+if __name__ == "__main__":
+    for count in (100, 300, 600):
+        print(f"{count} widget: tema değişimi {benchmark_theme_switch(count) * 1000:.2f} ms")
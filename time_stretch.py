@@ -0,0 +1,159 @@
+import time
+
+import numpy as np
+
+# WSOLA ayarları (saniye cinsinden)
+FRAME_SECONDS = 0.04     # analiz/sentez penceresi
+SEARCH_SECONDS = 0.01    # en iyi benzerlik için aranan kayma aralığı (±)
+SEARCH_DECIMATION = 4    # benzerlik araması seyreltilmiş mono sinyalde yapılır
+
+MIN_SPEED = 0.5
+MAX_SPEED = 2.0
+
+class WSOLAStretcher:
+    """Perdeyi değiştirmeden hız değiştiren akışlı WSOLA zaman esnetici
+
+    Ses bloklar halinde beslenir; her blok o anki hızla işlenir, böylece
+    çalma sürerken hız değişikliği sonraki bloklara hemen yansır.
+    """
+    def __init__(self, sample_rate, channels):
+        self.channels = channels
+        self.frame = int(FRAME_SECONDS * sample_rate) // 2 * 2
+        self.hop = self.frame // 2
+        self.delta = int(SEARCH_SECONDS * sample_rate)
+        n = np.arange(self.frame)
+        # Periyodik Hann penceresi %50 örtüşmede toplamı 1 verir
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * n / self.frame)).astype(np.float32)[:, None]
+
+        self.buffer = np.zeros((0, channels), dtype=np.float32)
+        self.buffer_start = 0      # buffer[0]'ın mutlak giriş konumu
+        self.position = 0.0        # sıradaki pencerenin nominal giriş konumu
+        self.previous = None       # önceki seçilen pencere konumu
+        self.tail = np.zeros((self.frame - self.hop, channels), dtype=np.float32)
+        self.used = False
+        # Doğrudan geçişten WSOLA'ya geçerken örtüşme kuyruğu ilk pencerede girişten kurulur
+        self._prime_tail = False
+
+    def process(self, samples, speed):
+        """int16 (örnek, kanal) bloğunu esnetir, hazır olan çıkışı döndürür"""
+        speed = min(MAX_SPEED, max(MIN_SPEED, float(speed)))
+        if speed == 1.0 and not self.used:
+            # Hiç esnetme yapılmadıysa ses olduğu gibi geçer; hız değişirse WSOLA
+            # kesintisiz devralsın diye arama aralığı kadar son giriş saklanır
+            end = self.buffer_start + len(self.buffer) + len(samples)
+            recent = np.concatenate([self.buffer, samples[-self.delta:].astype(np.float32)])
+            self.buffer = recent[-self.delta:]
+            self.buffer_start = end - len(self.buffer)
+            self.position = float(end)
+            if len(self.buffer) == self.delta:
+                # Geçen ses, son penceresi end - hop'ta olan 1.0x WSOLA çıkışı sayılır
+                self.previous = end - self.hop
+                self._prime_tail = True
+            return samples
+
+        self.used = True
+        self.buffer = np.concatenate([self.buffer, samples.astype(np.float32)])
+        return self._run(speed)
+
+    def flush(self, speed):
+        """Kalan girişi işler ve son örtüşme kuyruğunu döndürür"""
+        if not self.used:
+            return np.zeros((0, self.channels), dtype=np.int16)
+        padding = np.zeros((self.frame + 2 * self.delta, self.channels), dtype=np.float32)
+        end = self.buffer_start + len(self.buffer)
+        self.buffer = np.concatenate([self.buffer, padding])
+        output = self._run(min(MAX_SPEED, max(MIN_SPEED, float(speed))), limit=end)
+        tail = np.clip(self.tail, -32768, 32767).astype(np.int16)
+        return np.concatenate([output, tail])
+
+    def _segment(self, start, length):
+        """Mutlak konumdan giriş parçası"""
+        offset = start - self.buffer_start
+        return self.buffer[offset:offset + length]
+
+    def _run(self, speed, limit=None):
+        analysis_hop = self.hop * speed
+        buffer_end = self.buffer_start + len(self.buffer)
+        outputs = []
+        while True:
+            nominal = int(self.position)
+            if limit is not None and nominal >= limit:
+                break
+            needed = nominal + self.delta
+            if self.previous is not None:
+                needed = max(needed, self.previous + self.hop)
+            if needed + self.frame > buffer_end:
+                break
+
+            if self.previous is None:
+                selected = nominal
+            else:
+                selected = self._best_match(nominal)
+
+            if self._prime_tail:
+                # Önceki pencerenin sönümlenen yarısı, geçen sesin doğal devamıdır
+                self.tail = self._segment(self.previous + self.hop, self.frame - self.hop) * self.window[self.hop:]
+                self._prime_tail = False
+
+            frame = self._segment(selected, self.frame) * self.window
+            accumulated = np.concatenate([self.tail, np.zeros((self.hop, self.channels), dtype=np.float32)])
+            accumulated += frame
+            outputs.append(accumulated[:self.hop])
+            self.tail = accumulated[self.hop:]
+
+            self.previous = selected
+            self.position += analysis_hop
+
+        # Artık gerekmeyen girişi at
+        keep_from = int(self.position) - self.delta
+        if self.previous is not None:
+            keep_from = min(keep_from, self.previous + self.hop)
+        drop = max(0, keep_from - self.buffer_start)
+        if drop:
+            self.buffer = self.buffer[drop:]
+            self.buffer_start += drop
+
+        if not outputs:
+            return np.zeros((0, self.channels), dtype=np.int16)
+        return np.clip(np.concatenate(outputs), -32768, 32767).astype(np.int16)
+
+    def _best_match(self, nominal):
+        """Önceki pencerenin doğal devamına en çok benzeyen konumu bulur"""
+        template = self._segment(self.previous + self.hop, self.frame).mean(axis=1)
+        low = max(self.buffer_start, nominal - self.delta)
+        region = self._segment(low, self.frame + (nominal + self.delta - low)).mean(axis=1)
+
+        step = SEARCH_DECIMATION
+        correlation = np.correlate(region[::step], template[::step], mode="valid")
+        if not len(correlation):
+            return nominal
+        return low + int(np.argmax(correlation)) * step
+
+def benchmark_time_stretch(seconds=5.0, speeds=(0.5, 0.75, 1.25, 1.5, 2.0),
+                           sample_rate=44100, channels=2, block_seconds=0.3):
+    """Her hız için bir saniyelik sesin esnetme maliyetini (saniye) ölçer"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    signal = (8000 * np.sin(2 * np.pi * 220 * t) + 500 * rng.standard_normal(len(t)))
+    samples = np.repeat(signal[:, None], channels, axis=1).astype(np.int16)
+    block = int(block_seconds * sample_rate)
+
+    results = {}
+    for speed in speeds:
+        stretcher = WSOLAStretcher(sample_rate, channels)
+        start = time.perf_counter()
+        produced = 0
+        for i in range(0, len(samples), block):
+            produced += len(stretcher.process(samples[i:i + block], speed))
+        produced += len(stretcher.flush(speed))
+        elapsed = time.perf_counter() - start
+        results[speed] = {
+            "cost_per_second": elapsed / seconds,
+            "output_ratio": produced / len(samples)
+        }
+    return results
+
+if __name__ == "__main__":
+    for speed, result in benchmark_time_stretch().items():
+        print(f"{speed}x: saniye başına {result['cost_per_second'] * 1000:.1f} ms, "
+              f"çıkış/giriş oranı {result['output_ratio']:.2f}")
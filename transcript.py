@@ -0,0 +1,240 @@
+import tkinter as tk
+from datetime import datetime
+
+# Metin widget'ında aynı anda tutulan en fazla mesaj
+TRANSCRIPT_WINDOW = 150
+# Kenara kaydırıldığında bir seferde yüklenen mesaj sayısı
+TRANSCRIPT_PAGE = 50
+
+MESSAGE_FONT = ("Helvetica", 13)
+HEADER_FONT = ("Helvetica", 13, "bold")
+
+class TranscriptMessage:
+    """Sohbet geçmişindeki tek bir mesaj"""
+    __slots__ = ("id", "timestamp", "is_user", "text")
+
+    def __init__(self, message_id, timestamp, is_user, text):
+        self.id = message_id
+        self.timestamp = timestamp
+        self.is_user = is_user
+        # None ise mesaj kaldırılmıştır (ör. yanıtsız yer tutucu)
+        self.text = text
+
+class Transcript:
+    """Tüm sohbet geçmişini bellekte tutup ScrolledText'te yalnızca bir pencereyi gösterir
+
+    Widget'ta en fazla TRANSCRIPT_WINDOW mesaj bulunur; kullanıcı en üste
+    kaydırınca daha eski, en alta kaydırınca daha yeni mesajlar sayfa sayfa
+    yüklenir. Her mesaj "msg<id>_header" ve "msg<id>" etiketleriyle işaretlenir,
+    biçim etiketleri ise tema başına bir kez ayarlanır.
+    """
+    def __init__(self, widget, window=TRANSCRIPT_WINDOW, page=TRANSCRIPT_PAGE):
+        self.widget = widget
+        self.window = window
+        self.page = page
+
+        self.messages = []
+        # messages[0]'ın kimliği; temizlemede kaydırılır, eski kimlikler geçersiz kalır
+        self._base_id = 0
+        # Widget'ta gösterilen mesajların [first, last) konum aralığı
+        self.first = 0
+        self.last = 0
+        self._paging = False
+
+        # Kaydırma çubuğu güncellemeleri kenarlara gelindiğini anlamak için dinlenir
+        self._set_scrollbar = widget.vbar.set
+        widget.configure(yscrollcommand=self._on_yscroll)
+
+    def configure_tags(self, text_color, accent_color):
+        """Mesaj biçimlerini ayarlar (tema değiştiğinde bir kez çağrılır)"""
+        self.widget.tag_configure("user_header", font=HEADER_FONT, foreground=text_color)
+        self.widget.tag_configure("user_message", font=MESSAGE_FONT, foreground=text_color)
+        self.widget.tag_configure("assistant_header", font=HEADER_FONT, foreground=accent_color)
+        self.widget.tag_configure("assistant_message", font=MESSAGE_FONT, foreground=text_color)
+
+    def _position(self, message_id):
+        position = message_id - self._base_id
+        if 0 <= position < len(self.messages):
+            return position
+        return None
+
+    def contains(self, message_id):
+        """Mesaj hâlâ geçmişte mi (temizlenmemiş ve kaldırılmamış)"""
+        position = self._position(message_id)
+        return position is not None and self.messages[position].text is not None
+
+    @staticmethod
+    def _tags(message):
+        """Mesajın (başlık, gövde) etiketleri"""
+        kind = "user" if message.is_user else "assistant"
+        return (f"{kind}_header", f"msg{message.id}_header"), (f"{kind}_message", f"msg{message.id}")
+
+    def _chunks(self, message):
+        """Mesajın tek insert çağrısına verilen (metin, etiketler) çiftleri"""
+        name = "👤 Siz" if message.is_user else "🤖 Alfa"
+        header_tags, body_tags = self._tags(message)
+        return (f"\n[{message.timestamp}] {name}:\n", header_tags, f"{message.text}\n", body_tags)
+
+    def _render(self, first, last, index):
+        """[first, last) aralığındaki mesajları index konumuna tek seferde ekler"""
+        args = []
+        for message in self.messages[first:last]:
+            if message.text is not None:
+                args.extend(self._chunks(message))
+        if args:
+            self.widget.insert(index, *args)
+
+    def _unrender(self, position):
+        """Mesajı widget'tan siler (geçmişte kalır)"""
+        message_id = self.messages[position].id
+        header = self.widget.tag_ranges(f"msg{message_id}_header")
+        body = self.widget.tag_ranges(f"msg{message_id}")
+        if header and body:
+            self.widget.delete(header[0], body[-1])
+        self.widget.tag_delete(f"msg{message_id}_header", f"msg{message_id}")
+
+    def _edit(self, action, *args):
+        self.widget.config(state=tk.NORMAL)
+        try:
+            return action(*args)
+        finally:
+            self.widget.config(state=tk.DISABLED)
+
+    def append(self, text, is_user=False):
+        """Mesajı geçmişe ve widget'ın sonuna ekler, kimliğini döndürür"""
+        message = TranscriptMessage(self._base_id + len(self.messages),
+                                    datetime.now().strftime("%H:%M"), is_user, text)
+        self.messages.append(message)
+        self._edit(self._append_message)
+        self.widget.see(tk.END)
+        return message.id
+
+    def extend(self, messages):
+        """(saat, kullanıcı mı, metin) mesajlarını özgün saatleriyle topluca ekler
+
+        Yalnızca son pencere tek seferde çizilir (ör. oturum günlüğünden geri yükleme).
+        """
+        for timestamp, is_user, text in messages:
+            self.messages.append(TranscriptMessage(self._base_id + len(self.messages),
+                                                   timestamp, is_user, text))
+        self._edit(self._render_tail)
+        self.widget.see(tk.END)
+
+    def _append_message(self):
+        count = len(self.messages)
+        if self.last == count - 1:
+            self._render(count - 1, count, tk.END)
+            self.last = count
+            while self.last - self.first > self.window:
+                self._unrender(self.first)
+                self.first += 1
+        else:
+            # Kullanıcı eski mesajlara bakıyorken yeni mesaj gelirse son pencereye dönülür
+            self._render_tail()
+
+    def _render_tail(self):
+        self._clear_widget()
+        self.first = max(0, len(self.messages) - self.window)
+        self.last = len(self.messages)
+        self._render(self.first, self.last, tk.END)
+
+    def _clear_widget(self):
+        self.widget.delete("1.0", tk.END)
+        for position in range(self.first, self.last):
+            message_id = self.messages[position].id
+            self.widget.tag_delete(f"msg{message_id}_header", f"msg{message_id}")
+
+    def set_text(self, message_id, text):
+        """Mesajın metnini değiştirir; text None ise mesajı kaldırır
+
+        Mesaj temizlenmişse False döndürür.
+        """
+        position = self._position(message_id)
+        if position is None or self.messages[position].text is None:
+            return False
+        self._edit(self._set_text, position, text)
+        self.widget.see(tk.END)
+        return True
+
+    def _set_text(self, position, text):
+        message = self.messages[position]
+        rendered = self.first <= position < self.last
+        if text is None:
+            if rendered:
+                self._unrender(position)
+            message.text = None
+            return
+        message.text = text
+        body = self.widget.tag_ranges(f"msg{message.id}") if rendered else ()
+        if body:
+            self.widget.delete(body[0], body[-1])
+            self.widget.insert(body[0], f"{text}\n", self._tags(message)[1])
+
+    def append_text(self, message_id, text):
+        """Mesajın sonuna (akan yanıt parçası) metin ekler"""
+        position = self._position(message_id)
+        if position is None or self.messages[position].text is None:
+            return False
+        message = self.messages[position]
+        message.text += text
+        body = self.widget.tag_ranges(f"msg{message.id}") if self.first <= position < self.last else ()
+        if body:
+            # Parça, mesajın sonundaki satır sonundan önce eklenir
+            self._edit(self.widget.insert, f"{body[-1]}-1c", text, self._tags(message)[1])
+            self.widget.see(tk.END)
+        return True
+
+    def clear(self):
+        """Geçmişi ve widget'ı temizler; eski mesaj kimlikleri geçersiz olur"""
+        self._edit(self._clear_widget)
+        self._base_id += len(self.messages)
+        self.messages = []
+        self.first = self.last = 0
+
+    def _on_yscroll(self, first, last):
+        self._set_scrollbar(first, last)
+        if self._paging:
+            return
+        if float(first) <= 0.0 and self.first > 0:
+            self._paging = True
+            self.widget.after_idle(self._page, self._page_older)
+        elif float(last) >= 1.0 and self.last < len(self.messages):
+            self._paging = True
+            self.widget.after_idle(self._page, self._page_newer)
+
+    def _top_message(self):
+        """Görünen ilk satırdaki mesajın kimliği"""
+        for tag in self.widget.tag_names("@0,0"):
+            if tag.startswith("msg"):
+                return tag[3:].split("_")[0]
+        return None
+
+    def _page(self, action):
+        try:
+            anchor = self._top_message()
+            self._edit(action)
+            # Görünen mesaj yerinde kalsın diye görünüm ona kaydırılır
+            if anchor is not None and self.widget.tag_ranges(f"msg{anchor}_header"):
+                self.widget.yview(f"msg{anchor}_header.first")
+        finally:
+            self._paging = False
+
+    def _page_older(self):
+        first = max(0, self.first - self.page)
+        self._render(first, self.first, "1.0")
+        self.first = first
+        while self.last - self.first > self.window:
+            self.last -= 1
+            self._unrender(self.last)
+
+    def _page_newer(self):
+        last = min(len(self.messages), self.last + self.page)
+        self._render(self.last, last, tk.END)
+        self.last = last
+        while self.last - self.first > self.window:
+            self._unrender(self.first)
+            self.first += 1
+
+    def stats(self):
+        """Geçmişteki ve widget'taki mesaj sayıları"""
+        return {"messages": len(self.messages), "rendered": self.last - self.first}
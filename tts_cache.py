@@ -0,0 +1,128 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+# Önbellek ayarları
+TTS_CACHE_DIR = "tts_cache"
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024  # 50 MB
+# En son kullanılan bu kadar kayıt silinmez: kuyrukta çalınmayı bekleyen parçalar
+# istendikleri (get) ya da sentezlendikleri (put) anda en yeni kayıtlar arasına girer
+TTS_CACHE_PROTECTED_ENTRIES = 64
+
+class TTSCache:
+    """Seslendirilmiş metinleri diskte tutan, boyut sınırlı LRU önbellek"""
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES,
+                 protected_entries=TTS_CACHE_PROTECTED_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.protected_entries = max(1, protected_entries)
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        # anahtar -> (dosya yolu, boyut), en eski kullanılan başta
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self._load()
+
+    @staticmethod
+    def make_key(text, lang, speed, voice=""):
+        """(metin, dil, hız, ses motoru) bilgisinden içerik adresli anahtar üretir"""
+        raw = f"{voice}\0{lang}\0{float(speed):.2f}\0{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def _load(self):
+        """Diskteki mevcut dosyaları son kullanım sırasına göre yükler"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            key, ext = os.path.splitext(name)
+            path = os.path.join(self.cache_dir, name)
+            if len(key) != 64 or not ext or not os.path.isfile(path):
+                continue
+            stat = os.stat(path)
+            files.append((stat.st_mtime, key, path, stat.st_size))
+
+        for _, key, path, size in sorted(files):
+            self._entries[key] = (path, size)
+            self._total_bytes += size
+        self._evict()
+
+    def get(self, *keys):
+        """Verilen anahtarlardan önbellekte bulunan ilkinin dosya yolunu döndürür"""
+        with self._lock:
+            path = None
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if not os.path.exists(entry[0]):
+                    self._discard(key)
+                    continue
+                self._entries.move_to_end(key)
+                path = entry[0]
+                break
+
+            if path is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        # LRU sırası yeniden başlatmalarda korunsun diye zaman damgasını güncelle
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return path
+
+    def put(self, key, source_path):
+        """Sentezlenmiş dosyayı önbelleğe taşır ve yeni yolunu döndürür"""
+        ext = os.path.splitext(source_path)[1]
+        path = os.path.join(self.cache_dir, key + ext)
+        os.replace(source_path, path)
+        size = os.path.getsize(path)
+
+        with self._lock:
+            if key in self._entries:
+                old_path = self._entries[key][0]
+                self._discard(key)
+                # Aynı anahtar başka uzantıyla (başka motorla) yazıldıysa eski dosya sahipsiz kalmasın
+                if old_path != path:
+                    try:
+                        os.remove(old_path)
+                    except OSError:
+                        pass
+            self._entries[key] = (path, size)
+            self._total_bytes += size
+            self._evict()
+        return path
+
+    def _discard(self, key):
+        """Kaydı önbellek dizininden çıkarır"""
+        _, size = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def _evict(self):
+        """Boyut sınırı aşıldıysa en eski kullanılan dosyaları siler"""
+        # En son kullanılanlar çalınmayı bekliyor olabilir, sınır geçici olarak aşılabilir
+        while self._total_bytes > self.max_bytes and len(self._entries) > self.protected_entries:
+            key, (path, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self):
+        """Önbellek istatistiklerini döndürür"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses
+            }
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import deque
+
+# Kuyruğun ana thread'de boşaltılma aralığı (~60 kare/sn)
+UI_FRAME_MS = 16
+# Saniyedeki widget işlemi bu pencere üzerinden hesaplanır (saniye)
+RATE_WINDOW = 1.0
+
+class _Append:
+    """Aynı mesaja art arda gelen parçaları biriktiren kuyruk öğesi"""
+    __slots__ = ("func", "key", "parts")
+
+    def __init__(self, func, key, text):
+        self.func = func
+        self.key = key
+        self.parts = [text]
+
+    def __call__(self):
+        self.func(self.key, "".join(self.parts))
+
+class UIUpdateQueue:
+    """Arka plan thread'lerinden gelen arayüz güncellemelerini toplayıp Tk ana döngüsünde uygular
+
+    Her güncelleme için ayrı root.after çağrısı yerine kuyruk sabit aralıkla tek
+    seferde boşaltılır; aynı mesaja art arda gelen eklemeler tek widget
+    işlemine birleştirilir.
+    """
+    def __init__(self, root, frame_ms=UI_FRAME_MS):
+        self.root = root
+        self.frame_ms = frame_ms
+        self._items = []
+        self._lock = threading.Lock()
+        self._after_id = None
+
+        # Sayaçlar: gönderilen, birleştirilen ve uygulanan güncellemeler
+        self.posted = 0
+        self.coalesced = 0
+        self.executed = 0
+        self.frames = 0
+        self.max_frame_time = 0.0
+        # (zaman, uygulanan işlem) kareleri, son RATE_WINDOW saniye
+        self._recent = deque()
+
+    def post(self, func, *args):
+        """func(*args) çağrısını bir sonraki karede ana thread'de çalıştırır"""
+        with self._lock:
+            self._items.append(lambda: func(*args))
+            self.posted += 1
+
+    def post_append(self, func, key, text):
+        """func(key, text) çağrısını kuyruğa alır; sondaki öğe aynı anahtara eklemeyse metni ona katar"""
+        with self._lock:
+            self.posted += 1
+            last = self._items[-1] if self._items else None
+            if isinstance(last, _Append) and last.func == func and last.key == key:
+                last.parts.append(text)
+                self.coalesced += 1
+                return
+            self._items.append(_Append(func, key, text))
+
+    def start(self):
+        """Kare döngüsünü başlatır (ana thread'den çağrılmalı)"""
+        if self._after_id is None:
+            self._after_id = self.root.after(self.frame_ms, self._drain)
+
+    def stop(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _drain(self):
+        """Birikmiş güncellemeleri sırayla uygular ve bir sonraki kareyi planlar"""
+        with self._lock:
+            items, self._items = self._items, []
+
+        start = time.perf_counter()
+        for item in items:
+            try:
+                item()
+            except Exception as e:
+                print(f"Arayüz güncelleme hatası: {str(e)}")
+        now = time.perf_counter()
+
+        with self._lock:
+            if items:
+                self.executed += len(items)
+                self.frames += 1
+                self.max_frame_time = max(self.max_frame_time, now - start)
+                self._recent.append((now, len(items)))
+            while self._recent and now - self._recent[0][0] > RATE_WINDOW:
+                self._recent.popleft()
+
+        self._after_id = self.root.after(self.frame_ms, self._drain)
+
+    def stats(self):
+        """Kuyruk sayaçları ve son bir saniyedeki widget işlemi sayısı"""
+        now = time.perf_counter()
+        with self._lock:
+            ops = sum(count for at, count in self._recent if now - at <= RATE_WINDOW)
+            return {
+                "posted": self.posted,
+                "coalesced": self.coalesced,
+                "executed": self.executed,
+                "frames": self.frames,
+                "ops_per_second": ops / RATE_WINDOW,
+                "max_frame_time": self.max_frame_time
+            }